@@ -1,7 +1,7 @@
 import pygame
 import sys
 from random import randint
-from objects.constants import (
+from objects.core.constants import (
     WINDOWWIDTH,
     WINDOWHEIGHT,
     SQUARESIZE,
@@ -16,12 +16,34 @@ from objects.constants import (
 )
 
 
-from objects.board import GameBoard
+from objects.game_board import GameBoard, BitGameBoard
+from objects.engine import ComputerPlayer, Engine
+from objects.nnue import Network
+from objects.sprites import SPRITE_CACHE, SPRITE_BUNDLE_PATH
 from objects.game_state import GameState
-from objects.team import Team
+from objects.core.team import Team
 
 
 FPS = 60
+# frame rate while the game computes or a computer plays with the window in the background
+BACKGROUND_FPS = 10
+# while waiting for a human player the loop sleeps until an event arrives, or at most this many milliseconds.
+# False polls every frame at FPS instead
+EVENT_DRIVEN = True
+IDLE_WAIT = 1000
+BOARD_BACKENDS = {"list": GameBoard, "bitboard": BitGameBoard}
+BOARD_BACKEND = "list"
+# team ids played by the computer, e.g. [BLACKPLAYER], and its thinking time per move in seconds
+COMPUTER_TEAMS = []
+COMPUTER_MOVE_TIME = 1.0
+# processes per computer player search, more than one runs a parallel search over a shared transposition table
+COMPUTER_WORKERS = 1
+# a network file saved with objects.nnue.Network.save to evaluate with instead of the piece-square tables, needs NumPy
+COMPUTER_NNUE_PATH = None
+# a file every game is appended to in PGN when it ends or the window is closed, e.g. "games.pgn", or None
+PGN_PATH = None
+# sprites pre-rendered by tools.build_assets, the PNG images are decoded instead if it is missing or stale, or None
+SPRITE_BUNDLE = SPRITE_BUNDLE_PATH
 
 
 def setup():
@@ -29,7 +51,10 @@ def setup():
     window = pygame.display.set_mode((WINDOWWIDTH, WINDOWHEIGHT))
     pygame.display.set_caption("Chess")  # window title
     window.fill(GREY)
-    chessboard = GameBoard(
+    if SPRITE_BUNDLE is not None:
+        SPRITE_CACHE.load_bundle(SQUARESIZE, SPRITE_BUNDLE)
+    board_class = BOARD_BACKENDS[BOARD_BACKEND]
+    chessboard = board_class(
         SQUARESIZE, SQUARECOUNT, DARKCOLOR, LIGHTCOLOR, window
     )  # create a board
     chessboard.draw_board()
@@ -40,17 +65,42 @@ def setup():
     return (pygame.time.Clock(), chessboard, black_player, white_player)
 
 
+def run_frame(game_state: GameState, clock: pygame.time.Clock):
+    """
+    Runs one pass of the game loop: handles events, updates the state and draws what changed.
+
+    While a human player is to click the loop blocks on the next event instead of ticking, otherwise it runs at FPS,
+    or BACKGROUND_FPS when the window is not focused.
+    """
+    idle = EVENT_DRIVEN and game_state.is_waiting_for_input()
+    game_state.handle_events(IDLE_WAIT if idle else 0)
+    if not game_state.get_game_is_running():
+        # the window was closed
+        return
+    game_state.update_state()
+    dirty_rects = game_state.render()
+    if dirty_rects:
+        pygame.display.update(dirty_rects)
+    if not idle:
+        focused = game_state.window_focused or not EVENT_DRIVEN
+        clock.tick(FPS if focused else BACKGROUND_FPS)
+
+
 def main():
     # Setup and Initialization
     delta_report = 0
     clock, chessboard, black_player, white_player = setup()
-    game_state = GameState(chessboard, black_player, white_player)
+    network = Network.load(COMPUTER_NNUE_PATH) if COMPUTER_NNUE_PATH else None
+    computer_players = {
+        team_id: ComputerPlayer(
+            Engine(COMPUTER_MOVE_TIME, workers=COMPUTER_WORKERS, network=network)
+        )
+        for team_id in COMPUTER_TEAMS
+    }
+    game_state = GameState(chessboard, black_player, white_player, computer_players, PGN_PATH)
     while game_state.get_game_is_running():
-        game_state.handle_events()
-        game_state.update_state()
-        game_state.render()
+        run_frame(game_state, clock)
         delta_report += 1
-        clock.tick(FPS)
         """        
         if delta_report == 50:
             print("\n"*2)
@@ -62,8 +112,10 @@ def main():
             print("\n"*2)
             delta_report = 0
         """
-
-        pygame.display.update()
+    for computer_player in computer_players.values():
+        computer_player.stop()
+        computer_player.engine.close()
+    game_state.worker.shutdown()
     pygame.quit()
 
 
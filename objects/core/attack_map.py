@@ -0,0 +1,169 @@
+from .constants import SQUARECOUNT, WHITE, BLACK, PIECE_PAWN
+from .move_tables import PAWN_CAPTURE_TARGETS
+from .piece import Piece
+
+
+class _RecordingBoard:
+    """
+    Wraps a board and records every square a piece reads while generating its moves.
+
+    Pieces only use in_bounds, is_empty, get_square_contents and peek_square, so the recorded squares are exactly
+    the squares whose contents the pieces moves depend on.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.reads: set[int] = set()
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return self.board.in_bounds(row, col)
+
+    def get_square_contents(self, row: int, col: int) -> Piece | None:
+        contents = self.board.get_square_contents(row, col)
+        self.reads.add(row * SQUARECOUNT + col)
+        return contents
+
+    def peek_square(self, row: int, col: int) -> Piece | None:
+        self.reads.add(row * SQUARECOUNT + col)
+        return self.board.struct[row][col]
+
+    def is_empty(self, row: int, col: int) -> bool:
+        if not self.in_bounds(row, col):
+            raise IndexError(f"Position out of bounds: ({row}, {col})")
+        return self.get_square_contents(row, col) is None
+
+
+class AttackMap:
+    """
+    Per-team attack maps and per-piece valid move caches for a board, maintained incrementally.
+
+    The board reports every square it changes through mark_dirty. Nothing is recomputed until the next query, at which
+    point only the pieces that read a dirty square while generating their moves (sliders whose rays pass over it,
+    leapers and pawns that target it) and the pieces standing on dirty squares are regenerated.
+
+    Args:
+        board (BoardCore): The board whose pieces are tracked
+
+    Attributes:
+        dirty (set[int]): Squares (row * 8 + col) changed since the last refresh
+        watchers (list[set[Piece]]): watchers[sq] are the pieces whose moves depend on the contents of sq
+        attackers (list[set[Piece]]): attackers[sq] are the pieces, of either team, that attack sq
+        attack_counts (list[list[int]]): attack_counts[color][sq] is the number of pieces of that color attacking sq
+        moves (dict[Piece, list[tuple[int, int]]]): Cached valid moves for each piece on the board
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.dirty: set[int] = set()
+        self.watchers: list[set[Piece]] = [set() for _ in range(SQUARECOUNT * SQUARECOUNT)]
+        self.attackers: list[set[Piece]] = [set() for _ in range(SQUARECOUNT * SQUARECOUNT)]
+        self.attack_counts: list[list[int]] = [[0] * (SQUARECOUNT * SQUARECOUNT) for _ in (BLACK, WHITE)]
+        self.moves: dict[Piece, list[tuple[int, int]]] = {}
+        self._reads: dict[Piece, set[int]] = {}
+        self._attacks: dict[Piece, list[int]] = {}
+
+    def mark_dirty(self, row: int, col: int):
+        """
+        Records that the contents of the square (row, col) changed. Called by the board on every change to struct.
+        """
+        self.dirty.add(row * SQUARECOUNT + col)
+
+    def get_valid_moves(self, piece: Piece) -> list[tuple[int, int]]:
+        """
+        Returns the cached valid moves of a piece that is on the board. The list must not be modified.
+        """
+        self._refresh()
+        return self.moves[piece]
+
+    def is_attacked(self, row: int, col: int, team) -> bool:
+        """
+        Returns True if any piece of the given team attacks (or defends) the square (row, col).
+        """
+        self._refresh()
+        return self.attack_counts[team.color][row * SQUARECOUNT + col] > 0
+
+    def get_attackers(self, row: int, col: int, team=None) -> list[Piece]:
+        """
+        Returns the pieces attacking the square (row, col), only those of the given team if one is given.
+        """
+        self._refresh()
+        attackers = self.attackers[row * SQUARECOUNT + col]
+        if team is None:
+            return list(attackers)
+        return [piece for piece in attackers if team.owns(piece)]
+
+    def get_attacked_squares(self, team) -> set[tuple[int, int]]:
+        """
+        Returns every (row, col) square attacked by the given team.
+        """
+        self._refresh()
+        counts = self.attack_counts[team.color]
+        return {
+            (sq // SQUARECOUNT, sq % SQUARECOUNT)
+            for sq in range(SQUARECOUNT * SQUARECOUNT)
+            if counts[sq]
+        }
+
+    def _refresh(self):
+        """
+        Regenerates the pieces affected by the dirty squares and clears them.
+        """
+        if not self.dirty:
+            return
+        struct = self.board.struct
+        affected = set()
+        for sq in self.dirty:
+            affected.update(self.watchers[sq])
+            occupant = struct[sq // SQUARECOUNT][sq % SQUARECOUNT]
+            if occupant is not None:
+                affected.add(occupant)
+        self.dirty.clear()
+        for piece in affected:
+            self._forget(piece)
+        for piece in affected:
+            # pieces that were captured or promoted away are only forgotten
+            if struct[piece.row][piece.col] is piece:
+                self._scan(piece)
+
+    def _forget(self, piece: Piece):
+        """
+        Removes a piece's contribution to the watchers, attackers and move cache.
+        """
+        reads = self._reads.pop(piece, None)
+        if reads is None:
+            return
+        for sq in reads:
+            self.watchers[sq].discard(piece)
+        counts = self.attack_counts[piece.color]
+        for sq in self._attacks.pop(piece):
+            self.attackers[sq].discard(piece)
+            counts[sq] -= 1
+        del self.moves[piece]
+
+    def _scan(self, piece: Piece):
+        """
+        Generates the moves of a piece and records which squares it reads and attacks.
+        """
+        recorder = _RecordingBoard(self.board)
+        self.moves[piece] = piece.generate_valid_moves(recorder)
+        own_sq = piece.row * SQUARECOUNT + piece.col
+        reads = recorder.reads
+        if piece.type == PIECE_PAWN:
+            # pawns read the squares in front of them but only attack diagonally
+            team_id = piece.color
+            attacks = [
+                row * SQUARECOUNT + col
+                for row, col in PAWN_CAPTURE_TARGETS[team_id][piece.row][piece.col]
+            ]
+        else:
+            # every square a leaper or a slider reads is one it attacks, up to and including blockers
+            attacks = list(reads)
+        reads.add(own_sq)
+        self._reads[piece] = reads
+        self._attacks[piece] = attacks
+        for sq in reads:
+            self.watchers[sq].add(piece)
+        counts = self.attack_counts[piece.color]
+        for sq in attacks:
+            self.attackers[sq].add(piece)
+            counts[sq] += 1
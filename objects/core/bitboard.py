@@ -0,0 +1,305 @@
+from .constants import (
+    SQUARECOUNT,
+    BLACKPLAYER,
+    WHITEPLAYER,
+    PIECE_PAWN,
+    PIECE_KNIGHT,
+    PIECE_BISHOP,
+    PIECE_ROOK,
+    PIECE_QUEEN,
+    PIECE_KING,
+    DIAGONALS,
+    CARDINALS,
+)
+from . import move_tables
+from .move_tables import KNIGHT_TARGETS, KING_TARGETS, PAWN_CAPTURE_TARGETS
+from .board import BoardCore, LegalityMasks
+from .piece import Piece
+from .team import Team
+
+# Squares are indexed 0..63 as row * 8 + col, so bit 0 is the top-left square (row 0, col 0).
+SQUARE_POSITIONS = [(sq // SQUARECOUNT, sq % SQUARECOUNT) for sq in range(64)]
+# bitboards are indexed by piece kind
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = PIECE_PAWN, PIECE_KNIGHT, PIECE_BISHOP, PIECE_ROOK, PIECE_QUEEN, PIECE_KING
+
+
+def _mask(squares: list[tuple[int, int]]) -> int:
+    mask = 0
+    for row, col in squares:
+        mask |= 1 << (row * SQUARECOUNT + col)
+    return mask
+
+
+def _square_masks(table: list[list[list[tuple[int, int]]]]) -> list[int]:
+    """
+    Converts a per-square move_tables target table into one bitboard per square index.
+    """
+    return [_mask(table[row][col]) for row, col in SQUARE_POSITIONS]
+
+
+def _ray_masks(table: list[list[list[list[tuple[int, int]]]]], directions: list[tuple[int, int]]):
+    """
+    Converts per-square move_tables rays into (ray masks per square, is positive) pairs, one per direction.
+    A direction is positive if stepping along it increases the square index.
+    """
+    return [
+        (
+            [_mask(table[row][col][index]) for row, col in SQUARE_POSITIONS],
+            dr * SQUARECOUNT + dc > 0,
+        )
+        for index, (dr, dc) in enumerate(directions)
+    ]
+
+
+def _between_masks() -> list[list[int]]:
+    """
+    BETWEEN[a][b] holds the squares strictly between a and b when they share a rank, file or diagonal, else 0.
+    """
+    between = [[0] * 64 for _ in range(64)]
+    for ((start_row, start_col), (end_row, end_col)), squares in move_tables.BETWEEN.items():
+        between[start_row * SQUARECOUNT + start_col][end_row * SQUARECOUNT + end_col] = _mask(squares)
+    return between
+
+
+KNIGHT_ATTACKS = _square_masks(KNIGHT_TARGETS)
+KING_ATTACKS = _square_masks(KING_TARGETS)
+# PAWN_ATTACKS[team_id][sq] are the squares a pawn of that team attacks from sq
+PAWN_ATTACKS = [_square_masks(PAWN_CAPTURE_TARGETS[BLACKPLAYER]), _square_masks(PAWN_CAPTURE_TARGETS[WHITEPLAYER])]
+BISHOP_RAYS = _ray_masks(move_tables.BISHOP_RAYS, DIAGONALS)
+ROOK_RAYS = _ray_masks(move_tables.ROOK_RAYS, CARDINALS)
+BETWEEN = _between_masks()
+
+
+def _slider_attacks(sq: int, occupied: int, rays: list[tuple[list[int], bool]]) -> int:
+    """
+    Returns the squares attacked from sq along the given rays, stopping at (and including) the first blocker.
+    """
+    attacks = 0
+    for ray, positive in rays:
+        ray_mask = ray[sq]
+        blockers = ray_mask & occupied
+        if blockers:
+            if positive:
+                first = (blockers & -blockers).bit_length() - 1
+            else:
+                first = blockers.bit_length() - 1
+            ray_mask ^= ray[first]
+        attacks |= ray_mask
+    return attacks
+
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    return _slider_attacks(sq, occupied, BISHOP_RAYS)
+
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    return _slider_attacks(sq, occupied, ROOK_RAYS)
+
+
+def iter_squares(bb: int):
+    """
+    Yields the square index of every set bit in bb, lowest first.
+    """
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+class BitBoardCore(BoardCore):
+    """
+    A BoardCore that additionally keeps the position as 64-bit integers, one per (team, piece type),
+    and answers move generation queries with bitwise operations instead of walking struct.
+
+    struct is still maintained so that drawing, mouse selection and GameState work unchanged.
+
+    Attributes:
+        bitboards (list[list[int]]): bitboards[team_id][kind] has a bit set for every square holding that piece.
+        occupancy (list[int]): occupancy[team_id] has a bit set for every square holding a piece of that team.
+        occupied (int): Every occupied square.
+    """
+
+    def __init__(self, square_size: int, square_count: int):
+        if square_count != SQUARECOUNT:
+            raise ValueError(f"Bitboards only support a {SQUARECOUNT}x{SQUARECOUNT} board")
+        super().__init__(square_size, square_count)
+        self.bitboards: list[list[int]] = [[0] * 6, [0] * 6]
+        self.occupancy: list[int] = [0, 0]
+        self.occupied: int = 0
+
+    def init_struct(self):
+        super().init_struct()
+        self.bitboards = [[0] * 6, [0] * 6]
+        self.occupancy = [0, 0]
+        self.occupied = 0
+
+    @staticmethod
+    def _team_index(piece: Piece) -> int:
+        return piece.color
+
+    def _toggle_bits(self, piece: Piece, sq: int):
+        """
+        Adds or removes (xor) the piece at sq from every bitboard it belongs to.
+        """
+        bit = 1 << sq
+        team = self._team_index(piece)
+        self.bitboards[team][piece.type] ^= bit
+        self.occupancy[team] ^= bit
+        self.occupied ^= bit
+
+    def _place(self, piece: Piece, row: int, col: int):
+        super()._place(piece, row, col)
+        self._toggle_bits(piece, row * SQUARECOUNT + col)
+
+    def _lift(self, row: int, col: int) -> Piece | None:
+        piece = super()._lift(row, col)
+        if piece is not None:
+            self._toggle_bits(piece, row * SQUARECOUNT + col)
+        return piece
+
+    def generate_valid_moves(self, piece: Piece):
+        if piece is not None:
+            return [
+                SQUARE_POSITIONS[sq]
+                for sq in iter_squares(self._pseudo_legal_targets(piece))
+            ]
+
+    def _pseudo_legal_targets(self, piece: Piece) -> int:
+        """
+        Returns the destination squares of every valid (pseudo-legal) move for the piece as a bitboard.
+        Mirrors the rules implemented by the Piece subclasses.
+        """
+        sq = piece.row * SQUARECOUNT + piece.col
+        team = self._team_index(piece)
+        own = self.occupancy[team]
+        kind = piece.type
+        if kind == PAWN:
+            return self._pawn_targets(piece, sq, team)
+        if kind == KNIGHT:
+            return KNIGHT_ATTACKS[sq] & ~own
+        if kind == KING:
+            return KING_ATTACKS[sq] & ~own
+        attacks = 0
+        if kind == BISHOP or kind == QUEEN:
+            attacks |= bishop_attacks(sq, self.occupied)
+        if kind == ROOK or kind == QUEEN:
+            attacks |= rook_attacks(sq, self.occupied)
+        return attacks & ~own
+
+    def _pawn_targets(self, piece: Piece, sq: int, team: int) -> int:
+        targets = PAWN_ATTACKS[team][sq] & self.occupancy[1 - team]
+        step = -SQUARECOUNT if team == WHITEPLAYER else SQUARECOUNT
+        one_forward = sq + step
+        if 0 <= one_forward < 64 and not (self.occupied >> one_forward) & 1:
+            targets |= 1 << one_forward
+            two_forward = one_forward + step
+            if (
+                not piece.has_moved
+                and 0 <= two_forward < 64
+                and not (self.occupied >> two_forward) & 1
+            ):
+                targets |= 1 << two_forward
+        return targets
+
+    def attackers_of(self, sq: int, team: int, occupied: int) -> int:
+        """
+        Returns a bitboard of the pieces of the given team that attack sq.
+
+        Args:
+            sq (int): The attacked square
+            team (int): The team id of the attacking side
+            occupied (int): The occupancy to use for sliding pieces
+        """
+        pieces = self.bitboards[team]
+        attackers = KNIGHT_ATTACKS[sq] & pieces[KNIGHT]
+        attackers |= KING_ATTACKS[sq] & pieces[KING]
+        # a pawn of the other team standing on sq attacks exactly the squares enemy pawns attack sq from
+        attackers |= PAWN_ATTACKS[1 - team][sq] & pieces[PAWN]
+        attackers |= bishop_attacks(sq, occupied) & (pieces[BISHOP] | pieces[QUEEN])
+        attackers |= rook_attacks(sq, occupied) & (pieces[ROOK] | pieces[QUEEN])
+        return attackers
+
+    def generate_legal_moves(
+        self,
+        piece: Piece | None,
+        team: Team,
+        enemy: Team,
+        masks: LegalityMasks | None = None,
+        captures: bool | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Returns the legal moves for a given piece, see BoardCore.generate_legal_moves.
+        The pseudo-legal targets are filtered against the masks, and to captures or non-captures, with a few bitwise
+        ands.
+        """
+        if piece is None:
+            return []
+        if masks is None:
+            masks = self.compute_legality_masks(team, enemy)
+        targets = self._pseudo_legal_targets(piece)
+        if captures is not None:
+            targets &= self.occupied if captures else ~self.occupied
+        if piece is team.king:
+            targets &= ~masks.attacked
+        elif masks.checkers > 1:  # only the king can answer a double check
+            targets = 0
+        else:
+            if masks.check_mask is not None:
+                targets &= masks.check_mask
+            pin_ray = masks.pins.get(piece)
+            if pin_ray is not None:
+                targets &= pin_ray
+        return [SQUARE_POSITIONS[sq] for sq in iter_squares(targets)]
+
+    def compute_legality_masks(self, team: Team, enemy: Team) -> LegalityMasks:
+        """
+        Computes the LegalityMasks for the team to move with every field stored as a bitboard instead of a set.
+        """
+        king = team.king
+        king_sq = king.row * SQUARECOUNT + king.col
+        team_id = self._team_index(king)
+        enemy_id = 1 - team_id
+        pieces = self.bitboards[enemy_id]
+
+        # squares attacked by the enemy, with the king lifted so sliding attacks pass through it
+        occupied = self.occupied ^ (1 << king_sq)
+        attacked = 0
+        for sq in iter_squares(pieces[PAWN]):
+            attacked |= PAWN_ATTACKS[enemy_id][sq]
+        for sq in iter_squares(pieces[KNIGHT]):
+            attacked |= KNIGHT_ATTACKS[sq]
+        for sq in iter_squares(pieces[KING]):
+            attacked |= KING_ATTACKS[sq]
+        for sq in iter_squares(pieces[BISHOP] | pieces[QUEEN]):
+            attacked |= bishop_attacks(sq, occupied)
+        for sq in iter_squares(pieces[ROOK] | pieces[QUEEN]):
+            attacked |= rook_attacks(sq, occupied)
+
+        checkers = self.attackers_of(king_sq, enemy_id, self.occupied)
+        checker_count = checkers.bit_count()
+        check_mask = None
+        if checker_count == 1:
+            checker_sq = checkers.bit_length() - 1
+            check_mask = BETWEEN[king_sq][checker_sq] | checkers
+
+        # sliders that would attack the king if only enemy pieces stood in the way
+        enemy_occupancy = self.occupancy[enemy_id]
+        snipers = bishop_attacks(king_sq, enemy_occupancy) & (pieces[BISHOP] | pieces[QUEEN])
+        snipers |= rook_attacks(king_sq, enemy_occupancy) & (pieces[ROOK] | pieces[QUEEN])
+        pins = {}
+        for sniper_sq in iter_squares(snipers):
+            blockers = BETWEEN[king_sq][sniper_sq] & self.occupied
+            if blockers and blockers & (blockers - 1) == 0:  # exactly one piece in between
+                pinned_row, pinned_col = SQUARE_POSITIONS[blockers.bit_length() - 1]
+                pins[self.struct[pinned_row][pinned_col]] = BETWEEN[king_sq][sniper_sq] | (1 << sniper_sq)
+        return LegalityMasks(attacked, pins, check_mask, checker_count)
+
+    def get_checking_pieces(self, current_player: Team, enemy_team: Team):
+        king = current_player.king
+        king_sq = king.row * SQUARECOUNT + king.col
+        enemy_id = 1 - self._team_index(king)
+        checking_pieces = {}
+        for sq in iter_squares(self.attackers_of(king_sq, enemy_id, self.occupied)):
+            row, col = SQUARE_POSITIONS[sq]
+            checking_pieces[self.struct[row][col]] = (row, col)
+        return checking_pieces
@@ -0,0 +1,601 @@
+from .constants import (
+    SQUARECOUNT,
+    PIECE_PAWN,
+    PIECE_ROOK,
+    PIECE_BISHOP,
+    PIECE_KNIGHT,
+    PIECE_QUEEN,
+    PIECE_NAMES,
+    PROMOTION_TYPES,
+    DIAGONALS,
+    CARDINALS,
+    BLACKPLAYER,
+    WHITEPLAYER,
+    DEBUG_EVALUATION,
+)
+from .move_tables import (
+    KING_DIRECTIONS,
+    KNIGHT_TARGETS,
+    PAWN_CAPTURE_TARGETS,
+    QUEEN_RAYS,
+    BETWEEN,
+)
+from .piece import Piece, Pawn, Knight, Bishop, Rook, Queen, King
+from .team import Team
+from .attack_map import AttackMap
+from .zobrist import piece_key, BLACK_TO_MOVE_KEY
+from .evaluation import Evaluation
+
+
+class MoveRecord:
+    """
+    Everything needed to take back a move made with BoardCore.make_move.
+
+    Attributes:
+        piece (Piece): The piece that was moved
+        from_row (int): The row the piece moved from
+        from_col (int): The col the piece moved from
+        captured_piece (Piece | None): The piece that stood on the destination square, if any
+        had_moved (bool | None): The piece's has_moved flag before the move, None for pieces without one
+        team (Team | None): The team of the moved piece, only set for promotions
+        promoted_piece (Piece | None): The piece the pawn was promoted into, if the move was a promotion
+        promoted_index (int | None): Index of the pawn in team.active_pieces before it was promoted
+    """
+
+    def __init__(
+        self,
+        piece: Piece,
+        from_row: int,
+        from_col: int,
+        captured_piece: Piece | None,
+        had_moved: bool | None,
+    ):
+        self.piece = piece
+        self.from_row = from_row
+        self.from_col = from_col
+        self.captured_piece = captured_piece
+        self.had_moved = had_moved
+        self.team: Team | None = None
+        self.promoted_piece: Piece | None = None
+        self.promoted_index: int | None = None
+
+
+SLIDING_DIRECTIONS = {
+    PIECE_BISHOP: DIAGONALS,
+    PIECE_ROOK: CARDINALS,
+    PIECE_QUEEN: CARDINALS + DIAGONALS,
+}
+
+
+class LegalityMasks:
+    """
+    Per position data used to filter valid moves down to legal moves without simulating them.
+
+    Attributes:
+        attacked (set[tuple[int, int]]): Squares attacked by the enemy, computed as if the king was not on the board
+        so the king cannot step back along the line of a sliding attacker.
+        pins (dict[Piece, set[tuple[int, int]]]): Absolutely pinned pieces, mapped to the squares between the king and
+        the pinning piece (pinning piece included) which they are still allowed to move to.
+        check_mask (set[tuple[int, int]] | None): When in check, the squares a non-king move must land on to capture
+        or block the checking piece. None when not in check.
+        checkers (int): The number of enemy pieces giving check.
+
+    BitBoardCore stores the same fields as bitboards (ints) instead of sets.
+    """
+
+    def __init__(
+        self,
+        attacked: set[tuple[int, int]],
+        pins: dict[Piece, set[tuple[int, int]]],
+        check_mask: set[tuple[int, int]] | None,
+        checkers: int,
+    ):
+        self.attacked = attacked
+        self.pins = pins
+        self.check_mask = check_mask
+        self.checkers = checkers
+
+
+class BoardCore:
+    """
+    The rules side of a chessboard: where the pieces are and which moves they can make. Has no rendering.
+
+    Args:
+        square_size (int): The pixel size of each individual square
+        square_count (int): The number of squares in a given row or column
+
+    Attributes:
+        struct (list[list[Piece | None]]): 2D grid storing pieces or None
+        attack_map (AttackMap): Incrementally maintained attack maps and move caches
+        side_to_move (int): The team id of the team to move, flipped by every move
+        zobrist_key (int): 64-bit Zobrist hash of the position and side to move, kept up to date on every change.
+        Equal positions have equal keys, so it can be used to cache or compare positions.
+        evaluation (Evaluation): Material and piece-square totals, kept up to date on every change
+    """
+
+    def __init__(self, square_size: int, square_count: int):
+        self.square_size = square_size
+        self.square_count = square_count
+        self.struct: list[list[Piece | None]] = None  # delayed setup
+        self.attack_map: AttackMap | None = None  # created with struct
+        self.side_to_move: int = WHITEPLAYER
+        self.zobrist_key: int = 0
+
+    def init_struct(self):
+        """
+        Creates an empty struct. Must be called by objects that require the struct attribute before any
+        pieces are placed.
+        """
+        self.struct = self._create_board_struct()
+        self.attack_map = AttackMap(self)
+        self.side_to_move = WHITEPLAYER
+        self.zobrist_key = 0
+        self.evaluation = Evaluation()
+
+    def _create_board_struct(self) -> list[list[Piece | None]]:
+        """
+        Initializes the structure of the board as a 2D list.
+        Each element of the list is either a Piece object or None which represents an empty square.
+
+        Returns:
+            list[list[Piece | None]]: a square_count x square_c(ount Grid
+        """
+        struct = []
+        for row_index in range(self.square_count):
+            row = []
+            for col_index in range(self.square_count):
+                row.append(None)
+            struct.append(row)
+        return struct
+
+    def set_piece(self, piece: Piece):
+        """
+        Places piece on the board at its specified (row, col) position
+        This method is used during setup of games, not for movement of pieces.
+
+
+        Args:
+            piece (Piece) : The piece object with its 'row' and 'col' attributes set
+
+        Raises:
+            ValueError: If the target square is already filled
+            IndexError: If the specififed location is out of bounds
+        """
+        # ensures board is empty at location.
+        row, col = piece.row, piece.col
+
+        if not self.in_bounds(row, col):
+            raise IndexError(f"Board position out of bounds: ({row}, {col})")
+
+        if self.struct[row][col] is None:
+            self._place(piece, row, col)
+        else:
+            raise ValueError(f"Square is occupied at ({row}, {col})")
+
+    def is_empty(self, row: int, col: int) -> bool:
+        """
+        Checks if given square is empty
+
+        Args:
+            row (int): The row of the square
+            col (int): The column of the square
+
+        Raises:
+            IndexError: if the position (row, col) is not valid
+        """
+        if not self.in_bounds(row, col):
+            raise IndexError(f"Position out of bounds: ({row}, {col})")
+        return self.get_square_contents(row, col) is None
+
+    def get_square_contents(self, row: int, col: int) -> Piece | None:
+        """
+        Returns the piece at the board position board(row, col), or None if the square is empty
+        input :
+            row (int) : 0-indexed
+            col (int) : 0-indexed
+        Raises :
+            ValueError if row or column are out of bounds
+        """
+        if not (0 <= row < SQUARECOUNT and 0 <= col < SQUARECOUNT):
+            raise ValueError("Invalid row or column")
+        return self.struct[row][col]
+
+    def peek_square(self, row: int, col: int) -> Piece | None:
+        """
+        Returns the piece at (row, col) without bounds checking.
+        Only for squares known to be on the board, such as those taken from move_tables.
+        """
+        return self.struct[row][col]
+
+    def generate_valid_moves(
+        self,
+        piece: Piece,
+    ):
+        """
+        Returns the valid moves of a piece on the board, served from the attack maps move cache.
+        """
+        if piece is not None:
+            return self.attack_map.get_valid_moves(piece)
+
+    def generate_legal_moves(
+        self,
+        piece: Piece | None,
+        team: Team,
+        enemy: Team,
+        masks: LegalityMasks | None = None,
+        captures: bool | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Returns the legal moves for a given piece, i.e. the valid moves that do not leave the teams king in check.
+
+        Valid moves are filtered against the positions LegalityMasks: the king may not move onto an attacked square,
+        a pinned piece must stay on its pin ray and when in check every other move must capture or block the checker.
+
+        Args:
+            piece (Piece | None): the given piece. If the piece does not exist returns the empty list.
+            team (Team): The team the piece belongs to
+            enemy (Team): The opposing team
+            masks (LegalityMasks | None): Masks for the current position, computed if not given. Pass them in when
+            generating moves for several pieces of the same position.
+            captures (bool | None): True for only the moves that capture, False for only the moves onto empty
+            squares, None for both
+
+        Returns:
+            list[tuple[int, int]]: a list of legal moves positions stored as (row, col) tuples.
+        """
+        if piece is None:
+            return []
+        if masks is None:
+            masks = self.compute_legality_masks(team, enemy)
+        valid_moves = self.generate_valid_moves(piece)
+        if captures is not None:
+            struct = self.struct
+            valid_moves = [move for move in valid_moves if (struct[move[0]][move[1]] is not None) == captures]
+        if piece is team.king:
+            return [move for move in valid_moves if move not in masks.attacked]
+        if masks.checkers > 1:  # only the king can answer a double check
+            return []
+        pin_ray = masks.pins.get(piece)
+        check_mask = masks.check_mask
+        legal_moves = []
+        for move in valid_moves:
+            if check_mask is not None and move not in check_mask:
+                continue
+            if pin_ray is not None and move not in pin_ray:
+                continue
+            legal_moves.append(move)
+        return legal_moves
+
+    def compute_legality_masks(self, team: Team, enemy: Team) -> LegalityMasks:
+        """
+        Computes the attacked squares, absolute pins and check evasion mask for the team to move.
+
+        Args:
+            team (Team): The team to move
+            enemy (Team): The opposing team
+
+        Returns:
+            LegalityMasks: The masks used by generate_legal_moves
+        """
+        king = team.king
+        king_row, king_col = king.row, king.col
+        pins = {}
+        check_mask = set()
+        checkers = 0
+        king_square = (king_row, king_col)
+        # walk outwards from the king, looking for sliding checkers and for pins
+        for (dr, dc), ray in zip(KING_DIRECTIONS, QUEEN_RAYS[king_row][king_col]):
+            if dr == 0 or dc == 0:
+                sliders = (PIECE_ROOK, PIECE_QUEEN)
+            else:
+                sliders = (PIECE_BISHOP, PIECE_QUEEN)
+            pinned = None
+            for square in ray:
+                occupant = self.peek_square(*square)
+                if occupant is None:
+                    continue
+                if occupant.color == king.color:
+                    if pinned is not None:  # two allies in a row, nothing is pinned
+                        break
+                    pinned = occupant
+                    continue
+                if occupant.type in sliders:
+                    line = set(BETWEEN[(king_square, square)])
+                    line.add(square)
+                    if pinned is None:
+                        checkers += 1
+                        check_mask.update(line)
+                    else:
+                        pins[pinned] = line
+                break
+
+        for square in KNIGHT_TARGETS[king_row][king_col]:
+            occupant = self.peek_square(*square)
+            if occupant is not None and occupant.type == PIECE_KNIGHT and king.is_enemy(occupant):
+                checkers += 1
+                check_mask.add(square)
+
+        # enemy pawns attack the king from the squares the king would capture on if it were a pawn
+        team_id = king.color
+        for square in PAWN_CAPTURE_TARGETS[team_id][king_row][king_col]:
+            occupant = self.peek_square(*square)
+            if occupant is not None and occupant.type == PIECE_PAWN and king.is_enemy(occupant):
+                checkers += 1
+                check_mask.add(square)
+
+        attacked = self._attacked_squares(enemy, king)
+        return LegalityMasks(attacked, pins, check_mask if checkers else None, checkers)
+
+    def _attacked_squares(self, enemy: Team, king: Piece) -> set[tuple[int, int]]:
+        """
+        Returns every square attacked by the enemy team, sliding attacks pass through the given king.
+        """
+        attacked = self.attack_map.get_attacked_squares(enemy)
+        # the square behind the king on the line of a sliding checker is attacked too,
+        # the king cannot escape by stepping back along that line
+        for attacker in self.attack_map.get_attackers(king.row, king.col, enemy):
+            if attacker.type in SLIDING_DIRECTIONS:
+                dr = (king.row > attacker.row) - (king.row < attacker.row)
+                dc = (king.col > attacker.col) - (king.col < attacker.col)
+                if self.in_bounds(king.row + dr, king.col + dc):
+                    attacked.add((king.row + dr, king.col + dc))
+        return attacked
+
+    def build_move_dict(
+        self, team: Team, enemy: Team
+    ) -> dict[Piece, list[tuple[int, int]]]:
+        move_dict = {}
+        masks = self.compute_legality_masks(team, enemy)
+        for piece in team.get_active_pieces():
+            if self.struct[piece.row][piece.col] is not piece:
+                continue  # captured by a move that has not been taken back yet
+            move_dict[piece] = self.generate_legal_moves(piece, team, enemy, masks)
+        return move_dict
+
+    def build_move_list(
+        self, team: Team, enemy: Team
+    ) -> list[tuple[Piece, int, int, int | None]]:
+        """
+        Flattens build_move_dict into a list of (piece, row, col, promotion) moves. A pawn move onto the last rank
+        appears once per promotion type, every other move has promotion None.
+
+        Args:
+            team (Team): The team to move
+            enemy (Team): The opposing team
+
+        Returns:
+            list[tuple[Piece, int, int, int | None]]: The legal moves
+        """
+        moves = []
+        for piece, piece_moves in self.build_move_dict(team, enemy).items():
+            for row, col in piece_moves:
+                if piece.type == PIECE_PAWN and (row == 0 or row == self.square_count - 1):
+                    for promotion in PROMOTION_TYPES:
+                        moves.append((piece, row, col, promotion))
+                else:
+                    moves.append((piece, row, col, None))
+        return moves
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        """
+        Returns if a position is contained within the board
+
+        Args:
+            row(int): The positions row
+            col(int): The positions col
+        """
+        return (0 <= row < SQUARECOUNT) and (0 <= col < SQUARECOUNT)
+
+    def set_pieces(self, dark_pieces: list[Piece], light_pieces: list[Piece]):
+        """
+        Sets the dark pieces and light pieces for the corresponding players.
+
+        Assumes each piece has their 'row' and 'col' attributes setup
+
+        This method is only used for setting up all pieces, not moving groups of pieces.
+
+        Args:
+            dark_pieces(list[Piece]): The pieces for the player who plays the dark pieces
+            light_pieces(list[Piece]): The pieces for the player who plays the light pieces
+
+        Raises:
+            ValueError: If a piece is a placed on a square that is already occupied
+        """
+        for black_piece in dark_pieces:
+            self.set_piece(black_piece)
+        for white_piece in light_pieces:
+            self.set_piece(white_piece)
+
+    def move_piece(self, piece: Piece, dest_row: int, dest_col: int) -> Piece | None:
+        """
+        moves the given piece by updating both the pieces attributes and the boards structure.
+        If a piece is located at the destination square, it is "captured" by removing it from the board structure
+        and is returned.
+
+        This method does not handle drawing or rendering only piece and board logic.
+
+        Args:
+            piece (Piece): The piece that is being moved
+            dest_row (int): The row the piece will move to
+            dest_col (int): THe col the piece will move to
+
+        Returns:
+            (Piece | None): Returns a captured piece if any, else returns None
+        """
+        # Move piece by updating piece parameters
+        if (dest_row, dest_col) in self.generate_valid_moves(piece):
+            return self.make_move(piece, dest_row, dest_col).captured_piece
+
+    def make_move(
+        self,
+        piece: Piece,
+        dest_row: int,
+        dest_col: int,
+        team: Team | None = None,
+        promotion: int | None = None,
+    ) -> MoveRecord:
+        """
+        Moves the piece in place without validating the move, and returns the record needed to take it back.
+
+        Used to try moves out (legality testing, searching) without copying the board. The captured piece, if any,
+        is only taken off the board, it stays in its teams active_pieces.
+
+        Args:
+            piece (Piece): The piece that is being moved
+            dest_row (int): The row the piece will move to
+            dest_col (int): The col the piece will move to
+            team (Team | None): The team of the piece, required for promotions
+            promotion (int | None): The type a pawn reaching the last rank is upgraded to, see upgrade_piece
+
+        Returns:
+            MoveRecord: The undo record to pass to unmake_move
+        """
+        had_moved = getattr(piece, "has_moved", None)
+        captured_piece = self._lift(dest_row, dest_col)
+        self._lift(piece.row, piece.col)
+        (old_row, old_col) = piece.apply_move(dest_row, dest_col)
+        piece.update_after_move()
+        self._place(piece, dest_row, dest_col)
+        self._toggle_side_to_move()
+        record = MoveRecord(piece, old_row, old_col, captured_piece, had_moved)
+        if promotion is not None:
+            record.team = team
+            record.promoted_index = team.active_pieces.index(piece)
+            record.promoted_piece = self.upgrade_piece(team, piece, promotion)
+        return record
+
+    def unmake_move(self, record: MoveRecord):
+        """
+        Takes back a move made with make_move, restoring the captured piece, the moved pieces has_moved flag and
+        undoing any promotion.
+
+        Moves must be taken back in the reverse order they were made.
+
+        Args:
+            record (MoveRecord): The record returned by make_move
+        """
+        piece = record.piece
+        row, col = piece.row, piece.col
+        self._lift(row, col)
+        if record.promoted_piece is not None:
+            active_pieces = record.team.active_pieces
+            active_pieces.remove(record.promoted_piece)
+            active_pieces.insert(record.promoted_index, piece)
+        if record.captured_piece is not None:
+            self._place(record.captured_piece, row, col)
+        piece.apply_move(record.from_row, record.from_col)
+        if record.had_moved is not None:
+            piece.has_moved = record.had_moved
+        self._place(piece, record.from_row, record.from_col)
+        self._toggle_side_to_move()
+
+    def set_side_to_move(self, team_id: int):
+        """
+        Sets which team is to move, used when setting up a position. Moves made afterwards flip it.
+
+        Args:
+            team_id (int): BLACKPLAYER or WHITEPLAYER
+        """
+        if team_id != self.side_to_move:
+            self._toggle_side_to_move()
+
+    def _toggle_side_to_move(self):
+        self.side_to_move = BLACKPLAYER if self.side_to_move == WHITEPLAYER else WHITEPLAYER
+        self.zobrist_key ^= BLACK_TO_MOVE_KEY
+
+    def compute_zobrist_key(self) -> int:
+        """
+        Computes the positions Zobrist key from scratch. zobrist_key is kept equal to this incrementally,
+        this method exists to check that it is.
+        """
+        key = BLACK_TO_MOVE_KEY if self.side_to_move == BLACKPLAYER else 0
+        for row in range(self.square_count):
+            for col in range(self.square_count):
+                piece = self.struct[row][col]
+                if piece is not None:
+                    key ^= piece_key(piece, row, col)
+        return key
+
+    def evaluate(self, team_id: int) -> int:
+        """
+        Returns the static evaluation of the position in centipawns from the point of view of the given team, see
+        objects.core.evaluation. The evaluation is maintained as pieces are placed and lifted, so this is O(1).
+
+        Args:
+            team_id (int): BLACKPLAYER or WHITEPLAYER
+
+        Returns:
+            int: The evaluation, positive when the team is better
+        """
+        if DEBUG_EVALUATION:
+            self.evaluation.verify(self)
+        return self.evaluation.score(team_id)
+
+    def _place(self, piece: Piece, row: int, col: int):
+        """
+        Puts the piece on the square (row, col). All changes to struct go through _place and _lift so that
+        subclasses can keep other representations of the position in sync.
+        """
+        self.struct[row][col] = piece
+        self.attack_map.mark_dirty(row, col)
+        self.zobrist_key ^= piece_key(piece, row, col)
+        self.evaluation.add(piece, row, col)
+
+    def _lift(self, row: int, col: int) -> Piece | None:
+        """
+        Empties the square (row, col) and returns what was on it.
+        """
+        piece = self.struct[row][col]
+        self.struct[row][col] = None
+        self.attack_map.mark_dirty(row, col)
+        if piece is not None:
+            self.zobrist_key ^= piece_key(piece, row, col)
+            self.evaluation.remove(piece, row, col)
+        return piece
+
+    def upgrade_piece(self, team: Team, piece: Piece, dest_type: int) -> Piece:
+        """
+        Upgrades a pawn piece into a new type (rook, bishop, knight or queen).
+
+        Args:
+            team (Team): The team the pawn belongs to.
+            piece (Piece): The pawn piece to be upgraded
+            dest_type (int): The kind the piece will be upgraded to, e.g. PIECE_QUEEN
+
+        Returns:
+            Piece: The upgraded piece
+
+        Raises:
+            TypeError: If the piece is not a pawn, or if the piece does not belong to the given player / team
+            ValueError: If the dest_type is invalid
+        """
+        row, col, color = piece.row, piece.col, piece.color
+        upgrade_selection = {
+            PIECE_ROOK: Rook,
+            PIECE_BISHOP: Bishop,
+            PIECE_KNIGHT: Knight,
+            PIECE_QUEEN: Queen,
+        }
+        if piece.type != PIECE_PAWN:
+            raise TypeError(f"piece : {PIECE_NAMES[piece.type]} cannot be promoted")
+        if not team.owns(piece):
+            raise TypeError(f"piece : {PIECE_NAMES[piece.type]} does not belong to team")
+        if dest_type not in upgrade_selection:
+            raise ValueError(f"Invalid upgrade type : {dest_type}")
+        piece_class = upgrade_selection[dest_type]
+        new_piece = piece_class(color, row, col, dest_type)
+        self._lift(row, col)
+        self._place(new_piece, row, col)
+        team.active_pieces.remove(piece)
+        team.active_pieces.append(new_piece)
+        return new_piece
+
+    def get_checking_pieces(self, current_player: Team, enemy_team: Team):
+        """
+        Returns the enemy pieces attacking the current players king, mapped to their (row, col) positions.
+        """
+        king_row, king_col = current_player.king.get_grid_pos()
+        return {
+            enemy_piece: enemy_piece.get_grid_pos()
+            for enemy_piece in self.attack_map.get_attackers(king_row, king_col, enemy_team)
+        }
@@ -1,10 +1,7 @@
-import pygame
-
 WINDOWWIDTH = 800
 WINDOWHEIGHT = 800
 WINDOWTOBOARDRATIO = 1
 SQUARECOUNT = 8
-ALPHA_FLAG = pygame.SRCALPHA
 BOARDSIDELENGTH = WINDOWWIDTH * WINDOWTOBOARDRATIO
 SQUARESIZE = int(BOARDSIDELENGTH / SQUARECOUNT)
 BOARDPOSX = (WINDOWWIDTH - BOARDSIDELENGTH) / 2
@@ -13,15 +10,24 @@ EMPTY = None
 DIAGONALS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
 CARDINALS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 KNIGHT_OFFSET = [(-2, 1), (-2, -1), (2, 1), (2, -1), (1, 2), (-1, 2), (1, -2), (-1, -2)]
-PIECE_ROOK = "rook"
-PIECE_BISHOP = "bishop"
-PIECE_KNIGHT = "knight"
-PIECE_QUEEN = "queen"
-PIECE_PAWN = "pawn"
+# piece kinds, small ints so move generation compares and indexes by them cheaply
+PIECE_PAWN = 0
+PIECE_KNIGHT = 1
+PIECE_BISHOP = 2
+PIECE_ROOK = 3
+PIECE_QUEEN = 4
+PIECE_KING = 5
+PIECE_NAMES = {
+    PIECE_PAWN: "pawn",
+    PIECE_KNIGHT: "knight",
+    PIECE_BISHOP: "bishop",
+    PIECE_ROOK: "rook",
+    PIECE_QUEEN: "queen",
+    PIECE_KING: "king",
+}
+PROMOTION_TYPES = [PIECE_QUEEN, PIECE_ROOK, PIECE_BISHOP, PIECE_KNIGHT]
 DARKCOLOR = (102, 0, 0)
 LIGHTCOLOR = (185, 122, 87)
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 GOLD = (255, 215, 0)
@@ -35,3 +41,8 @@ ENDTURN = 4
 GAMEEND = 5
 BLACKPLAYER = 0
 WHITEPLAYER = 1
+# piece and team colors, the id of the team playing them
+BLACK = BLACKPLAYER
+WHITE = WHITEPLAYER
+# check the incrementally updated evaluation against a from-scratch recomputation on every BoardCore.evaluate call
+DEBUG_EVALUATION = False
@@ -0,0 +1,236 @@
+"""
+Static evaluation: material and piece-square tables, tapered between the middlegame and the endgame.
+
+Every piece is worth its material value plus a bonus for the square it stands on, with separate middlegame and
+endgame values. The two totals are blended by the game phase, which counts the minor and major pieces left on the
+board, so king safety matters while there is material to attack with and king activity once there is not.
+
+The tables are written from the light team's side, with row 0 (the eighth rank) first, and mirrored for the dark team.
+"""
+
+from .constants import (
+    SQUARECOUNT,
+    BLACKPLAYER,
+    WHITEPLAYER,
+    PIECE_PAWN,
+    PIECE_KNIGHT,
+    PIECE_BISHOP,
+    PIECE_ROOK,
+    PIECE_QUEEN,
+    PIECE_KING,
+)
+
+MIDDLEGAME_VALUES = {
+    PIECE_PAWN: 100,
+    PIECE_KNIGHT: 320,
+    PIECE_BISHOP: 330,
+    PIECE_ROOK: 500,
+    PIECE_QUEEN: 900,
+    PIECE_KING: 0,
+}
+ENDGAME_VALUES = {
+    PIECE_PAWN: 120,
+    PIECE_KNIGHT: 300,
+    PIECE_BISHOP: 320,
+    PIECE_ROOK: 530,
+    PIECE_QUEEN: 950,
+    PIECE_KING: 0,
+}
+# each piece left on the board adds its weight to the phase, the start position has MAX_PHASE
+PHASE_WEIGHTS = {
+    PIECE_PAWN: 0,
+    PIECE_KNIGHT: 1,
+    PIECE_BISHOP: 1,
+    PIECE_ROOK: 2,
+    PIECE_QUEEN: 4,
+    PIECE_KING: 0,
+}
+MAX_PHASE = 24
+
+# fmt: off
+_PAWN_TABLE = [
+     0,   0,   0,   0,   0,   0,   0,   0,
+    50,  50,  50,  50,  50,  50,  50,  50,
+    10,  10,  20,  30,  30,  20,  10,  10,
+     5,   5,  10,  25,  25,  10,   5,   5,
+     0,   0,   0,  20,  20,   0,   0,   0,
+     5,  -5, -10,   0,   0, -10,  -5,   5,
+     5,  10,  10, -20, -20,  10,  10,   5,
+     0,   0,   0,   0,   0,   0,   0,   0,
+]
+# in the endgame only how far a pawn has advanced matters
+_PAWN_ENDGAME_TABLE = [
+     0,   0,   0,   0,   0,   0,   0,   0,
+    90,  90,  90,  90,  90,  90,  90,  90,
+    55,  55,  55,  55,  55,  55,  55,  55,
+    30,  30,  30,  30,  30,  30,  30,  30,
+    15,  15,  15,  15,  15,  15,  15,  15,
+     5,   5,   5,   5,   5,   5,   5,   5,
+     0,   0,   0,   0,   0,   0,   0,   0,
+     0,   0,   0,   0,   0,   0,   0,   0,
+]
+_KNIGHT_TABLE = [
+   -50, -40, -30, -30, -30, -30, -40, -50,
+   -40, -20,   0,   0,   0,   0, -20, -40,
+   -30,   0,  10,  15,  15,  10,   0, -30,
+   -30,   5,  15,  20,  20,  15,   5, -30,
+   -30,   0,  15,  20,  20,  15,   0, -30,
+   -30,   5,  10,  15,  15,  10,   5, -30,
+   -40, -20,   0,   5,   5,   0, -20, -40,
+   -50, -40, -30, -30, -30, -30, -40, -50,
+]
+_BISHOP_TABLE = [
+   -20, -10, -10, -10, -10, -10, -10, -20,
+   -10,   0,   0,   0,   0,   0,   0, -10,
+   -10,   0,   5,  10,  10,   5,   0, -10,
+   -10,   5,   5,  10,  10,   5,   5, -10,
+   -10,   0,  10,  10,  10,  10,   0, -10,
+   -10,  10,  10,  10,  10,  10,  10, -10,
+   -10,   5,   0,   0,   0,   0,   5, -10,
+   -20, -10, -10, -10, -10, -10, -10, -20,
+]
+_ROOK_TABLE = [
+     0,   0,   0,   0,   0,   0,   0,   0,
+     5,  10,  10,  10,  10,  10,  10,   5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+     0,   0,   0,   5,   5,   0,   0,   0,
+]
+_QUEEN_TABLE = [
+   -20, -10, -10,  -5,  -5, -10, -10, -20,
+   -10,   0,   0,   0,   0,   0,   0, -10,
+   -10,   0,   5,   5,   5,   5,   0, -10,
+    -5,   0,   5,   5,   5,   5,   0,  -5,
+     0,   0,   5,   5,   5,   5,   0,  -5,
+   -10,   5,   5,   5,   5,   5,   0, -10,
+   -10,   0,   5,   0,   0,   0,   0, -10,
+   -20, -10, -10,  -5,  -5, -10, -10, -20,
+]
+_KING_TABLE = [
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -20, -30, -30, -40, -40, -30, -30, -20,
+   -10, -20, -20, -20, -20, -20, -20, -10,
+    20,  20,   0,   0,   0,   0,  20,  20,
+    20,  30,  10,   0,   0,  10,  30,  20,
+]
+_KING_ENDGAME_TABLE = [
+   -50, -40, -30, -20, -20, -30, -40, -50,
+   -30, -20, -10,   0,   0, -10, -20, -30,
+   -30, -10,  20,  30,  30,  20, -10, -30,
+   -30, -10,  30,  40,  40,  30, -10, -30,
+   -30, -10,  30,  40,  40,  30, -10, -30,
+   -30, -10,  20,  30,  30,  20, -10, -30,
+   -30, -30,   0,   0,   0,   0, -30, -30,
+   -50, -30, -30, -30, -30, -30, -30, -50,
+]
+# fmt: on
+
+_MIDDLEGAME_TABLES = {
+    PIECE_PAWN: _PAWN_TABLE,
+    PIECE_KNIGHT: _KNIGHT_TABLE,
+    PIECE_BISHOP: _BISHOP_TABLE,
+    PIECE_ROOK: _ROOK_TABLE,
+    PIECE_QUEEN: _QUEEN_TABLE,
+    PIECE_KING: _KING_TABLE,
+}
+_ENDGAME_TABLES = {**_MIDDLEGAME_TABLES, PIECE_PAWN: _PAWN_ENDGAME_TABLE, PIECE_KING: _KING_ENDGAME_TABLE}
+
+
+def _square_scores(values: dict[int, int], tables: dict[int, list[int]]) -> list[dict[int, list[int]]]:
+    """
+    Material plus table bonus, indexed [team_id][piece_type][row * 8 + col]. The dark team reads the tables with the
+    rows flipped.
+    """
+    scores = [None, None]
+    for team_id in (BLACKPLAYER, WHITEPLAYER):
+        flip = (SQUARECOUNT - 1) * SQUARECOUNT if team_id == BLACKPLAYER else 0
+        scores[team_id] = {
+            piece_type: [values[piece_type] + table[sq ^ flip] for sq in range(SQUARECOUNT * SQUARECOUNT)]
+            for piece_type, table in tables.items()
+        }
+    return scores
+
+
+MIDDLEGAME_SCORES = _square_scores(MIDDLEGAME_VALUES, _MIDDLEGAME_TABLES)
+ENDGAME_SCORES = _square_scores(ENDGAME_VALUES, _ENDGAME_TABLES)
+
+
+class Evaluation:
+    """
+    The material and piece-square totals of a board, maintained incrementally.
+
+    The board reports every piece it puts on or takes off a square through add and remove, so the totals are always
+    those of the current position and score is O(1) at any node of a search.
+
+    Attributes:
+        middlegame (list[int]): middlegame[team_id] is the teams middlegame material and square total
+        endgame (list[int]): endgame[team_id] is the teams endgame material and square total
+        phase (int): The sum of PHASE_WEIGHTS of the pieces on the board, MAX_PHASE in the start position
+    """
+
+    def __init__(self):
+        self.middlegame: list[int] = [0, 0]
+        self.endgame: list[int] = [0, 0]
+        self.phase: int = 0
+
+    def add(self, piece, row: int, col: int):
+        """
+        Adds a piece placed on the square (row, col).
+        """
+        team_id = piece.color
+        sq = row * SQUARECOUNT + col
+        self.middlegame[team_id] += MIDDLEGAME_SCORES[team_id][piece.type][sq]
+        self.endgame[team_id] += ENDGAME_SCORES[team_id][piece.type][sq]
+        self.phase += PHASE_WEIGHTS[piece.type]
+
+    def remove(self, piece, row: int, col: int):
+        """
+        Removes a piece lifted from the square (row, col).
+        """
+        team_id = piece.color
+        sq = row * SQUARECOUNT + col
+        self.middlegame[team_id] -= MIDDLEGAME_SCORES[team_id][piece.type][sq]
+        self.endgame[team_id] -= ENDGAME_SCORES[team_id][piece.type][sq]
+        self.phase -= PHASE_WEIGHTS[piece.type]
+
+    def score(self, team_id: int) -> int:
+        """
+        Returns the tapered evaluation in centipawns from the point of view of the given team.
+        """
+        other_id = 1 - team_id
+        middlegame = self.middlegame[team_id] - self.middlegame[other_id]
+        endgame = self.endgame[team_id] - self.endgame[other_id]
+        # promotions can push the phase past its starting value
+        phase = min(self.phase, MAX_PHASE)
+        return (middlegame * phase + endgame * (MAX_PHASE - phase)) // MAX_PHASE
+
+    @classmethod
+    def from_board(cls, board) -> "Evaluation":
+        """
+        Computes the totals of the position on the board from scratch.
+        """
+        evaluation = cls()
+        for row, rank in enumerate(board.struct):
+            for col, piece in enumerate(rank):
+                if piece is not None:
+                    evaluation.add(piece, row, col)
+        return evaluation
+
+    def verify(self, board):
+        """
+        Checks the incrementally maintained totals against a from-scratch computation.
+
+        Raises:
+            AssertionError: If they differ
+        """
+        expected = Evaluation.from_board(board)
+        if (self.middlegame, self.endgame, self.phase) != (expected.middlegame, expected.endgame, expected.phase):
+            raise AssertionError(
+                f"Incremental evaluation {self.__dict__} does not match the position {expected.__dict__}"
+            )
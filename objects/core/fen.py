@@ -0,0 +1,118 @@
+"""
+Reading and writing positions in Forsyth-Edwards Notation (FEN).
+
+The rules engine has no castling and no en passant, so those FEN fields are read for validity but otherwise ignored,
+and written out as "-".
+"""
+
+from .constants import (
+    SQUARESIZE,
+    SQUARECOUNT,
+    BLACK,
+    WHITE,
+    BLACKPLAYER,
+    WHITEPLAYER,
+    PIECE_PAWN,
+    PIECE_KNIGHT,
+    PIECE_BISHOP,
+    PIECE_ROOK,
+    PIECE_QUEEN,
+    PIECE_KING,
+)
+from .board import BoardCore
+from .piece import Piece, Pawn, Knight, Bishop, Rook, Queen, King
+from .team import Team
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1"
+FEN_PIECES = {
+    "p": (Pawn, PIECE_PAWN),
+    "n": (Knight, PIECE_KNIGHT),
+    "b": (Bishop, PIECE_BISHOP),
+    "r": (Rook, PIECE_ROOK),
+    "q": (Queen, PIECE_QUEEN),
+    "k": (King, PIECE_KING),
+}
+FEN_LETTERS = {piece_type: letter for letter, (_, piece_type) in FEN_PIECES.items()}
+
+
+def parse_fen(fen: str, board_class=BoardCore) -> tuple[BoardCore, Team, Team, Team]:
+    """
+    Builds a board and both teams from a FEN string.
+
+    Row 0 of the board is the eighth rank, matching the start position built by Team. Pawns that are not on their
+    starting rank are marked as having moved so they cannot double jump.
+
+    Args:
+        fen (str): The position, only the placement and side to move fields are required
+        board_class (type[BoardCore]): The board backend to build
+
+    Returns:
+        tuple[BoardCore, Team, Team, Team]: The board, the dark team, the light team and the team to move
+
+    Raises:
+        ValueError: If the FEN string is malformed
+    """
+    fields = fen.split()
+    if len(fields) < 2:
+        raise ValueError(f"FEN needs at least a placement and a side to move: {fen!r}")
+    placement, side = fields[0], fields[1]
+    ranks = placement.split("/")
+    if len(ranks) != SQUARECOUNT:
+        raise ValueError(f"FEN placement needs {SQUARECOUNT} ranks: {placement!r}")
+    if side not in ("w", "b"):
+        raise ValueError(f"Invalid side to move: {side!r}")
+
+    dark_pieces: list[Piece] = []
+    light_pieces: list[Piece] = []
+    for row, rank in enumerate(ranks):
+        col = 0
+        for char in rank:
+            if char.isdigit():
+                col += int(char)
+                continue
+            if char.lower() not in FEN_PIECES or col >= SQUARECOUNT:
+                raise ValueError(f"Invalid FEN rank: {rank!r}")
+            piece_class, piece_type = FEN_PIECES[char.lower()]
+            color = WHITE if char.isupper() else BLACK
+            piece = piece_class(color, row, col, piece_type)
+            if piece_type == PIECE_PAWN:
+                start_row = SQUARECOUNT - 2 if color == WHITE else 1
+                piece.has_moved = row != start_row
+            (light_pieces if color == WHITE else dark_pieces).append(piece)
+            col += 1
+        if col != SQUARECOUNT:
+            raise ValueError(f"Invalid FEN rank: {rank!r}")
+
+    board = board_class(SQUARESIZE, SQUARECOUNT)
+    board.init_struct()
+    dark_team = Team(BLACKPLAYER, BLACK, dark_pieces)
+    light_team = Team(WHITEPLAYER, WHITE, light_pieces)
+    board.set_pieces(dark_team.active_pieces, light_team.active_pieces)
+    current_player = light_team if side == "w" else dark_team
+    board.set_side_to_move(current_player.team_id)
+    return board, dark_team, light_team, current_player
+
+
+def board_to_fen(board: BoardCore, current_player: Team) -> str:
+    """
+    Writes the position on the board as a FEN string with the given team to move.
+    """
+    ranks = []
+    for row in range(SQUARECOUNT):
+        rank = ""
+        empty = 0
+        for col in range(SQUARECOUNT):
+            piece = board.get_square_contents(row, col)
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                rank += str(empty)
+                empty = 0
+            letter = FEN_LETTERS[piece.type]
+            rank += letter.upper() if piece.color == WHITE else letter
+        if empty:
+            rank += str(empty)
+        ranks.append(rank)
+    side = "w" if current_player.color == WHITE else "b"
+    return f"{'/'.join(ranks)} {side} - - 0 1"
@@ -0,0 +1,207 @@
+"""
+The rules side of a game: whose turn it is, which moves they have, what a move captures and how the game ends.
+
+Game has no input or rendering, so a game can be played without a window, e.g. by tools or computer players.
+GameState drives the same transitions from mouse events and draws the board in between.
+"""
+
+from .board import BoardCore
+from .fen import board_to_fen
+from .piece import Piece
+from .san import move_to_san, promotion_suffix
+from .team import Team
+
+RESULT_WHITE = "1-0"
+RESULT_BLACK = "0-1"
+RESULT_DRAW = "1/2-1/2"
+RESULT_UNFINISHED = "*"
+
+
+class Game:
+    """
+    The turn cycle of a game of chess, independent of how moves are chosen or shown.
+
+    A turn is started with start_turn (or compute_turn_start followed by apply_turn_start), played with play_move
+    and ended with end_turn. Once a turn has started, is_game_over tells whether the team to move can still play.
+
+    Every move played is recorded in SAN, see objects.core.pgn for writing the game out.
+
+    Args:
+        board (BoardCore): The chessboard the game is played on, with the pieces of both teams set
+        dark_team (Team): The Black players team
+        light_team (Team): The White players team
+
+    Attributes:
+        board (BoardCore): The chessboard the game is played on
+        dark_team (Team): The Black players team
+        light_team (Team): The White players team
+        current_player (Team): The team whose turn it is
+        other_player (Team): The team waiting for its turn
+        checking_pieces (dict[Piece, tuple[int, int]]): Pieces of other_player checking current_player, mapped to their
+        (row, col) positions
+        move_dict (dict[Piece, list[tuple[int, int]]] | None): The legal moves of current_player, None before the first
+        turn has started
+        position_counts (dict[int, int]): How many times each position, keyed by the boards zobrist_key, has occurred
+        at the start of a turn. Used to detect threefold repetition.
+        san_moves (list[str]): The moves played so far in SAN, the check or mate mark is added when the next turn
+        starts
+        start_fen (str | None): The position the first move was played from, None before it
+    """
+
+    def __init__(self, board: BoardCore, dark_team: Team, light_team: Team):
+        self.board: BoardCore = board
+        self.dark_team: Team = dark_team
+        self.light_team: Team = light_team
+        self.current_player: Team = self.light_team
+        self.other_player: Team = self.dark_team
+        self.checking_pieces: dict[Piece, tuple[int, int]] = {}
+        self.move_dict: dict[Piece, list[tuple[int, int]]] | None = None
+        self.position_counts: dict[int, int] = {}
+        self.san_moves: list[str] = []
+        self.start_fen: str | None = None
+
+    def start_turn(self):
+        """
+        Starts the turn of current_player: records the position and finds its checking pieces and legal moves.
+        """
+        self.record_position()
+        self.apply_turn_start(*self.compute_turn_start(self.current_player, self.other_player))
+
+    def record_position(self):
+        """
+        Counts the current position towards threefold repetition, called once at the start of every turn.
+        """
+        key = self.board.zobrist_key
+        self.position_counts[key] = self.position_counts.get(key, 0) + 1
+
+    def compute_turn_start(
+        self, current_player: Team, other_player: Team
+    ) -> tuple[dict[Piece, tuple[int, int]], dict[Piece, list[tuple[int, int]]]]:
+        """
+        Finds the pieces checking current_player and its legal moves. Only reads the board, so it may run on another
+        thread as long as the board is not changed meanwhile.
+        """
+        checking_pieces = self.board.get_checking_pieces(current_player, other_player)
+        move_dict = self.board.build_move_dict(current_player, other_player)
+        return checking_pieces, move_dict
+
+    def apply_turn_start(
+        self,
+        checking_pieces: dict[Piece, tuple[int, int]],
+        move_dict: dict[Piece, list[tuple[int, int]]],
+    ):
+        """
+        Stores the result of compute_turn_start and sets whether the king of current_player is in check.
+        """
+        self.checking_pieces = checking_pieces
+        self.move_dict = move_dict
+        self.current_player.king.set_in_check(bool(self.checking_pieces))
+        if self.checking_pieces and self.san_moves:
+            self.san_moves[-1] += "#" if self.move_dict_is_empty() else "+"
+
+    def is_game_over(self) -> bool:
+        """
+        Returns True if the team to move has no legal move or the position occurred three times. Only meaningful
+        once the turn has started.
+        """
+        if self.move_dict and self.move_dict_is_empty():
+            return True
+        return self.is_threefold_repetition()
+
+    def get_result(self) -> str:
+        """
+        Describes how the game ended, once is_game_over returned True.
+        """
+        if self.is_threefold_repetition():
+            return "Draw by threefold repetition"
+        elif self.current_player.king.get_check_status():
+            return f"{self.other_player} Has Won, Game over"
+        else:
+            return "Stalemate, No one has won"
+
+    def get_result_code(self) -> str:
+        """
+        The result as written in PGN: 1-0, 0-1, 1/2-1/2, or * while the game is not over.
+        """
+        if not self.is_game_over():
+            return RESULT_UNFINISHED
+        if not self.is_threefold_repetition() and self.current_player.king.get_check_status():
+            return RESULT_WHITE if self.other_player is self.light_team else RESULT_BLACK
+        return RESULT_DRAW
+
+    def play_move(self, piece: Piece, row: int, col: int, promotion: int | None = None) -> Piece | None:
+        """
+        Moves a piece of current_player, promoting it if it is a pawn reaching the last rank and a promotion is given.
+        The move is added to san_moves.
+
+        Args:
+            piece (Piece): The piece to move, one of the keys of move_dict
+            row (int): The row to move to
+            col (int): The col to move to
+            promotion (int | None): The type a promoting pawn becomes. If None, a promoting pawn is left as it is and
+            must be upgraded with promote before the turn ends.
+
+        Returns:
+            Piece | None: The captured piece if any, to be passed to end_turn
+        """
+        if self.start_fen is None:
+            self.start_fen = board_to_fen(self.board, self.current_player)
+        self.san_moves.append(move_to_san(self.board, self.move_dict, piece, row, col))
+        captured_piece = self.board.move_piece(piece, row, col)
+        if promotion is not None and piece.is_promotable():
+            self.promote(piece, promotion)
+        return captured_piece
+
+    def promote(self, piece: Piece, promotion: int) -> Piece:
+        """
+        Upgrades a pawn that play_move left on the last rank, and adds the promotion to its move in san_moves.
+
+        Returns:
+            Piece: The upgraded piece
+        """
+        new_piece = self.board.upgrade_piece(self.current_player, piece, promotion)
+        self.san_moves[-1] += promotion_suffix(promotion)
+        return new_piece
+
+    def end_turn(self, captured_piece: Piece | None):
+        """
+        Takes the captured piece, if any, out of play and hands the turn to the other team.
+        """
+        if captured_piece is not None:
+            self.other_player.active_pieces.remove(captured_piece)
+            self.other_player.captured_pieces.append(captured_piece)
+        self.switch_players()
+
+    def switch_players(self):
+        """
+        Changes the current player into the other player. i.e. changes the active player from white to black
+        """
+        self.current_player, self.other_player = self.other_player, self.current_player
+
+    def clear_turn(self):
+        """
+        Forgets the checks and legal moves of the turn that ended.
+        """
+        # assumes that the move was valid
+        self.current_player.king.set_in_check(False)
+        self.checking_pieces = {}
+        self.move_dict = {}
+
+    def is_threefold_repetition(self) -> bool:
+        """
+        Returns True if the current position has occurred at least three times.
+        """
+        return self.position_counts.get(self.board.zobrist_key, 0) >= 3
+
+    def move_dict_is_empty(self):
+        assert self.move_dict is not None
+        for value in self.move_dict.values():
+            if value:
+                return False
+        return True
+
+    def print_current_player(self):
+        if self.current_player == self.dark_team:
+            return "Black Player"
+        elif self.current_player == self.light_team:
+            return "White Player"
@@ -0,0 +1,77 @@
+"""
+Move lookup tables, precomputed once at import time.
+
+Every table is indexed by the square a piece stands on as [row][col] and only contains squares that are on the board,
+so move generation can walk them without any bounds arithmetic.
+"""
+
+from .constants import SQUARECOUNT, DIAGONALS, CARDINALS, KNIGHT_OFFSET, BLACKPLAYER, WHITEPLAYER
+
+
+def _on_board(row: int, col: int) -> bool:
+    return 0 <= row < SQUARECOUNT and 0 <= col < SQUARECOUNT
+
+
+def _leaper_targets(offsets: list[tuple[int, int]]) -> list[list[list[tuple[int, int]]]]:
+    """
+    For every square, the squares reached by a single jump of each offset, in the order of offsets.
+    """
+    return [
+        [
+            [(row + dr, col + dc) for dr, dc in offsets if _on_board(row + dr, col + dc)]
+            for col in range(SQUARECOUNT)
+        ]
+        for row in range(SQUARECOUNT)
+    ]
+
+
+def _ray(row: int, col: int, direction: tuple[int, int]) -> list[tuple[int, int]]:
+    """
+    The squares from (row, col) to the edge of the board in the given direction, nearest first.
+    """
+    dr, dc = direction
+    ray = []
+    new_row, new_col = row + dr, col + dc
+    while _on_board(new_row, new_col):
+        ray.append((new_row, new_col))
+        new_row += dr
+        new_col += dc
+    return ray
+
+
+def _slider_rays(directions: list[tuple[int, int]]) -> list[list[list[list[tuple[int, int]]]]]:
+    """
+    For every square, one ray per direction (empty rays included so indexes line up with directions).
+    """
+    return [
+        [[_ray(row, col, direction) for direction in directions] for col in range(SQUARECOUNT)]
+        for row in range(SQUARECOUNT)
+    ]
+
+
+def _between() -> dict[tuple[tuple[int, int], tuple[int, int]], list[tuple[int, int]]]:
+    """
+    Maps every pair of squares sharing a rank, file or diagonal to the squares strictly between them.
+    """
+    between = {}
+    for row in range(SQUARECOUNT):
+        for col in range(SQUARECOUNT):
+            for direction in CARDINALS + DIAGONALS:
+                ray = _ray(row, col, direction)
+                for index, target in enumerate(ray):
+                    between[((row, col), target)] = ray[:index]
+    return between
+
+
+KING_DIRECTIONS = CARDINALS + DIAGONALS
+KNIGHT_TARGETS = _leaper_targets(KNIGHT_OFFSET)
+KING_TARGETS = _leaper_targets(KING_DIRECTIONS)
+# PAWN_CAPTURE_TARGETS[team_id][row][col]: dark pawns capture towards higher rows, light pawns towards lower rows
+PAWN_CAPTURE_TARGETS = [None, None]
+PAWN_CAPTURE_TARGETS[BLACKPLAYER] = _leaper_targets([(1, -1), (1, 1)])
+PAWN_CAPTURE_TARGETS[WHITEPLAYER] = _leaper_targets([(-1, -1), (-1, 1)])
+BISHOP_RAYS = _slider_rays(DIAGONALS)
+ROOK_RAYS = _slider_rays(CARDINALS)
+# QUEEN_RAYS[row][col][i] is the ray in direction KING_DIRECTIONS[i]
+QUEEN_RAYS = _slider_rays(KING_DIRECTIONS)
+BETWEEN = _between()
@@ -0,0 +1,178 @@
+"""
+Portable Game Notation (PGN): writing finished games, and reading games back one at a time.
+
+read_games streams a PGN file: it reads line by line and holds only the game being read, so files of any size are
+read in constant memory. Comments, variations, numeric annotation glyphs and move numbers are skipped, the moves are
+kept as SAN strings. replay_game plays a read game through the rules of a board, which validates it.
+
+Games using castling or en passant cannot be replayed, the rules engine has neither.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, TextIO
+
+from .board import BoardCore
+from .fen import START_FEN, parse_fen
+from .game import Game, RESULT_WHITE, RESULT_BLACK, RESULT_DRAW, RESULT_UNFINISHED
+from .san import san_to_move
+
+# the Seven Tag Roster, written first and in this order
+ROSTER_TAGS = ["Event", "Site", "Date", "Round", "White", "Black", "Result"]
+RESULTS = {RESULT_WHITE, RESULT_BLACK, RESULT_DRAW, RESULT_UNFINISHED}
+# export format lines are at most 79 characters long
+LINE_LENGTH = 79
+TAG_PATTERN = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+# comment and variation delimiters, and runs of anything else
+TOKEN_PATTERN = re.compile(r"[{}();]|[^\s{}();]+")
+MOVE_NUMBER_PATTERN = re.compile(r"\d+\.+")
+
+
+@dataclass
+class PgnGame:
+    """
+    A game read from a PGN file.
+
+    Attributes:
+        tags (dict[str, str]): The tag pairs, e.g. {"White": "Kasparov, Garry"}
+        moves (list[str]): The moves of the main line in SAN
+        result (str): The game termination marker, 1-0, 0-1, 1/2-1/2 or *
+    """
+
+    tags: dict[str, str] = field(default_factory=dict)
+    moves: list[str] = field(default_factory=list)
+    result: str = RESULT_UNFINISHED
+
+
+def format_pgn(tags: dict[str, str], moves: list[str], result: str, start_fen: str | None = None) -> str:
+    """
+    Writes a game in PGN export format: the Seven Tag Roster, the other tags, then the numbered moves wrapped to
+    LINE_LENGTH and the result.
+
+    Args:
+        tags (dict[str, str]): Tag pairs, missing roster tags are written as "?"
+        moves (list[str]): The moves in SAN
+        result (str): The game termination marker, also written as the Result tag
+        start_fen (str | None): The position the game started from, written as FEN and SetUp tags unless it is the
+        standard start position
+
+    Returns:
+        str: The game, ending with a blank line so games can be appended one after another
+    """
+    tags = {**tags, "Result": result}
+    if start_fen is not None and start_fen != START_FEN:
+        tags["SetUp"] = "1"
+        tags["FEN"] = start_fen
+    names = ROSTER_TAGS + [name for name in tags if name not in ROSTER_TAGS]
+    lines = []
+    for name in names:
+        value = tags.get(name, "?").replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'[{name} "{value}"]')
+    lines.append("")
+
+    black_first = start_fen is not None and start_fen.split()[1] == "b"
+    tokens = []
+    for ply, san in enumerate(moves, 1 if black_first else 0):
+        if ply % 2 == 0:
+            tokens.append(f"{ply // 2 + 1}.")
+        elif ply == 1 and black_first:
+            tokens.append("1...")
+        tokens.append(san)
+    tokens.append(result)
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_LENGTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n\n"
+
+
+def read_games(lines: TextIO | Iterable[str]) -> Iterator[PgnGame]:
+    """
+    Reads the games of a PGN file one at a time.
+
+    Args:
+        lines (TextIO | Iterable[str]): The open file, or any iterable of its lines
+
+    Yields:
+        PgnGame: Each game, as soon as its termination marker (or the tags of the next game) is read
+    """
+    game = PgnGame()
+    in_movetext = False
+    in_comment = False
+    depth = 0  # nesting of the variation being skipped
+    for line in lines:
+        if not in_comment:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("%"):
+                continue
+            if stripped.startswith("[") and depth == 0:
+                tag = TAG_PATTERN.match(stripped)
+                if tag is not None:
+                    if in_movetext:
+                        # the previous game has no termination marker
+                        yield game
+                        game, in_movetext = PgnGame(), False
+                    game.tags[tag.group(1)] = tag.group(2).replace('\\"', '"').replace("\\\\", "\\")
+                    continue
+        for token in TOKEN_PATTERN.findall(line):
+            if in_comment:
+                in_comment = token != "}"
+            elif token == "{":
+                in_comment = True
+            elif token == ";":
+                break
+            elif token == "(":
+                depth += 1
+            elif token == ")":
+                depth = max(depth - 1, 0)
+            elif depth:
+                continue
+            elif token in RESULTS:
+                game.result = token
+                yield game
+                game, in_movetext = PgnGame(), False
+            else:
+                in_movetext = True
+                san = MOVE_NUMBER_PATTERN.sub("", token, count=1) if token[0].isdigit() else token
+                if san and not san.startswith("$"):
+                    game.moves.append(san)
+    if in_movetext or game.tags:
+        yield game
+
+
+def replay_game(game: PgnGame, board_class=BoardCore) -> Game:
+    """
+    Plays the moves of a game through the rules of a board, from its FEN tag if it has one.
+
+    Args:
+        game (PgnGame): The game to replay
+        board_class (type[BoardCore]): The board backend to play on
+
+    Returns:
+        Game: The game after its last move, with the next turn started
+
+    Raises:
+        ValueError: If the starting position is invalid, or a move is malformed, ambiguous, illegal or played after
+        checkmate or stalemate
+    """
+    board, dark_team, light_team, current_player = parse_fen(game.tags.get("FEN", START_FEN), board_class)
+    replayed = Game(board, dark_team, light_team)
+    if current_player is not replayed.current_player:
+        replayed.switch_players()
+    for ply, san in enumerate(game.moves):
+        replayed.start_turn()
+        # a threefold repetition only lets a player claim a draw, play may go on after it
+        if replayed.move_dict_is_empty():
+            raise ValueError(f"Move {san!r} after the end of the game, ply {ply + 1}")
+        try:
+            piece, row, col, promotion = san_to_move(board, replayed.move_dict, san)
+        except ValueError as error:
+            raise ValueError(f"{error}, ply {ply + 1}") from None
+        replayed.end_turn(replayed.play_move(piece, row, col, promotion))
+        replayed.clear_turn()
+    replayed.start_turn()
+    return replayed
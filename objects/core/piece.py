@@ -1,49 +1,38 @@
-import pygame
 from .constants import (
     WHITE,
     BLACK,
-    SQUARESIZE,
-    BOARDPOSX,
-    BOARDPOSY,
-    DIAGONALS,
-    CARDINALS,
-    KNIGHT_OFFSET,
+    PIECE_PAWN,
+)
+from .move_tables import (
+    KNIGHT_TARGETS,
+    KING_TARGETS,
+    PAWN_CAPTURE_TARGETS,
+    BISHOP_RAYS,
+    ROOK_RAYS,
+    QUEEN_RAYS,
 )
 
 
 class Piece:
-    def __init__(self, color: pygame.Color, row: int, col: int, type: str):
-        """
-        Base class used to represent a chess piece.
-        """
-        self.size = SQUARESIZE
+    """
+    Base class used to represent a chess piece. Holds rules state only, images are looked up by type and color when
+    the piece is drawn.
+
+    Args:
+        color (int): The color code, BLACK or WHITE, equal to the team_id of the team playing the piece
+        row (int): The row of the square the piece stands on
+        col (int): The col of the square the piece stands on
+        type (int): The piece kind, e.g. PIECE_PAWN
+    """
+
+    # no per-instance __dict__, every subclass declares its own slots too
+    __slots__ = ("type", "row", "col", "color")
+
+    def __init__(self, color: int, row: int, col: int, type: int):
         self.type = type
         self.row = row
         self.col = col
         self.color = color
-        self.surface = self._create_piece_surface()
-        self.rect = pygame.Rect(
-            BOARDPOSX + SQUARESIZE * col,
-            BOARDPOSY + SQUARESIZE * row,
-            SQUARESIZE,
-            SQUARESIZE,
-        )
-
-    def _create_piece_surface(self) -> pygame.Surface:
-        """
-        Loads and scales the image of this piece, returning it as a pygame.Surface
-
-        the specific image is selected based on the pieces attributes self.type and self.color,
-        loaded from the Assets directory, and scaled by the pieces self.size attribute
-
-        Returns:
-            pygame.Surface object
-        """
-        if self.color == WHITE:
-            surface = pygame.image.load(f"./Assets/{self.type}_white.png")
-        else:
-            surface = pygame.image.load(f"./Assets/{self.type}_black.png")
-        return pygame.transform.smoothscale(surface, (self.size, self.size))
 
     def generate_valid_moves(self, board):
         # exists purely to be over written by subclasses
@@ -116,48 +105,47 @@ class SlidingPiece(Piece):
     sub-classes.
     """
 
-    def __init__(self, color: pygame.Color, row: int, col: int, type: str):
+    __slots__ = ()
+
+    def __init__(self, color: int, row: int, col: int, type: int):
         super().__init__(color, row, col, type)
 
     def get_sliding_moves(
-        self, board, directions: list[tuple[int, int]]
+        self, board, rays: list[list[tuple[int, int]]]
     ) -> list[tuple[int, int]]:
         """
         Generates valid sliding moves for the following pieces Bishop, Rook, Queen.
 
-        Slides in the direction specified by directions argument until either blocked by an ally or blocked by an enemy, if blocked
+        Slides along each ray until either blocked by an ally or blocked by an enemy, if blocked
         by an enemy adds that final square as a valid move
 
         Args:
-            board is a Board Object directions
-            list[tuple[int, int]: directions relative to the original position of the piece.
+            board is a Board Object
+            rays (list[list[tuple[int, int]]]): the rays leaving the pieces square, taken from move_tables.
 
         Returns:
             list[tuple[int, int]] : A list of valid (row, col) moves.
         """
         valid_moves = []
-        for dr, dc in directions:
-            new_row = self.row + dr
-            new_col = self.col + dc
-            while board.in_bounds(new_row, new_col):
-                piece = board.get_square_contents(new_row, new_col)
+        color = self.color
+        for ray in rays:
+            for square in ray:
+                piece = board.peek_square(*square)
                 if not piece:  # no piece, add move
-                    valid_moves.append((new_row, new_col))
-                elif self.is_enemy(piece):
-                    valid_moves.append(
-                        (new_row, new_col)
-                    )  # enemy, add, then stop sliding
+                    valid_moves.append(square)
+                elif piece.color != color:
+                    valid_moves.append(square)  # enemy, add, then stop sliding
                     break
                 else:
                     # ally, stop sliding
                     break
-                new_row += dr
-                new_col += dc
         return valid_moves
 
 
 class Pawn(Piece):
-    def __init__(self, color: pygame.Color, row: int, col: int, type: str):
+    __slots__ = ("has_moved",)
+
+    def __init__(self, color: int, row: int, col: int, type: int):
         super().__init__(color, row, col, type)
         self.has_moved = False
 
@@ -179,7 +167,7 @@ class Pawn(Piece):
         two_forward = self.row + (dv * 2)
 
         # single jump moves
-        if board.is_empty(one_forward, self.col) and board.in_bounds(
+        if board.in_bounds(one_forward, self.col) and board.is_empty(
             one_forward, self.col
         ):
             valid_moves.append((one_forward, self.col))
@@ -187,20 +175,16 @@ class Pawn(Piece):
             # double jump moves (check only if there is a valid single move)
             if (
                 not self.has_moved
-                and board.is_empty(two_forward, self.col)
                 and board.in_bounds(two_forward, self.col)
+                and board.is_empty(two_forward, self.col)
             ):
                 valid_moves.append((two_forward, self.col))
 
         # Diagonals
-        for dh in [-1, 1]:
-            new_col = self.col + dh
-            if board.in_bounds(one_forward, new_col) and not board.is_empty(
-                one_forward, new_col
-            ):
-                piece = board.get_square_contents(one_forward, new_col)
-                if piece and self.is_enemy(piece):
-                    valid_moves.append((one_forward, new_col))
+        for square in PAWN_CAPTURE_TARGETS[self.color][self.row][self.col]:
+            piece = board.peek_square(*square)
+            if piece and piece.color != self.color:
+                valid_moves.append(square)
         return valid_moves
 
     def update_after_move(self):
@@ -216,7 +200,7 @@ class Pawn(Piece):
         """
         dark_main_rank = 0
         light_main_rank = 7
-        if self.type == "pawn":
+        if self.type == PIECE_PAWN:
             if (self.color == WHITE and self.row == dark_main_rank) or (
                 self.color == BLACK and self.row == light_main_rank
             ):
@@ -225,7 +209,9 @@ class Pawn(Piece):
 
 
 class Knight(Piece):
-    def __init__(self, color: pygame.Color, row: int, col: int, type: str):
+    __slots__ = ()
+
+    def __init__(self, color: int, row: int, col: int, type: int):
         super().__init__(color, row, col, type)
 
     def generate_valid_moves(self, board) -> list[tuple[int, int]]:
@@ -240,30 +226,30 @@ class Knight(Piece):
         Returns : list[tuple[int, int]]:  Valid moves for a knight
         """
         valid_moves = []
-        for dr, dc in KNIGHT_OFFSET:
-            new_row, new_col = self.row + dr, self.col + dc
-            if board.in_bounds(new_row, new_col):  # check move is actually on the board
-                piece = board.get_square_contents(
-                    new_row, new_col
-                )  # check if there is a piece to be captured
-                if not piece or self.is_enemy(piece):
-                    valid_moves.append((new_row, new_col))
+        for square in KNIGHT_TARGETS[self.row][self.col]:
+            piece = board.peek_square(*square)  # check if there is a piece to be captured
+            if not piece or piece.color != self.color:
+                valid_moves.append(square)
         return valid_moves
 
 
 class Bishop(SlidingPiece):
-    def __init__(self, color: pygame.Color, row: int, col: int, type: str):
+    __slots__ = ()
+
+    def __init__(self, color: int, row: int, col: int, type: int):
         super().__init__(color, row, col, type)
 
     def generate_valid_moves(self, board) -> list[tuple[int, int]]:
         """
         Generates the diagonal sliding moves via the get_sliding_moves method.
         """
-        return self.get_sliding_moves(board, DIAGONALS)
+        return self.get_sliding_moves(board, BISHOP_RAYS[self.row][self.col])
 
 
 class Rook(SlidingPiece):
-    def __init__(self, color: pygame.Color, row: int, col: int, type: str):
+    __slots__ = ("has_moved",)
+
+    def __init__(self, color: int, row: int, col: int, type: int):
         super().__init__(color, row, col, type)
         self.has_moved = False
 
@@ -271,23 +257,26 @@ class Rook(SlidingPiece):
         """
         Generates the cardinal sliding moves via the get_sliding_moves method.
         """
-        return self.get_sliding_moves(board, CARDINALS)
+        return self.get_sliding_moves(board, ROOK_RAYS[self.row][self.col])
 
 
 class Queen(SlidingPiece):
-    def __init__(self, color: pygame.Color, row: int, col: int, type: str):
+    __slots__ = ()
+
+    def __init__(self, color: int, row: int, col: int, type: int):
         super().__init__(color, row, col, type)
 
     def generate_valid_moves(self, board) -> list[tuple[int, int]]:
         """
         Generates the Queens movements combinging digonal and cardinal sliding moves.
         """
-        return self.get_sliding_moves(board, CARDINALS + DIAGONALS)
+        return self.get_sliding_moves(board, QUEEN_RAYS[self.row][self.col])
 
 
 class King(Piece):
+    __slots__ = ("has_moved", "in_check")
 
-    def __init__(self, color: pygame.Color, row: int, col: int, type: str):
+    def __init__(self, color: int, row: int, col: int, type: int):
         super().__init__(color, row, col, type)
         self.has_moved = False
         self.in_check = False
@@ -311,13 +300,8 @@ class King(Piece):
 
         """
         valid_moves = []
-        directions = CARDINALS + DIAGONALS
-        for dr, dc in directions:
-            new_row = self.row + dr
-            new_col = self.col + dc
-            if board.in_bounds(new_row, new_col):
-                # now validate
-                piece = board.get_square_contents(new_row, new_col)
-                if not piece or self.is_enemy(piece):
-                    valid_moves.append((new_row, new_col))
+        for square in KING_TARGETS[self.row][self.col]:
+            piece = board.peek_square(*square)
+            if not piece or piece.color != self.color:
+                valid_moves.append(square)
         return valid_moves
@@ -0,0 +1,119 @@
+"""
+Standard Algebraic Notation (SAN), the move notation of PGN files, e.g. e4, Nbd7, exd5, Qxe7+ or a8=Q#.
+
+The rules engine has no castling and no en passant, so O-O, O-O-O and en passant captures are never written, and
+are rejected as illegal when read.
+"""
+
+import re
+
+from .constants import SQUARECOUNT, PIECE_PAWN
+from .fen import FEN_PIECES, FEN_LETTERS
+from .board import BoardCore
+from .piece import Piece
+
+# piece letter, from file, from rank, capture, destination, promotion
+SAN_PATTERN = re.compile(r"([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?")
+# check, mate and annotation marks that may follow a move
+SAN_SUFFIXES = "+#!?"
+
+
+def square_name(row: int, col: int) -> str:
+    """
+    Names the square (row, col), row 0 being the eighth rank, e.g. (6, 4) is e2.
+    """
+    return f"{chr(ord('a') + col)}{SQUARECOUNT - row}"
+
+
+def promotion_suffix(promotion: int) -> str:
+    """
+    The SAN suffix of a promotion to the given piece type, e.g. =Q.
+    """
+    return "=" + FEN_LETTERS[promotion].upper()
+
+
+def move_to_san(
+    board: BoardCore,
+    move_dict: dict[Piece, list[tuple[int, int]]],
+    piece: Piece,
+    row: int,
+    col: int,
+    promotion: int | None = None,
+) -> str:
+    """
+    Writes a legal move in SAN, without the check or mate suffix. Must be called before the move is made.
+
+    Args:
+        board (BoardCore): The position before the move
+        move_dict (dict[Piece, list[tuple[int, int]]]): The legal moves of the team to move, to tell apart pieces of
+        the same type that can reach the same square
+        piece (Piece): The piece to move
+        row (int): The row it moves to
+        col (int): The col it moves to
+        promotion (int | None): The type a pawn reaching the last rank becomes, if known
+
+    Returns:
+        str: The move, e.g. Nbd7 or exd8=Q
+    """
+    capture = board.struct[row][col] is not None
+    target = square_name(row, col)
+    if piece.type == PIECE_PAWN:
+        san = f"{square_name(piece.row, piece.col)[0]}x{target}" if capture else target
+        return san + promotion_suffix(promotion) if promotion is not None else san
+    rivals = [
+        other
+        for other, moves in move_dict.items()
+        if other is not piece and other.type == piece.type and (row, col) in moves
+    ]
+    origin = square_name(piece.row, piece.col)
+    if not rivals:
+        disambiguation = ""
+    elif all(other.col != piece.col for other in rivals):
+        disambiguation = origin[0]
+    elif all(other.row != piece.row for other in rivals):
+        disambiguation = origin[1]
+    else:
+        disambiguation = origin
+    return f"{FEN_LETTERS[piece.type].upper()}{disambiguation}{'x' if capture else ''}{target}"
+
+
+def san_to_move(
+    board: BoardCore, move_dict: dict[Piece, list[tuple[int, int]]], san: str
+) -> tuple[Piece, int, int, int | None]:
+    """
+    Finds the legal move a SAN string stands for.
+
+    Args:
+        board (BoardCore): The position the move is played in
+        move_dict (dict[Piece, list[tuple[int, int]]]): The legal moves of the team to move
+        san (str): The move, check marks and annotations (e.g. Nf3+!?) are allowed
+
+    Returns:
+        tuple[Piece, int, int, int | None]: The piece, the row and col it moves to, and the promotion type or None
+
+    Raises:
+        ValueError: If the move is malformed, illegal or ambiguous
+    """
+    match = SAN_PATTERN.fullmatch(san.rstrip(SAN_SUFFIXES))
+    if match is None:
+        raise ValueError(f"Not a supported SAN move: {san!r}")
+    letter, from_file, from_rank, _, target, promotion_letter = match.groups()
+    piece_type = FEN_PIECES[letter.lower()][1] if letter else PIECE_PAWN
+    col = ord(target[0]) - ord("a")
+    row = SQUARECOUNT - int(target[1])
+    candidates = [
+        piece
+        for piece, moves in move_dict.items()
+        if piece.type == piece_type
+        and (row, col) in moves
+        and (from_file is None or piece.col == ord(from_file) - ord("a"))
+        and (from_rank is None or piece.row == SQUARECOUNT - int(from_rank))
+    ]
+    if len(candidates) != 1:
+        raise ValueError(f"{'Ambiguous' if candidates else 'Illegal'} move: {san!r}")
+    piece = candidates[0]
+    promotion = FEN_PIECES[promotion_letter.lower()][1] if promotion_letter else None
+    last_rank = piece_type == PIECE_PAWN and row in (0, SQUARECOUNT - 1)
+    if last_rank != (promotion is not None):
+        raise ValueError(f"Promotion missing or not allowed: {san!r}")
+    return piece, row, col, promotion
@@ -1,11 +1,14 @@
-import pygame
 from .constants import (
     SQUARECOUNT,
     WHITEPLAYER,
+    BLACK,
+    WHITE,
+    PIECE_PAWN,
     PIECE_ROOK,
     PIECE_KNIGHT,
     PIECE_BISHOP,
     PIECE_QUEEN,
+    PIECE_KING,
 )
 from .piece import Piece, Pawn, Rook, Bishop, Knight, King, Queen
 
@@ -16,25 +19,36 @@ class Team:
 
     Args:
         team_id (int): The team ID, 0 represents dark pieces and 1 represents light pieces.
-        color (pygame.Color): The color of the associated pieces.
+        color (int): The color code of the associated pieces, BLACK or WHITE.
+        pieces (list[Piece] | None): The teams pieces, used to set up positions other than the start position,
+        e.g. from a FEN string. Must include a king. If None, the pieces of the start position are created.
 
     Attributes:
         team_id (int): The team ID, 0 represents dark pieces and 1 represents light pieces.
-        color (pygame.Color): The color of the associated pieces.
+        color (int): The color code of the associated pieces, BLACK or WHITE.
         active_pieces (list[Piece]): A list of pieces that are currently in play
         captured_pieces (list[Piece]): A list of pieces that belong to the player and have been captured.
     """
 
-    def __init__(self, team_id: int, color: pygame.Color):
+    def __init__(
+        self, team_id: int, color: int, pieces: list[Piece] | None = None
+    ):
         self.team_id: int = team_id
-        self.color: pygame.Color = color
-        self.active_pieces: list[Piece] = self._set_pieces()
+        self.color: int = color
+        if pieces is None:
+            self.active_pieces: list[Piece] = self._set_pieces()
+        else:
+            self.active_pieces = list(pieces)
+            kings = [piece for piece in pieces if piece.type == PIECE_KING]
+            if len(kings) != 1:
+                raise ValueError(f"A team needs exactly one king, got {len(kings)}")
+            self.king = kings[0]
         self.captured_pieces: list[Piece] = []
 
     def __str__(self):
-        if self.color == (0, 0, 0):
+        if self.color == BLACK:
             return "Black Player"
-        elif self.color == (255, 255, 255):
+        elif self.color == WHITE:
             return "White Player"
         else:
             raise ValueError("Invalid Color")
@@ -55,16 +69,16 @@ class Team:
             pawn_rank = 1
 
         for i in range(SQUARECOUNT):
-            pawn = Pawn(self.color, pawn_rank, i, "pawn")
+            pawn = Pawn(self.color, pawn_rank, i, PIECE_PAWN)
             pieces.append(pawn)
-        rook = Rook(self.color, main_rank, 0, "rook")
-        rook1 = Rook(self.color, main_rank, 7, "rook")
-        knight = Knight(self.color, main_rank, 1, "knight")
-        knight1 = Knight(self.color, main_rank, 6, "knight")
-        bishop = Bishop(self.color, main_rank, 2, "bishop")
-        bishop1 = Bishop(self.color, main_rank, 5, "bishop")
-        king = King(self.color, main_rank, 4, "king")
-        queen = Queen(self.color, main_rank, 3, "queen")
+        rook = Rook(self.color, main_rank, 0, PIECE_ROOK)
+        rook1 = Rook(self.color, main_rank, 7, PIECE_ROOK)
+        knight = Knight(self.color, main_rank, 1, PIECE_KNIGHT)
+        knight1 = Knight(self.color, main_rank, 6, PIECE_KNIGHT)
+        bishop = Bishop(self.color, main_rank, 2, PIECE_BISHOP)
+        bishop1 = Bishop(self.color, main_rank, 5, PIECE_BISHOP)
+        king = King(self.color, main_rank, 4, PIECE_KING)
+        queen = Queen(self.color, main_rank, 3, PIECE_QUEEN)
         pieces += [
             rook,
             rook1,
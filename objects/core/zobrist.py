@@ -0,0 +1,38 @@
+"""
+Random keys for Zobrist hashing of positions.
+
+A position's key is the xor of one key per (team, piece type, square) occupied, plus BLACK_TO_MOVE_KEY when the dark
+team is to move. The generator is seeded so keys are identical across runs and processes.
+"""
+
+import random
+
+from .constants import (
+    SQUARECOUNT,
+    BLACKPLAYER,
+    WHITEPLAYER,
+    PIECE_PAWN,
+    PIECE_KNIGHT,
+    PIECE_BISHOP,
+    PIECE_ROOK,
+    PIECE_QUEEN,
+    PIECE_KING,
+)
+
+_rng = random.Random(0x2F0B1C5A)
+# PIECE_KEYS[team_id][piece_type][row * 8 + col]
+PIECE_KEYS: list[dict[int, list[int]]] = [
+    {
+        piece_type: [_rng.getrandbits(64) for _ in range(SQUARECOUNT * SQUARECOUNT)]
+        for piece_type in (PIECE_PAWN, PIECE_KNIGHT, PIECE_BISHOP, PIECE_ROOK, PIECE_QUEEN, PIECE_KING)
+    }
+    for _ in (BLACKPLAYER, WHITEPLAYER)
+]
+BLACK_TO_MOVE_KEY: int = _rng.getrandbits(64)
+
+
+def piece_key(piece, row: int, col: int) -> int:
+    """
+    Returns the key for the piece standing on (row, col).
+    """
+    return PIECE_KEYS[piece.color][piece.type][row * SQUARECOUNT + col]
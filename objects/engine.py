@@ -0,0 +1,659 @@
+"""
+A computer opponent: alpha-beta search with iterative deepening under a time budget.
+
+The search runs on its own board, built from a FEN snapshot of the game, so it can run on a background thread while the
+game board keeps being drawn. GameState only ever sees the chosen move, which it plays through move_piece and
+upgrade_piece like a human move.
+
+With more than one worker the search is a Lazy SMP search: helper processes search the same position at the same time
+over a transposition table in shared memory, and the results they store let every process prune more and reach
+depth sooner.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+from .core.bitboard import BitBoardCore
+from .core.board import BoardCore
+from .core.fen import board_to_fen, parse_fen
+from .core.team import Team
+from .move_picker import SearchHeuristics, staged_moves
+from .nnue import Network, NNUEEvaluation
+from .transposition import (
+    TranspositionTable,
+    BOUND_EXACT,
+    BOUND_LOWER,
+    BOUND_UPPER,
+    encode_move,
+)
+
+MATE_SCORE = 100000
+# scores beyond this are mates, stored in the transposition table relative to the node rather than the root
+MATE_BOUND = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+MAX_DEPTH = 64
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget runs out, unwinding to the iterative deepening loop.
+    """
+
+
+@dataclass
+class SearchResult:
+    """
+    The outcome of a search.
+
+    Attributes:
+        move (tuple[int, int, int, int, int | None] | None): (from_row, from_col, to_row, to_col, promotion) of the best
+        move, None if the side to move has no legal moves
+        score (int): The score of the move in centipawns from the side to moves point of view
+        depth (int): The deepest fully completed iteration
+        nodes (int): Positions searched, including quiescence nodes
+        elapsed (float): Wall time spent in seconds
+        ponder_move (tuple[int, int, int, int, int | None] | None): The reply the search expects to move, from the
+        transposition table, None if it has none
+    """
+
+    move: tuple[int, int, int, int, int | None] | None
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+    ponder_move: tuple[int, int, int, int, int | None] | None = None
+
+
+def evaluate(board: BoardCore, team: Team, enemy: Team) -> int:
+    """
+    The static evaluation in centipawns from the point of view of team, see BoardCore.evaluate.
+    """
+    return board.evaluate(team.team_id)
+
+
+class Engine:
+    """
+    Alpha-beta (negamax) search with a transposition table, a capture-only quiescence search and iterative deepening.
+
+    Iterative deepening keeps searching one ply deeper until the time budget runs out, then the move of the deepest
+    completed iteration is played. The clock is checked at every node so the search stops within a node or two of
+    the deadline. If even the first iteration is cut off, the best root move it finished searching is played.
+
+    Args:
+        move_time (float): The time budget per move in seconds
+        max_depth (int): The deepest iteration to search, the search stops early when it completes
+        tt_size_mb (float): Memory for the transposition table in megabytes
+        board_class (type[BoardCore]): The board backend searches are run on
+        workers (int): Processes searching each position. With more than one, workers - 1 helper processes search
+        alongside this one over a shared table (see the module docstring); call close when done with the engine.
+        tt (TranspositionTable | None): A table to search with instead of allocating one of tt_size_mb
+        ordering (bool): Search moves in the order of staged_moves. If False they are searched in build_move_list
+        order, which is only useful to measure what the ordering gains.
+        network (Network | None): Evaluate with this NNUE network instead of the boards piece-square evaluation
+
+    Attributes:
+        tt (TranspositionTable): The transposition table, kept between moves
+        heuristics (SearchHeuristics): Killer moves and history scores, kept between moves
+        nodes (int): Positions searched by the current search
+    """
+
+    def __init__(
+        self,
+        move_time: float = 1.0,
+        max_depth: int = MAX_DEPTH,
+        tt_size_mb: float = 16,
+        board_class=BitBoardCore,
+        workers: int = 1,
+        tt: TranspositionTable | None = None,
+        ordering: bool = True,
+        network: Network | None = None,
+    ):
+        if workers < 1:
+            raise ValueError(f"An engine needs at least one worker, got {workers}")
+        self.move_time: float = move_time
+        self.max_depth: int = max_depth
+        self.board_class = board_class
+        self.workers: int = workers
+        self.ordering: bool = ordering
+        self.network: Network | None = network
+        self.heuristics: SearchHeuristics = SearchHeuristics()
+        self.nodes: int = 0
+        self._deadline: float | None = None
+        # one byte of shared memory set when any process finishes, stopping the others
+        self._stop: memoryview | None = None
+        self._stop_event: threading.Event | None = None
+        self._shared_memory: SharedMemory | None = None
+        self._pool: ProcessPoolExecutor | None = None
+        if workers > 1:
+            self._start_helpers(tt_size_mb)
+        else:
+            self.tt: TranspositionTable = tt if tt is not None else TranspositionTable(tt_size_mb)
+        # (move, score) of the best root move of the iteration in progress, played if the first iteration times out
+        self._root_best: tuple[tuple[int, int, int, int, int | None], int] | None = None
+
+    def search_fen(
+        self,
+        fen: str,
+        move_time: float | None = None,
+        start_time: float | None = None,
+        stop_event: threading.Event | None = None,
+    ) -> SearchResult:
+        """
+        Searches the position given as a FEN string on a new board of board_class. See search for the arguments, the
+        time spent building the board only counts against the budget if start_time is given.
+        """
+        board, dark_team, light_team, current_player = parse_fen(fen, self.board_class)
+        enemy = light_team if current_player is dark_team else dark_team
+        return self.search(board, current_player, enemy, move_time, start_time, stop_event)
+
+    def search(
+        self,
+        board: BoardCore,
+        team: Team,
+        enemy: Team,
+        move_time: float | None = None,
+        start_time: float | None = None,
+        stop_event: threading.Event | None = None,
+    ) -> SearchResult:
+        """
+        Finds the best move for team. The board is searched in place with make_move and unmake_move and is left as
+        it was given.
+
+        Args:
+            board (BoardCore): The position to search
+            team (Team): The team to move
+            enemy (Team): The opposing team
+            move_time (float | None): The time budget in seconds, move_time of the engine if None
+            start_time (float | None): The time.perf_counter() value the budget is counted from, now if None. Lets
+            callers count their own setup time against the budget.
+            stop_event (threading.Event | None): Stops the search as soon as it is set, from any thread, e.g. to end
+            a search started with an unlimited move_time
+
+        Returns:
+            SearchResult: The best move of the deepest completed iteration
+        """
+        start = time.perf_counter() if start_time is None else start_time
+        budget = self.move_time if move_time is None else move_time
+        self.tt.new_search()
+        self.heuristics.new_search()
+        evaluation = board.evaluation
+        if self.network is not None:
+            board.evaluation = NNUEEvaluation(self.network, board)
+        self._stop_event = stop_event
+        try:
+            if self._pool is not None:
+                result = self._search_parallel(board, team, enemy, start, budget)
+            else:
+                result = self._iterative_deepening(board, team, enemy, start, budget)
+            result.ponder_move = self._predicted_reply(board, team, enemy, result.move)
+            return result
+        finally:
+            self._stop_event = None
+            # the search leaves the position as it found it, so the boards own evaluation is still up to date
+            board.evaluation = evaluation
+
+    def _predicted_reply(
+        self, board: BoardCore, team: Team, enemy: Team, move: tuple[int, int, int, int, int | None] | None
+    ) -> tuple[int, int, int, int, int | None] | None:
+        """
+        The enemy's best reply to move according to the transposition table, if it has a legal one.
+        """
+        if move is None:
+            return None
+        from_row, from_col, to_row, to_col, promotion = move
+        record = board.make_move(board.struct[from_row][from_col], to_row, to_col, team, promotion)
+        try:
+            entry = self.tt.probe(board.zobrist_key)
+            if entry is None or not entry[0]:
+                return None
+            for piece, row, col, reply_promotion in staged_moves(board, enemy, team, entry[0]):
+                # the hash move comes first if it is legal
+                reply = (piece.row, piece.col, row, col, reply_promotion)
+                return reply if encode_move(*reply) == entry[0] else None
+            return None
+        finally:
+            board.unmake_move(record)
+
+    def _iterative_deepening(
+        self, board: BoardCore, team: Team, enemy: Team, start: float, budget: float, first_depth: int = 1
+    ) -> SearchResult:
+        self.nodes = 0
+        self._deadline = start + budget
+        result = SearchResult(None, 0, 0, 0, 0.0)
+        for depth in range(first_depth, self.max_depth + 1):
+            self._root_best = None
+            try:
+                score, move = self._search_root(board, team, enemy, depth)
+            except SearchTimeout:
+                if result.move is None:
+                    # out of time before the first iteration finished, play the best move it got to
+                    result.move, result.score = self._root_best
+                break
+            result.move, result.score, result.depth = move, score, depth
+            if move is None or abs(score) >= MATE_BOUND:
+                # no legal moves, or a forced mate that deeper searches cannot improve on
+                break
+        if self._stop is not None:
+            self._stop[0] = 1
+        self._deadline = None
+        result.nodes = self.nodes
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _start_helpers(self, tt_size_mb: float):
+        """
+        Puts the transposition table and the stop flag in shared memory and starts the helper processes.
+        """
+        table_bytes = TranspositionTable.required_bytes(tt_size_mb)
+        self._shared_memory = SharedMemory(create=True, size=table_bytes + 1)
+        self.tt = TranspositionTable(tt_size_mb, buffer=self._shared_memory.buf)
+        self._stop = self._shared_memory.buf[table_bytes : table_bytes + 1]
+        # spawn rather than fork, the game process runs pygame and the search thread
+        self._pool = ProcessPoolExecutor(
+            self.workers - 1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_helper,
+            initargs=(self._shared_memory.name, tt_size_mb, self.board_class, self.network),
+        )
+        # start the processes now rather than on the first search
+        self._pool.submit(_helper_ready)
+
+    def _search_parallel(
+        self, board: BoardCore, team: Team, enemy: Team, start: float, budget: float
+    ) -> SearchResult:
+        """
+        Searches with the helper processes, then plays the move of the deepest iteration completed by any process,
+        this ones on a tie.
+        """
+        fen = board_to_fen(board, team)
+        self._stop[0] = 0
+        helpers = [
+            self._pool.submit(
+                _helper_search,
+                fen,
+                budget - (time.perf_counter() - start),
+                self.max_depth,
+                self.tt.generation,
+                # odd helpers search one ply deeper so the processes spread over two depths
+                1 + index % 2,
+            )
+            for index in range(1, self.workers)
+        ]
+        result = self._iterative_deepening(board, team, enemy, start, budget)
+        for future in helpers:
+            helper_result = future.result()
+            result.nodes += helper_result.nodes
+            if helper_result.depth > result.depth and helper_result.move is not None:
+                result.move = helper_result.move
+                result.score = helper_result.score
+                result.depth = helper_result.depth
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def close(self):
+        """
+        Stops the helper processes and frees the shared transposition table. Does nothing for a single worker.
+        """
+        if self._pool is None:
+            return
+        self._pool.shutdown()
+        self._pool = None
+        self._stop.release()
+        self._stop = None
+        self.tt.close()
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+        self._shared_memory = None
+
+    def _search_root(
+        self, board: BoardCore, team: Team, enemy: Team, depth: int
+    ) -> tuple[int, tuple[int, int, int, int, int | None] | None]:
+        moves = list(self._moves(board, team, enemy, self.tt.probe(board.zobrist_key), 0))
+        if not moves:
+            return self._no_moves_score(board, team, enemy, 0), None
+        alpha = -INFINITY
+        best_move = None
+        self._root_best = ((moves[0][0].row, moves[0][0].col) + moves[0][1:], evaluate(board, team, enemy))
+        for piece, row, col, promotion in moves:
+            move = (piece.row, piece.col, row, col, promotion)
+            record = board.make_move(piece, row, col, team, promotion)
+            try:
+                score = -self._negamax(board, enemy, team, depth - 1, -INFINITY, -alpha, 1)
+            finally:
+                board.unmake_move(record)
+            if score > alpha:
+                alpha, best_move = score, move
+                self._root_best = (move, score)
+        self.tt.store(board.zobrist_key, encode_move(*best_move), depth, BOUND_EXACT, alpha)
+        return alpha, best_move
+
+    def _negamax(
+        self, board: BoardCore, team: Team, enemy: Team, depth: int, alpha: int, beta: int, ply: int
+    ) -> int:
+        self._count_node()
+        if depth <= 0:
+            return self._quiescence(board, team, enemy, alpha, beta, ply)
+        key = board.zobrist_key
+        entry = self.tt.probe(key)
+        if entry is not None:
+            _, entry_depth, bound, score = entry
+            if entry_depth >= depth:
+                score = self._score_from_tt(score, ply)
+                if (
+                    bound == BOUND_EXACT
+                    or (bound == BOUND_LOWER and score >= beta)
+                    or (bound == BOUND_UPPER and score <= alpha)
+                ):
+                    return score
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = 0
+        struct = board.struct
+        for move in self._moves(board, team, enemy, entry, ply):
+            piece, row, col, promotion = move
+            from_row, from_col = piece.row, piece.col
+            is_quiet = struct[row][col] is None and promotion is None
+            record = board.make_move(piece, row, col, team, promotion)
+            try:
+                score = -self._negamax(board, enemy, team, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move(record)
+            if score > best_score:
+                best_score = score
+                best_move = encode_move(from_row, from_col, row, col, promotion)
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if is_quiet:
+                            self.heuristics.record_cutoff(team, move, from_row, from_col, depth, ply)
+                        break
+        if best_score == -INFINITY:
+            return self._no_moves_score(board, team, enemy, ply)
+        if best_score >= beta:
+            bound = BOUND_LOWER
+        elif best_score > original_alpha:
+            bound = BOUND_EXACT
+        else:
+            bound = BOUND_UPPER
+        self.tt.store(key, best_move, depth, bound, self._score_to_tt(best_score, ply))
+        return best_score
+
+    def _quiescence(
+        self, board: BoardCore, team: Team, enemy: Team, alpha: int, beta: int, ply: int
+    ) -> int:
+        """
+        Searches captures and promotions only, until the position is quiet, so the evaluation is never taken in the
+        middle of an exchange.
+        """
+        stand_pat = evaluate(board, team, enemy)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        # most valuable victim first, an unordered capture search explodes in positions with many hanging pieces
+        for piece, row, col, promotion in staged_moves(board, team, enemy, captures_only=True):
+            self._count_node()
+            record = board.make_move(piece, row, col, team, promotion)
+            try:
+                score = -self._quiescence(board, enemy, team, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move(record)
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _moves(
+        self, board: BoardCore, team: Team, enemy: Team, entry: tuple[int, int, int, int] | None, ply: int
+    ):
+        """
+        The legal moves of team in search order, or in build_move_list order if move ordering is off.
+        """
+        if not self.ordering:
+            return iter(board.build_move_list(team, enemy))
+        hash_move = entry[0] if entry is not None else 0
+        return staged_moves(board, team, enemy, hash_move, self.heuristics, ply)
+
+    @staticmethod
+    def _no_moves_score(board: BoardCore, team: Team, enemy: Team, ply: int) -> int:
+        """
+        Checkmate, scored so nearer mates are preferred, or stalemate.
+        """
+        if board.get_checking_pieces(team, enemy):
+            return -MATE_SCORE + ply
+        return 0
+
+    @staticmethod
+    def _score_to_tt(score: int, ply: int) -> int:
+        if score >= MATE_BOUND:
+            return score + ply
+        if score <= -MATE_BOUND:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_tt(score: int, ply: int) -> int:
+        if score >= MATE_BOUND:
+            return score - ply
+        if score <= -MATE_BOUND:
+            return score + ply
+        return score
+
+    def _count_node(self):
+        self.nodes += 1
+        if self._deadline is not None and (
+            time.perf_counter() >= self._deadline
+            or (self._stop is not None and self._stop[0])
+            or (self._stop_event is not None and self._stop_event.is_set())
+        ):
+            raise SearchTimeout
+
+
+# the engine of a helper process, set up once per process by _init_helper
+_helper_engine: Engine | None = None
+
+
+def _init_helper(shared_memory_name: str, tt_size_mb: float, board_class, network: Network | None):
+    """
+    Builds the helper processes engine over the shared transposition table and stop flag.
+    """
+    global _helper_engine
+    shared_memory = SharedMemory(name=shared_memory_name)
+    table_bytes = TranspositionTable.required_bytes(tt_size_mb)
+    tt = TranspositionTable(tt_size_mb, buffer=shared_memory.buf)
+    _helper_engine = Engine(tt_size_mb=tt_size_mb, board_class=board_class, tt=tt, network=network)
+    _helper_engine._shared_memory = shared_memory
+    _helper_engine._stop = shared_memory.buf[table_bytes : table_bytes + 1]
+
+
+def _helper_ready() -> bool:
+    return _helper_engine is not None
+
+
+def _helper_search(fen: str, move_time: float, max_depth: int, generation: int, first_depth: int) -> SearchResult:
+    """
+    Searches a position in a helper process until the stop flag is set or the time runs out.
+    """
+    engine = _helper_engine
+    if engine._stop[0]:
+        # the search finished before this helper got to it
+        return SearchResult(None, 0, 0, 0, 0.0)
+    engine.max_depth = max_depth
+    engine.tt.generation = generation
+    board, dark_team, light_team, current_player = parse_fen(fen, engine.board_class)
+    enemy = light_team if current_player is dark_team else dark_team
+    if engine.network is not None:
+        board.evaluation = NNUEEvaluation(engine.network, board)
+    return engine._iterative_deepening(
+        board, current_player, enemy, time.perf_counter(), move_time, first_depth
+    )
+
+
+class ComputerPlayer:
+    """
+    Runs an Engine on a background thread so a search never blocks the game loop.
+
+    GameState calls start when the computer's turn begins and polls is_ready every frame; the search works on a
+    snapshot of the position, so the game board can be drawn while it runs.
+
+    While the opponent is thinking, GameState calls ponder: the engine plays the reply it expects from its last search
+    on a snapshot and searches the resulting position with no time limit, which also keeps the transposition table
+    warm. If the opponent then plays that reply (a ponder hit) the ponder search carries on as the real search with
+    the move time counted from when pondering began, so after a long enough think the move comes back instantly.
+    Any other reply stops the ponder search and a normal search is started.
+
+    Args:
+        engine (Engine): The engine that picks the moves
+
+    Attributes:
+        result (SearchResult | None): The result of the last finished search
+        ponder_hits (int): Turns on which the opponent played the predicted reply
+        ponder_misses (int): Turns on which the engine pondered a reply that was not played
+        latency_saved (float): Seconds of move_time saved by ponder hits, summed over the game
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine: Engine = engine
+        self.result: SearchResult | None = None
+        self.ponder_hits: int = 0
+        self.ponder_misses: int = 0
+        self.latency_saved: float = 0.0
+        self._thread: threading.Thread | None = None
+        self._stop_event: threading.Event | None = None
+        self._timer: threading.Timer | None = None
+        self._turn_start: float = 0.0
+        self._is_ponder_hit = False
+        self._predicted_move: tuple[int, int, int, int, int | None] | None = None
+        # set by the ponder thread once the position after the predicted reply is known, as its FEN
+        self._ponder_fen: str | None = None
+        self._ponder_ready: threading.Event | None = None
+        self._ponder_start: float = 0.0
+
+    def start(self, board: BoardCore, current_player: Team):
+        """
+        Starts searching the position on the board with current_player to move, or turns the ponder search into the
+        real search if it is pondering this position.
+        """
+        fen = board_to_fen(board, current_player)
+        self._turn_start = time.perf_counter()
+        self._is_ponder_hit = False
+        if self._ponder_ready is not None:
+            self._ponder_ready.wait()
+            if self._ponder_fen == fen:
+                self._ponder_hit()
+                return
+            self.ponder_misses += 1
+            self.stop()
+        self.result = None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(fen, self._turn_start, self._stop_event), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, fen: str, start_time: float, stop_event: threading.Event):
+        self.result = self.engine.search_fen(fen, start_time=start_time, stop_event=stop_event)
+
+    def ponder(self, board: BoardCore, current_player: Team):
+        """
+        Starts pondering while current_player, the opponent, is to move on the board. Does nothing if already
+        pondering or if the last search predicted no reply.
+        """
+        if self._ponder_ready is not None or self.result is None or self.result.ponder_move is None:
+            return
+        self._predicted_move = self.result.ponder_move
+        self._ponder_fen = None
+        self._ponder_ready = threading.Event()
+        self._ponder_start = time.perf_counter()
+        self._stop_event = threading.Event()
+        self.result = None
+        self._thread = threading.Thread(
+            target=self._run_ponder,
+            args=(board_to_fen(board, current_player), self._predicted_move, self._stop_event, self._ponder_ready),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run_ponder(
+        self,
+        fen: str,
+        predicted_move: tuple[int, int, int, int, int | None],
+        stop_event: threading.Event,
+        ready: threading.Event,
+    ):
+        try:
+            board, dark_team, light_team, opponent = parse_fen(fen, self.engine.board_class)
+            team = light_team if opponent is dark_team else dark_team
+            from_row, from_col, to_row, to_col, promotion = predicted_move
+            board.make_move(board.struct[from_row][from_col], to_row, to_col, opponent, promotion)
+            self._ponder_fen = board_to_fen(board, team)
+        except Exception:
+            # the predicted reply could not be played, there is nothing to ponder and start counts a ponder miss
+            return
+        finally:
+            ready.set()
+        self.result = self.engine.search(board, team, opponent, float("inf"), stop_event=stop_event)
+
+    def _ponder_hit(self):
+        """
+        Keeps the ponder search running as the real search, giving it what is left of move_time since pondering began.
+        """
+        self.ponder_hits += 1
+        self._is_ponder_hit = True
+        self._ponder_ready = None
+        remaining = self._ponder_start + self.engine.move_time - time.perf_counter()
+        if remaining <= 0:
+            self._stop_event.set()
+        else:
+            self._timer = threading.Timer(remaining, self._stop_event.set)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def stop(self):
+        """
+        Stops any running search or ponder search and waits for it to finish, its result is discarded.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+        self._ponder_ready = None
+        self.result = None
+
+    def is_ready(self) -> bool:
+        """
+        Returns True once the search started by start has finished.
+        """
+        return self._thread is not None and self._ponder_ready is None and not self._thread.is_alive()
+
+    def take_move(self) -> tuple[int, int, int, int, int | None] | None:
+        """
+        Returns the move of the finished search and resets the player for its next turn. The result is kept, its
+        predicted reply is what ponder searches.
+        """
+        self._thread = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._is_ponder_hit:
+            self.latency_saved += max(0.0, self.engine.move_time - (time.perf_counter() - self._turn_start))
+        return self.result.move if self.result is not None else None
+
+    def get_ponder_stats(self) -> str:
+        """
+        Returns the ponder hit rate and the latency saved so far, for reporting at the end of a game.
+        """
+        pondered = self.ponder_hits + self.ponder_misses
+        hit_rate = self.ponder_hits / pondered if pondered else 0.0
+        return (
+            f"ponder hits {self.ponder_hits}/{pondered} ({hit_rate:.0%}), "
+            f"{self.latency_saved:.1f}s of thinking time saved"
+        )
@@ -0,0 +1,398 @@
+"""
+The pygame side of the board: drawing the squares, highlights and pieces, and turning mouse positions into squares.
+
+The rules live in objects.core, which imports no pygame. The boards here add rendering on top of a core backend.
+
+Frames are drawn incrementally: every square whose contents or highlights change is marked dirty, and render redraws
+and returns only those squares, for pygame.display.update to push to the screen. The whole board is redrawn only after
+invalidate, e.g. when the window was covered.
+"""
+
+import pygame
+from .core.constants import (
+    BOARDPOSX,
+    BOARDPOSY,
+    SQUARESIZE,
+)
+from .core.board import BoardCore
+from .core.bitboard import BitBoardCore
+from .core.piece import Piece
+from .sprites import SPRITE_CACHE
+
+ALPHA_FLAG = pygame.SRCALPHA
+
+
+class GameBoard(BoardCore):
+    """
+    Represents a NxN checkerboard
+
+    Args:
+        square_size (int): The pixel size of each individual square
+        square_count (int): The number of squares in a given row or column i.e. board is square_count x square_count
+        color_dark (pygame.Color): The color of the dark squares
+        color_light (pygame.Color): The color of the light squares
+        window (pygame.Surface): The game window's surface
+
+    Attributes:
+        struct (list[list[Piece | None]]): 2D grid storing pieces or None
+        surface (pygame.Surface): Base surface / Image of the board
+        highlighted_surface (pygame.Surface): Transparent overlay surface for highlighting
+        rect (pygame.Rect): Position and size of the board relative to the window
+        highlighted_squares list[tuple[int, int]]: Squares which are to be highlighted stored as a list of (row,col) tuples.
+        highlight_tiles (dict[tuple[tuple, int], pygame.Surface]): Highlight squares keyed by (color, alpha)
+        highlights_stale (bool): Whether highlighted_surface must be rebuilt from highlighted_squares before drawing
+        overlay_rebuilds (int): How many times highlighted_surface was rebuilt
+        dirty_squares (set[tuple[int, int]]): Squares (row, col) changed since the last render
+        full_redraw (bool): Whether the next render redraws the whole board, True until the first render
+
+    """
+
+    def __init__(
+        self,
+        square_size: int,
+        square_count: int,
+        color_dark: pygame.Color,
+        color_light: pygame.Color,
+        window: pygame.Surface,
+    ):
+        super().__init__(square_size, square_count)
+        self.dirty_squares: set[tuple[int, int]] = set()
+        self.full_redraw: bool = True
+        self.init_struct()
+        self.color_light: pygame.Color = color_light
+        self.color_dark: pygame.Color = color_dark
+        self.window: pygame.Surface = window
+        self.pos_x = BOARDPOSX
+        self.pos_y = BOARDPOSY
+        self.surface: pygame.Surface = pygame.Surface(
+            (square_count * square_size, square_count * square_size)
+        )
+        self.highlighted_surface: pygame.Surface = pygame.Surface(
+            (square_count * square_size, square_count * square_size), flags=ALPHA_FLAG
+        )
+        self.rect: pygame.Rect = self.surface.get_rect(topleft=(self.pos_x, self.pos_y))
+        self.highlight_tiles: dict[tuple[tuple, int], pygame.Surface] = {}
+        self._draw_base_board()
+        self.highlighted_squares: dict[tuple[int, int], pygame.Color] = {}
+        self.highlights_stale: bool = False
+        self.overlay_rebuilds: int = 0
+
+    def _draw_base_board(self):
+        """
+        Colors the board with a checkerboard style, with the first (top-left) square being the self.light_color
+        """
+        # we go through the board and for each square, we "blit" onto the board the current square.
+        for row in range(self.square_count):
+            for col in range(self.square_count):
+                self.color_square(row, col)
+
+    def highlight_square(
+        self, row_index: int, col_index: int, color: pygame.Color, alpha=128
+    ):
+        """
+        Highlights an individual square by drawing over the semi-transparent highlighted surface
+
+        Args:
+            row_index (int): The row index of the square to highlight
+            col_index (int): The col index of the square to highlight
+            color (pygame.Color): The highlight Color
+            alpha (int): Transparency level from 0-255, Optional. Defaults to 128
+        """
+        self.highlighted_surface.blit(
+            self.get_highlight_tile(color, alpha),
+            (col_index * SQUARESIZE, row_index * SQUARESIZE),
+        )
+
+    def get_highlight_tile(self, color: pygame.Color, alpha: int = 128) -> pygame.Surface:
+        """
+        Returns a square filled with a semi-transparent color, built on first use and reused afterwards.
+
+        Args:
+            color (pygame.Color): The highlight Color
+            alpha (int): Transparency level from 0-255, Optional. Defaults to 128
+
+        Returns:
+            pygame.Surface: The shared tile, must not be drawn on
+        """
+        key = (tuple(color), alpha)
+        tile = self.highlight_tiles.get(key)
+        if tile is None:
+            tile = pygame.Surface((SQUARESIZE, SQUARESIZE), flags=ALPHA_FLAG)
+            tile.fill((*color, alpha))
+            self.highlight_tiles[key] = tile
+        return tile
+
+    def draw_highlights(self):
+        """
+        Draws the highlight overlay onto the game window, rebuilding it first if the highlighted squares changed.
+        """
+        self.update_highlights()
+        self.window.blit(self.highlighted_surface, (self.pos_x, self.pos_y))
+
+    def update_highlights(self):
+        """
+        Rebuilds the highlight overlay from highlighted_squares, if they changed since it was last built.
+        """
+        if not self.highlights_stale:
+            return
+        self.clear_highlights()
+        for color, squares in self.highlighted_squares.items():
+            for square in squares:
+                self.highlight_square(*square, color)
+        self.highlights_stale = False
+        self.overlay_rebuilds += 1
+
+    def clear_highlights(self):
+        self.highlighted_surface.fill((0, 0, 0, 0))
+
+    def color_square(
+        self,
+        row_index: int,
+        col_index: int,
+        color: pygame.Color = None,
+        highlight: bool = False,
+    ):
+        """
+        Colors an individual square on the board.
+        If no color is provided it colors based on the default checkerboard pattern and its (row, col) position
+        If highlight is True, a semi-transparent version of the color is provided
+
+        Args:
+            row_index (int) : The row index of the square
+            col_index (int) : the col_index of the square
+            Color (pygame.Color, optional) : the color of the square, if None defaults to dark / light
+            highlight (bool, optional) : Flag to check if semi-transparent highlight is used. Default is False
+
+        """
+        if color is None:
+            color = (
+                self.color_dark
+                if (row_index + col_index) % 2 == 1
+                else self.color_light
+            )
+        pos = (col_index * SQUARESIZE, row_index * SQUARESIZE)
+        if highlight:
+            self.surface.blit(self.get_highlight_tile(color), pos)
+        else:
+            self.surface.fill(color, pygame.Rect(pos, (SQUARESIZE, SQUARESIZE)))
+
+    def draw_pieces(self):
+        """
+        Draws all pieces located on the board
+
+        Iterates through the board, and for each square that contains a piece calls the
+        'draw_piece' method to render it.
+
+        """
+        for row in range(self.square_count):
+            for col in range(self.square_count):
+                contents = self.get_square_contents(row, col)
+                if contents is not None:
+                    self.draw_piece(contents, row, col)
+
+    def get_abs_pos(self, row: int, col: int) -> tuple[int, int]:
+        """
+        converts a grid pos (row, col) into a absolute window screen position (x, y)
+
+        The returned position is relative to the gane windows top-left pixel coordinate, based on the boards original position.
+
+        Args:
+            row (int): The row on the grid
+            col (int): The col on the grid
+
+        Returns:
+            tuple[int, int]: The (x, y) screen position of the top-left corner of the square
+
+        Raises:
+            ValueError: If the given grid pos (row, col) is not found on the board
+        """
+        if not self.in_bounds(row, col):
+            raise ValueError(f"No position corresponds to grid position ({row}, {col})")
+        return (
+            self.pos_x + col * self.square_size,
+            self.pos_y + row * self.square_size,
+        )
+
+    def draw_piece(self, piece: Piece, row: int, col: int):
+        """
+        Draws the piece on the game window at a specific board position (row, col)
+
+        Pieces hold no images, the image is taken from the process-wide SPRITE_CACHE by the piece's type and color
+
+        Notes:
+
+            This method should be called after all background and board drawing methods as pieces are drawn on the top of the
+            board. Failure to do so may lead to pieces being overwritten
+
+        Args:
+            piece (Piece): The Piece to be drawn
+            row (int): The row on the board
+            col (int): The col on the board
+        """
+        pos = self.get_abs_pos(row, col)
+        self.window.blit(SPRITE_CACHE.get(piece.type, piece.color, self.square_size), pos)
+
+    def mouse_pos_to_grid(
+        self, pos: tuple[int, int]
+    ) -> tuple[int, int] | tuple[None, None]:
+        """
+        Converts a mouse position relative to the window into a grid position relative to the board,
+        If the mouse position is out of bounds returns (None, None)
+
+        Args:
+
+            pos (tuple[int, int]): The mouse position
+
+        Returns:
+
+            tuple[int, int] | tuple[None, None]: The grid position (row, col) of the board
+            or (None, None) if the mouse is out of bounds
+        """
+        mouse_x, mouse_y = pos
+        if not self.rect.collidepoint(mouse_x, mouse_y):
+            return (None, None)
+
+        col = (mouse_x - self.pos_x) // SQUARESIZE
+        row = (mouse_y - self.pos_y) // SQUARESIZE
+
+        # handles the rare case that they select right most or bottom most edge,
+        # leading to row or column value of 8, illegal
+        if 0 <= row < 8 and 0 <= col < 8:
+            return (int(row), int(col))
+        else:
+            return (None, None)
+
+    def render(self, promo=None) -> list[pygame.Rect]:
+        """
+        Redraws the squares changed since the last render, or the whole board after invalidate, and the promotion
+        menu on top of them.
+
+        Args:
+            promo (PromotionMenu | None): The open promotion menu, if any
+
+        Returns:
+            list[pygame.Rect]: The window areas drawn, to be passed to pygame.display.update. Empty when nothing changed.
+        """
+        if self.full_redraw:
+            self.draw_board()
+            self.draw_highlights()
+            self.draw_pieces()
+            if promo:
+                self.draw_menu(promo)
+            self.full_redraw = False
+            self.dirty_squares.clear()
+            return [self.window.get_rect()]
+        if not self.dirty_squares:
+            return []
+        rects = [self.draw_square(row, col) for row, col in self.dirty_squares]
+        self.dirty_squares.clear()
+        if promo:
+            menu_rect = promo.rect.move(self.pos_x, self.pos_y)
+            if menu_rect.collidelist(rects) != -1:
+                self.draw_menu(promo)
+                rects.append(menu_rect)
+        return rects
+
+    def draw_square(self, row: int, col: int) -> pygame.Rect:
+        """
+        Redraws a single square: its part of the base board, its highlights and its piece.
+
+        Args:
+            row (int): The row of the square
+            col (int): The col of the square
+
+        Returns:
+            pygame.Rect: The window area of the square
+        """
+        area = pygame.Rect(col * self.square_size, row * self.square_size, self.square_size, self.square_size)
+        pos = self.get_abs_pos(row, col)
+        self.window.blit(self.surface, pos, area)
+        self.update_highlights()
+        self.window.blit(self.highlighted_surface, pos, area)
+        piece = self.struct[row][col]
+        if piece is not None:
+            self.draw_piece(piece, row, col)
+        return pygame.Rect(pos, (self.square_size, self.square_size))
+
+    def mark_dirty(self, row: int, col: int):
+        """
+        Marks the square (row, col) to be redrawn by the next render.
+        """
+        self.dirty_squares.add((row, col))
+
+    def mark_area_dirty(self, rect: pygame.Rect):
+        """
+        Marks every square overlapped by an area of the board, given relative to the board's top-left corner, e.g.
+        the area a promotion menu covers.
+        """
+        size = self.square_size
+        for row in range(max(0, rect.top // size), min(self.square_count, -(-rect.bottom // size))):
+            for col in range(max(0, rect.left // size), min(self.square_count, -(-rect.right // size))):
+                self.dirty_squares.add((row, col))
+
+    def invalidate(self):
+        """
+        Makes the next render redraw the whole board, e.g. after the window was covered or resized.
+        """
+        self.full_redraw = True
+
+    def _place(self, piece: Piece, row: int, col: int):
+        super()._place(piece, row, col)
+        self.dirty_squares.add((row, col))
+
+    def _lift(self, row: int, col: int) -> Piece | None:
+        self.dirty_squares.add((row, col))
+        return super()._lift(row, col)
+
+    def draw_board(self):
+        """
+        Draws the base board surface on the game window's surface, at the board position.
+
+        Must be called before drawing highlights or pieces.
+
+        """
+        self.window.blit(self.surface, (self.pos_x, self.pos_y))
+
+    def draw_menu(self, promo):
+        """
+        Draws the promotion menu, on the game window's surface,
+        Must be called after background and piece surfaces are drawn
+        """
+        ## Perhaps move this method out of the board class and into the menu class
+        self.window.blit(promo.surface, (promo.x + self.pos_x, promo.y + self.pos_y))
+
+    def add_highlighted_squares(
+        self, color: pygame.Color, squares: list[tuple[int, int]]
+    ):
+        """
+        Sets the highlighted_squares attribute of the board, the squares it adds or removes are redrawn by the next
+        render. Setting the squares a color already highlights changes nothing.
+
+        Args:
+            squares (list[tuple[int, int]]): A list of (row, col) tuples representing board squares to be highlighted
+        """
+        previous = self.highlighted_squares.get(color)
+        if previous == squares:
+            return
+        if previous is not None:
+            self.dirty_squares.update(previous)
+        self.dirty_squares.update(squares)
+        self.highlighted_squares[color] = squares
+        self.highlights_stale = True
+
+    def clear_highlighted_squares(self):
+        """
+        Clears the list containing highlighted squares, the squares are redrawn without highlights by the next render.
+        """
+        if not self.highlighted_squares:
+            return
+        for squares in self.highlighted_squares.values():
+            self.dirty_squares.update(squares)
+        self.highlighted_squares = {}
+        self.highlights_stale = True
+
+
+class BitGameBoard(GameBoard, BitBoardCore):
+    """
+    A GameBoard whose rules are answered by the BitBoardCore backend. Rendering is unchanged.
+    """
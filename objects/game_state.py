@@ -1,4 +1,4 @@
-from .constants import (
+from .core.constants import (
     STARTTURN,
     SELECTPIECE,
     SELECTMOVE,
@@ -9,26 +9,34 @@ from .constants import (
     RED,
     GOLD,
     BLUE,
-    BLACK,
-    WHITE,
+    PIECE_NAMES,
 )
-from .board import GameBoard
+from .core.game import Game
+from .core.pgn import format_pgn
+from .core.piece import Piece
+from .core.team import Team
+from .engine import ComputerPlayer
+from .game_board import GameBoard
 from pygame.locals import *
-from .piece import Piece
 from .promotion_menu import PromotionMenu
-from .team import Team
+from concurrent.futures import Future, ThreadPoolExecutor
+import datetime
 import pygame
-import sys
 
 
-class GameState:
+class GameState(Game):
     """
     Over-arching object that controls game state.
 
+    Drives the turn cycle of the core Game from mouse events and computer players, and renders the board in between.
+
     Args:
         board (Board): The chessboard the game will be played on
         dark_team (Team): The Black players team, i.e. collection of their pieces they will play with
         light_team (Team): The White players team, i.e. collection of their pieces they will play with
+        computer_players (dict[int, ComputerPlayer] | None): Computer opponents keyed by the team_id they play, teams
+        without one are played with the mouse
+        pgn_path (str | None): A file every game is appended to in PGN when it ends or the window is closed
 
     Attributes:
         mouse_pressed (Bool): Whether or not the mouse has been pressed, for state functions this value must continuously
@@ -38,16 +46,25 @@ class GameState:
         captured_piece (Piece): The last captured piece obtained from piece capturing
         legal_moves (list[tuple[int ,int]]): A list of tuples which represent legal moves
         state (int): The current game state, whether a player is selecting a piece, moving the piece or upgrading a piece.
-        board (Board): The chessboard the game will be played on
-        dark_team (Team): The Black players team, i.e. collection of their pieces they will play with
-        light_team (Team): The White players team, i.e. collection of their pieces they will play with
-        current_player (int): The current player whose turn it is
-        other_player (int): The player whose is waiting for their turn
         promotion_menu (PromotionMenu): The object representing the upgrade menu once a pawn reaches the enemy main rank.
+        computer_players (dict[int, ComputerPlayer]): Computer opponents keyed by the team_id they play
+        turn_start_job (Future | None): The turn start computation (checking pieces and move dictionary) running on
+        the worker thread. While it runs the game is computing: it stays in STARTTURN, keeps rendering and handling
+        events, and ignores clicks.
+        window_focused (bool): Whether the game window has the input focus, as last reported by a window event
+        pgn_path (str | None): The file games are appended to, None to keep no record
 
     """
 
-    def __init__(self, board: GameBoard, dark_team: Team, light_team: Team):
+    def __init__(
+        self,
+        board: GameBoard,
+        dark_team: Team,
+        light_team: Team,
+        computer_players: dict[int, ComputerPlayer] | None = None,
+        pgn_path: str | None = None,
+    ):
+        super().__init__(board, dark_team, light_team)
         self.mouse_pressed = False
         self.mouse_pos: tuple[int, int] = (0, 0)
         self.selected_piece: Piece | None = (
@@ -56,32 +73,48 @@ class GameState:
         self.captured_piece: Piece | None = (
             None  # captured pieces during current players turn
         )
-        self.move_dict: dict[Piece, list[tuple[int, int]]] | None = None
-        # a move dictionary for the legal moves a player can make
-        self.checking_pieces: dict[Piece, tuple[int, int]] = (
-            {}
-        )  # pieces of the other player that are checking the current player
         self.state: int = STARTTURN  # state variable
         self.board: GameBoard = board
-        self.dark_team: Team = dark_team
-        self.light_team: Team = light_team
-        self.current_player: Team = self.light_team
-        self.other_player: Team = self.dark_team
         self.promotion_menu = None
         self.game_is_running = True
+        self.computer_players: dict[int, ComputerPlayer] = dict(computer_players or {})
+        self.worker = ThreadPoolExecutor(max_workers=1)
+        self.turn_start_job: Future | None = None
+        self.window_focused: bool = True
+        self.pgn_path: str | None = pgn_path
         self.on_enter_new_state(STARTTURN)
 
-    def handle_events(self):
+    def handle_events(self, timeout: int = 0):
         """
         Handles the pygame side of events
+
+        Args:
+            timeout (int): If positive, waits up to timeout milliseconds for an event when none is queued, sleeping
+            instead of polling. Defaults to 0, no wait.
         """
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if not events and timeout > 0:
+            event = pygame.event.wait(timeout)
+            if event.type != NOEVENT:
+                events = [event, *pygame.event.get()]
+        for event in events:
+            if event.type == WINDOWFOCUSLOST:
+                self.window_focused = False
+            elif event.type == WINDOWFOCUSGAINED:
+                self.window_focused = True
             if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
+                if self.state != GAMEEND:
+                    # a finished game was saved when it ended
+                    self.save_pgn()
+                # main stops the computer players and closes their engines once the game loop ends
+                self.end_game_is_running()
+                return
+            if event.type == VIDEOEXPOSE:
+                # the window was covered or restored, what was on screen is gone
+                self.board.invalidate()
             if event.type == MOUSEBUTTONDOWN:
                 self.set_mouse_pressed(True)
-                self.set_mouse_pos(*pygame.mouse.get_pos())
+                self.set_mouse_pos(*event.pos)
 
     def update_state(self):
         ## Note that these method depends on hook methods, i.e. the on_enter_new_state method.
@@ -111,16 +144,21 @@ class GameState:
         Contains the actual "actions" of a given state
         """
         if state == STARTTURN:
-            self.checking_pieces = self.board.get_checking_pieces(
-                self.current_player, self.other_player
-            )
-            if self.checking_pieces:
-                self.current_player.king.set_in_check(True)
-            self.move_dict = self.board.build_move_dict(
-                self.current_player, self.other_player
+            self.record_position()
+            # nothing moves on the board until the job is done, so the worker can read it while frames are drawn
+            self.turn_start_job = self.worker.submit(
+                self.compute_turn_start, self.current_player, self.other_player
             )
 
         elif state == SELECTPIECE:
+            computer_player = self.get_computer_player()
+            if computer_player is not None:
+                computer_player.start(self.board, self.current_player)
+            else:
+                # a computer opponent thinks on the human's time
+                opponent = self.computer_players.get(self.other_player.team_id)
+                if opponent is not None:
+                    opponent.ponder(self.board, self.current_player)
             if self.checking_pieces:
                 self.board.add_highlighted_squares(
                     RED, list(self.checking_pieces.values())
@@ -151,16 +189,18 @@ class GameState:
         elif state == ENDTURN:
             if self.captured_piece is not None:
                 print(
-                    f"{str(self.current_player).split()[0]} captures {str(self.other_player).split()[0]}'s {self.captured_piece.type}"
+                    f"{str(self.current_player).split()[0]} captures {str(self.other_player).split()[0]}'s {PIECE_NAMES[self.captured_piece.type]}"
                 )
-                self.other_player.active_pieces.remove(self.captured_piece)
-                self.other_player.captured_pieces.append(self.captured_piece)
-            self.update_current_player(self.captured_piece)
+            self.end_turn(self.captured_piece)
+            print(f"It is now {str(self.current_player).split()[0]}'s turn")
         elif state == GAMEEND:
-            if self.current_player.king.get_check_status():
-                print(f"{self.other_player} Has Won, Game over")
-            else:
-                print(f"Stalemate, No one has won")
+            print(self.get_result())
+            self.save_pgn()
+            for team_id, computer_player in self.computer_players.items():
+                computer_player.stop()
+                team = self.light_team if team_id == self.light_team.team_id else self.dark_team
+                print(f"{team} (computer): {computer_player.get_ponder_stats()}")
+            self.worker.shutdown(wait=False)
             self.end_game_is_running()
 
     def on_exit_current_state(self):
@@ -182,16 +222,18 @@ class GameState:
         elif self.state == ENDTURN:
             self.set_captured_piece(None)
             self.set_selected_piece(None)
-            self.current_player.king.set_in_check(
-                False
-            )  # assumes that the move was valid
+            self.clear_turn()
             self.teardown_promo_menu()
-            self.checking_pieces = {}
-            self.move_dict = {}
 
     def handle_turn_start(self):
-
-        if self.move_dict and self.move_dict_is_empty():
+        if not self.turn_start_job.done():
+            # computing, the frame is still rendered and events are still handled
+            self.set_mouse_pressed(False)
+            self.continue_in_state()
+            return
+        self.apply_turn_start(*self.turn_start_job.result())
+        self.turn_start_job = None
+        if self.is_game_over():
             self.change_state_to(GAMEEND)
         else:
             self.change_state_to(SELECTPIECE)
@@ -200,7 +242,9 @@ class GameState:
         """
         Piece selection state
         """
-        if self.mouse_pressed:  # event
+        if self.get_computer_player() is not None:
+            self.handle_computer_move()
+        elif self.mouse_pressed:  # event
             # validate event
             if self.valid_square_selected(self.mouse_pos):
                 row, col = self.board.mouse_pos_to_grid(
@@ -237,7 +281,7 @@ class GameState:
                 if self.valid_square_selected(self.mouse_pos):
                     row, col = self.board.mouse_pos_to_grid(self.mouse_pos)
                     if self.valid_move_selected(row, col, legal_moves):
-                        self.captured_piece = self.board.move_piece(
+                        self.captured_piece = self.play_move(
                             self.selected_piece, row, col
                         )
                         if self.selected_piece.is_promotable():
@@ -254,6 +298,26 @@ class GameState:
         else:
             self.continue_in_state()
 
+    def handle_computer_move(self):
+        """
+        Plays the computer players move once its background search has finished, the game keeps rendering meanwhile.
+        Clicks made during the computers turn are ignored.
+        """
+        computer_player = self.get_computer_player()
+        self.set_mouse_pressed(False)
+        if not computer_player.is_ready():
+            self.continue_in_state()
+            return
+        move = computer_player.take_move()
+        if move is None:
+            # the search found no legal move, which turn start should already have caught
+            self.change_state_to(GAMEEND)
+            return
+        from_row, from_col, to_row, to_col, promotion = move
+        self.set_selected_piece(self.board.get_square_contents(from_row, from_col))
+        self.captured_piece = self.play_move(self.selected_piece, to_row, to_col, promotion)
+        self.change_state_to(ENDTURN)
+
     def handle_promotion_selection(self):
         """
         Promotion of a pawn into a new piece, must occur.
@@ -267,9 +331,7 @@ class GameState:
             )
             if promotion_option != None:
                 new_type = self.promotion_menu.get_piece_type(promotion_option)
-                self.board.upgrade_piece(
-                    self.current_player, self.selected_piece, new_type
-                )
+                self.promote(self.selected_piece, new_type)
                 self.change_state_to(ENDTURN)
             else:
                 print("Invalid promotion option")
@@ -285,8 +347,11 @@ class GameState:
     def build_promotion_menu(self, piece: Piece):
         color = piece.color
         self.promotion_menu = PromotionMenu(color)
+        self.board.mark_area_dirty(self.promotion_menu.rect)
 
     def teardown_promo_menu(self):
+        if self.promotion_menu is not None:
+            self.board.mark_area_dirty(self.promotion_menu.rect)
         self.promotion_menu = None
 
     def reset_turn(self, msg: str = None):
@@ -302,25 +367,44 @@ class GameState:
     def remove_highlighted_squares(self):
         self.board.clear_highlighted_squares()
 
-    def update_current_player(self, captured_piece):
+    def render(self) -> list[pygame.Rect]:
         """
-        Changes the current player into the other player. i.e. changes the active player from white to black
+        Draws what changed since the last frame onto the window.
+
+        Returns:
+            list[pygame.Rect]: The window areas drawn, to be passed to pygame.display.update
         """
-        if self.current_player.color == WHITE:
-            print("It is now Black's turn")
-            self.current_player = self.dark_team
-            self.other_player = self.light_team
-        else:
-            print("It is now White's turn")
-            self.current_player = self.light_team
-            self.other_player = self.dark_team
+        return self.board.render(self.promotion_menu)
 
-    def render(self):
-        self.board.draw_board()  # draw board onto the window
-        self.board.draw_highlights(self.board.highlighted_squares)
-        self.board.draw_pieces()  # draw all pieces onto the board
-        if self.promotion_menu:
-            self.board.draw_menu(self.promotion_menu)
+    def export_pgn(self) -> str:
+        """
+        Returns the game so far in PGN, its result is * until the game has ended.
+        """
+        tags = {
+            "Event": "Casual game",
+            "Site": "Chess",
+            "Date": datetime.date.today().strftime("%Y.%m.%d"),
+            "Round": "-",
+            "White": "Computer" if self.light_team.team_id in self.computer_players else "Human",
+            "Black": "Computer" if self.dark_team.team_id in self.computer_players else "Human",
+        }
+        result = self.get_result_code() if self.state == GAMEEND else "*"
+        return format_pgn(tags, self.san_moves, result, self.start_fen)
+
+    def save_pgn(self):
+        """
+        Appends the game to pgn_path, if the game keeps a record and a move has been played. A file that cannot be
+        written is reported, the game goes on.
+        """
+        if self.pgn_path is None or not self.san_moves:
+            return
+        try:
+            with open(self.pgn_path, "a", encoding="utf-8") as file:
+                file.write(self.export_pgn())
+        except OSError as error:
+            print(f"Could not save the game to {self.pgn_path}: {error}")
+            return
+        print(f"Game saved to {self.pgn_path}")
 
     ### State methods, might move
 
@@ -370,15 +454,25 @@ class GameState:
     def end_game_is_running(self):
         self.game_is_running = False
 
-    def print_current_player(self):
-        if self.current_player == self.dark_team:
-            return "Black Player"
-        elif self.current_player == self.light_team:
-            return "White Player"
-
-    def move_dict_is_empty(self):
-        assert self.move_dict is not None
-        for value in self.move_dict.values():
-            if value:
-                return False
-        return True
+    def is_computing(self) -> bool:
+        """
+        Returns True while the turn start computation runs on the worker thread.
+        """
+        return self.turn_start_job is not None
+
+    def is_waiting_for_input(self) -> bool:
+        """
+        Returns True while nothing can change until the player clicks: a human team is selecting a piece, a move or
+        a promotion and no click is waiting to be handled. The game can then sleep until the next event.
+        """
+        return (
+            self.state in (SELECTPIECE, SELECTMOVE, SELECTPROMOTION)
+            and not self.mouse_pressed
+            and self.get_computer_player() is None
+        )
+
+    def get_computer_player(self) -> ComputerPlayer | None:
+        """
+        Returns the computer player of the team to move, None if the team is played with the mouse.
+        """
+        return self.computer_players.get(self.current_player.team_id)
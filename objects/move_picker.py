@@ -0,0 +1,218 @@
+"""
+Staged move generation for the search.
+
+Alpha-beta prunes the most when the best move is searched first, so instead of one unordered list the search takes its
+moves from staged_moves, a generator that hands them out in stages, best first:
+
+    1. the hash move, the best move stored in the transposition table, before any other move is generated
+    2. captures, most valuable victim first and least valuable attacker first among equal victims (MVV-LVA)
+    3. promotions that do not capture, queen first
+    4. killer moves, quiet moves that caused a cutoff at the same ply elsewhere in the tree
+    5. the remaining quiet moves, highest history score first
+
+Moves are generated in two passes. Captures and promotions come first; the quiet moves are only generated and
+ordered once the consumer has taken every capture without a cutoff, so a cutoff on a capture or promotion and every
+quiescence search skip them. The hash move is checked against the positions legality masks, which are computed before
+anything else: a cutoff on it skips generating every other move, but not the masks.
+"""
+
+from .core.constants import (
+    SQUARECOUNT,
+    PIECE_PAWN,
+    PIECE_KNIGHT,
+    PIECE_BISHOP,
+    PIECE_ROOK,
+    PIECE_QUEEN,
+    PIECE_KING,
+    PROMOTION_TYPES,
+    BLACKPLAYER,
+    WHITEPLAYER,
+)
+from .core.board import BoardCore
+from .core.piece import Piece
+from .core.team import Team
+from .transposition import encode_move, decode_move
+
+# victim values for MVV-LVA, the attackers value only breaks ties between equal victims
+ORDER_VALUES = {
+    PIECE_PAWN: 1,
+    PIECE_KNIGHT: 3,
+    PIECE_BISHOP: 3,
+    PIECE_ROOK: 5,
+    PIECE_QUEEN: 9,
+    PIECE_KING: 0,
+}
+KILLER_SLOTS = 2
+MAX_PLY = 128
+
+
+class SearchHeuristics:
+    """
+    What a search learns about quiet moves: killer moves per ply and history scores per team and move.
+
+    Attributes:
+        killers (list[list[int]]): killers[ply] holds the KILLER_SLOTS most recent quiet moves, encoded with
+        encode_move, that caused a beta cutoff at that ply, newest first
+        history (list[list[int]]): history[team_id][from_sq * 64 + to_sq] grows by depth * depth every time the quiet
+        move caused a beta cutoff
+    """
+
+    def __init__(self):
+        self.killers: list[list[int]] = [[0] * KILLER_SLOTS for _ in range(MAX_PLY)]
+        self.history: list[list[int]] = [[0] * (SQUARECOUNT**4) for _ in (BLACKPLAYER, WHITEPLAYER)]
+
+    def new_search(self):
+        """
+        Forgets the killers, which belong to the previous positions plies, and halves the history scores so moves
+        that were good recently count more.
+        """
+        for slots in self.killers:
+            slots[:] = [0] * KILLER_SLOTS
+        for scores in self.history:
+            scores[:] = [score // 2 for score in scores]
+
+    def record_cutoff(self, team: Team, move: tuple[Piece, int, int, int | None], from_row: int, from_col: int,
+                      depth: int, ply: int):
+        """
+        Records that a quiet move caused a beta cutoff, as a killer for the ply and in the history table.
+
+        Args:
+            team (Team): The team that made the move
+            move (tuple[Piece, int, int, int | None]): The move, as yielded by staged_moves
+            from_row (int): The row the piece moved from
+            from_col (int): The col the piece moved from
+            depth (int): The remaining depth of the node
+            ply (int): The distance of the node from the root
+        """
+        _, row, col, promotion = move
+        code = encode_move(from_row, from_col, row, col, promotion)
+        if ply < MAX_PLY:
+            slots = self.killers[ply]
+            if slots[0] != code:
+                slots[1:] = slots[:-1]
+                slots[0] = code
+        from_sq = from_row * SQUARECOUNT + from_col
+        self.history[team.team_id][from_sq * SQUARECOUNT * SQUARECOUNT + row * SQUARECOUNT + col] += depth * depth
+
+
+def capture_order(struct, move: tuple[Piece, int, int, int | None]) -> int:
+    """
+    The MVV-LVA sort key of a capture or promotion, higher is searched first.
+    """
+    piece, row, col, promotion = move
+    victim = struct[row][col]
+    value = ORDER_VALUES[victim.type] if victim is not None else 0
+    if promotion is not None:
+        value += ORDER_VALUES[promotion] - ORDER_VALUES[PIECE_PAWN]
+    return value * 16 - ORDER_VALUES[piece.type]
+
+
+def staged_moves(
+    board: BoardCore,
+    team: Team,
+    enemy: Team,
+    hash_move: int = 0,
+    heuristics: SearchHeuristics | None = None,
+    ply: int = 0,
+    captures_only: bool = False,
+):
+    """
+    Yields the legal moves of team as (piece, row, col, promotion) tuples, in the stages described in the module
+    docstring. The board must not be changed between two moves being taken, except by a move that is taken back
+    before the next one is asked for.
+
+    Args:
+        board (BoardCore): The position
+        team (Team): The team to move
+        enemy (Team): The opposing team
+        hash_move (int): The transposition tables best move for the position, encoded with encode_move, 0 if none
+        heuristics (SearchHeuristics | None): Killers and history to order quiet moves with, generation order if None
+        ply (int): The distance of the position from the root, selects the killers
+        captures_only (bool): Only yield captures and promotions, e.g. for a quiescence search. Quiet moves are then
+        never generated.
+
+    Yields:
+        tuple[Piece, int, int, int | None]: The next move
+    """
+    struct = board.struct
+    masks = board.compute_legality_masks(team, enemy)
+    last_row = SQUARECOUNT - 1
+    tried = set()
+
+    if hash_move:
+        from_row, from_col, row, col, promotion = decode_move(hash_move)
+        piece = struct[from_row][from_col]
+        # the entry may be a key collision or torn by another process, so the move is checked before it is played
+        if (
+            piece is not None
+            and team.owns(piece)
+            and (promotion is not None) == (piece.type == PIECE_PAWN and row in (0, last_row))
+            and (not captures_only or struct[row][col] is not None or promotion is not None)
+            and (row, col) in board.generate_legal_moves(piece, team, enemy, masks)
+        ):
+            tried.add(hash_move)
+            yield piece, row, col, promotion
+
+    # captures and promotions, in their own pass: a pawn one step from the last rank is the only piece with a
+    # non-capture among them, so its moves are all generated here and it is left out of the quiet pass
+    promoting_rows = {BLACKPLAYER: last_row - 1, WHITEPLAYER: 1}
+    captures = []
+    promotions = []
+    for piece in team.active_pieces:
+        if struct[piece.row][piece.col] is not piece:
+            continue  # captured by a move that has not been taken back yet
+        if piece.type == PIECE_PAWN and piece.row == promoting_rows[piece.color]:
+            for row, col in board.generate_legal_moves(piece, team, enemy, masks):
+                target = captures if struct[row][col] is not None else promotions
+                for promotion in PROMOTION_TYPES:
+                    target.append((piece, row, col, promotion))
+        else:
+            for row, col in board.generate_legal_moves(piece, team, enemy, masks, captures=True):
+                captures.append((piece, row, col, None))
+
+    captures.sort(key=lambda move: capture_order(struct, move), reverse=True)
+    for move in captures + promotions:
+        if tried and encode_move(move[0].row, move[0].col, *move[1:]) in tried:
+            continue
+        yield move
+    if captures_only:
+        return
+
+    # quiet moves are only generated once the consumer has taken every capture without a cutoff
+    quiets = []
+    for piece in team.active_pieces:
+        if struct[piece.row][piece.col] is not piece:
+            continue
+        if piece.type == PIECE_PAWN and piece.row == promoting_rows[piece.color]:
+            continue
+        for row, col in board.generate_legal_moves(piece, team, enemy, masks, captures=False):
+            quiets.append((piece, row, col, None))
+    if not quiets:
+        return
+
+    if heuristics is not None:
+        killers = heuristics.killers[ply] if ply < MAX_PLY else ()
+        history = heuristics.history[team.team_id]
+        scored = []
+        killer_moves = []
+        for move in quiets:
+            piece, row, col, _ = move
+            from_sq = piece.row * SQUARECOUNT + piece.col
+            code = from_sq | ((row * SQUARECOUNT + col) << 6)
+            if code in tried:
+                continue
+            if code in killers:
+                killer_moves.append((killers.index(code), move))
+            else:
+                scored.append((history[from_sq * SQUARECOUNT * SQUARECOUNT + row * SQUARECOUNT + col], move))
+        killer_moves.sort(key=lambda item: item[0])
+        for _, move in killer_moves:
+            yield move
+        scored.sort(key=lambda item: item[0], reverse=True)
+        for _, move in scored:
+            yield move
+    else:
+        for move in quiets:
+            if tried and encode_move(move[0].row, move[0].col, *move[1:]) in tried:
+                continue
+            yield move
@@ -0,0 +1,290 @@
+"""
+An optional efficiently updatable neural network (NNUE) evaluator, evaluated with NumPy on the CPU.
+
+The first layer works on HalfKP features: for each team, one feature per (own king square, piece, square) for every
+piece other than the kings. Its output for a team, the accumulator, is the bias plus the sum of the weight rows of the
+active features. A move only switches a few features on or off, so the accumulators are updated by adding and
+subtracting single rows as the board places and lifts pieces, instead of being recomputed. Only a king move, which
+changes every feature of its own team, refreshes that teams accumulator from scratch.
+
+The accumulators of the team to move and of the other team are clipped and concatenated, then passed through small
+dense layers to a single output, the evaluation.
+
+Weights are stored in one file that is memory mapped, so loading a network costs nothing until its rows are used.
+No trained network ships with the game: Network.random builds one for benchmarking and checking the plumbing, and a
+trained file in the same format can be loaded with Network.load.
+
+NumPy is only needed by this module, the rest of the game runs without it.
+"""
+
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # NNUE evaluation is optional
+    np = None
+
+from .core.constants import (
+    SQUARECOUNT,
+    BLACKPLAYER,
+    WHITEPLAYER,
+    PIECE_PAWN,
+    PIECE_KNIGHT,
+    PIECE_BISHOP,
+    PIECE_ROOK,
+    PIECE_QUEEN,
+    PIECE_KING,
+)
+
+MAGIC = b"NNUE"
+VERSION = 1
+_HEADER = struct.Struct("<4sIIII")  # magic, version, accumulator size, hidden layer sizes
+SQUARES = SQUARECOUNT * SQUARECOUNT
+FEATURE_PIECE_TYPES = [PIECE_PAWN, PIECE_KNIGHT, PIECE_BISHOP, PIECE_ROOK, PIECE_QUEEN]
+# planes per king square: each non-king piece type, once for the perspectives own pieces and once for the enemy's
+PLANES = 2 * len(FEATURE_PIECE_TYPES)
+FEATURE_COUNT = SQUARES * PLANES * SQUARES
+_TYPE_PLANES = {piece_type: 2 * index for index, piece_type in enumerate(FEATURE_PIECE_TYPES)}
+# accumulator values are clipped to [0, ACCUMULATOR_CLIP] and scaled to [0, 1] before the dense layers
+ACCUMULATOR_CLIP = 255
+# the network outputs pawns, the evaluation is in centipawns
+OUTPUT_SCALE = 100
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The NNUE evaluator needs NumPy, install it with 'pip install numpy'")
+
+
+def _team_id(piece) -> int:
+    return piece.color
+
+
+def _oriented(team_id: int, sq: int) -> int:
+    """
+    The square as seen by the team, the dark team sees the board with the rows flipped so both teams share weights.
+    """
+    return sq ^ ((SQUARECOUNT - 1) * SQUARECOUNT) if team_id == BLACKPLAYER else sq
+
+
+def feature_index(perspective: int, king_sq: int, piece, sq: int) -> int:
+    """
+    Returns the HalfKP feature index of a non-king piece on sq, seen by the team perspective whose king is on king_sq.
+    """
+    plane = _TYPE_PLANES[piece.type] + (_team_id(piece) != perspective)
+    return (_oriented(perspective, king_sq) * PLANES + plane) * SQUARES + _oriented(perspective, sq)
+
+
+class Network:
+    """
+    The weights of an NNUE network.
+
+    Args:
+        feature_weights (np.ndarray): int16 (FEATURE_COUNT, accumulator_size) first layer weights
+        feature_bias (np.ndarray): int16 (accumulator_size,) first layer bias
+        layers (list[tuple[np.ndarray, np.ndarray]]): float32 (weights, bias) of the dense layers, the first takes
+        2 * accumulator_size inputs and the last has one output
+
+    Attributes:
+        accumulator_size (int): The width of each teams accumulator
+    """
+
+    def __init__(self, feature_weights, feature_bias, layers):
+        _require_numpy()
+        self.feature_weights = feature_weights
+        self.feature_bias = feature_bias
+        self.layers = layers
+        self.accumulator_size: int = feature_bias.shape[0]
+
+    @classmethod
+    def random(cls, seed: int = 0, accumulator_size: int = 64, hidden_sizes: tuple[int, int] = (32, 32)) -> "Network":
+        """
+        Builds a network with random weights, for benchmarks and checks that do not depend on playing strength.
+        """
+        _require_numpy()
+        rng = np.random.default_rng(seed)
+        feature_weights = rng.integers(-32, 33, size=(FEATURE_COUNT, accumulator_size), dtype=np.int16)
+        feature_bias = rng.integers(0, 64, size=accumulator_size, dtype=np.int16)
+        layers = []
+        inputs = 2 * accumulator_size
+        for outputs in list(hidden_sizes) + [1]:
+            weights = rng.normal(0, 1 / np.sqrt(inputs), size=(inputs, outputs)).astype(np.float32)
+            layers.append((weights, np.zeros(outputs, dtype=np.float32)))
+            inputs = outputs
+        return cls(feature_weights, feature_bias, layers)
+
+    @classmethod
+    def load(cls, path: str) -> "Network":
+        """
+        Memory maps a network saved with save, pages are read from disk when their rows are first used.
+
+        Raises:
+            ValueError: If the file is not a network of this format
+        """
+        _require_numpy()
+        with open(path, "rb") as file:
+            magic, version, accumulator_size, hidden_1, hidden_2 = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} NNUE network")
+        offset = _HEADER.size
+        arrays = []
+        for dtype, shape in cls._array_layout(accumulator_size, hidden_1, hidden_2):
+            array = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+            arrays.append(array)
+            offset += array.nbytes
+        feature_weights, feature_bias, *dense = arrays
+        layers = [(dense[index], dense[index + 1]) for index in range(0, len(dense), 2)]
+        return cls(feature_weights, feature_bias, layers)
+
+    def save(self, path: str):
+        """
+        Writes the network to a file that load can memory map.
+        """
+        hidden_1 = self.layers[0][1].shape[0]
+        hidden_2 = self.layers[1][1].shape[0]
+        layout = self._array_layout(self.accumulator_size, hidden_1, hidden_2)
+        arrays = [self.feature_weights, self.feature_bias]
+        for weights, bias in self.layers:
+            arrays += [weights, bias]
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, self.accumulator_size, hidden_1, hidden_2))
+            for array, (dtype, shape) in zip(arrays, layout):
+                file.write(np.ascontiguousarray(array, dtype=dtype).reshape(shape).tobytes())
+
+    @staticmethod
+    def _array_layout(accumulator_size: int, hidden_1: int, hidden_2: int) -> list[tuple[str, tuple]]:
+        return [
+            ("<i2", (FEATURE_COUNT, accumulator_size)),
+            ("<i2", (accumulator_size,)),
+            ("<f4", (2 * accumulator_size, hidden_1)),
+            ("<f4", (hidden_1,)),
+            ("<f4", (hidden_1, hidden_2)),
+            ("<f4", (hidden_2,)),
+            ("<f4", (hidden_2, 1)),
+            ("<f4", (1,)),
+        ]
+
+    def forward(self, own_accumulator, enemy_accumulator) -> int:
+        """
+        Runs the dense layers on the two accumulators and returns the evaluation in centipawns for the first one's team.
+        """
+        inputs = np.concatenate((own_accumulator, enemy_accumulator))
+        values = np.clip(inputs, 0, ACCUMULATOR_CLIP).astype(np.float32) / ACCUMULATOR_CLIP
+        last = len(self.layers) - 1
+        for index, (weights, bias) in enumerate(self.layers):
+            values = values @ weights + bias
+            if index != last:
+                values = np.clip(values, 0.0, 1.0)
+        return int(values[0] * OUTPUT_SCALE)
+
+
+class NNUEEvaluation:
+    """
+    A drop-in replacement for Evaluation that scores positions with an NNUE network.
+
+    Assign one to board.evaluation once the board is set up; the board then reports every piece it places and lifts
+    through add and remove, which update the accumulators row by row.
+
+    Args:
+        network (Network): The network to evaluate with
+        board (BoardCore): The board being evaluated, its current position is loaded into the accumulators
+
+    Attributes:
+        accumulators (list[np.ndarray]): accumulators[team_id] is the int32 first layer output for that team
+        king_squares (list[int | None]): king_squares[team_id] is the square of the teams king, None while lifted
+        stale (list[bool]): stale[team_id] is True when the teams king moved and its accumulator must be refreshed
+        before the next score
+        refreshes (int): How many times an accumulator was recomputed from scratch
+    """
+
+    def __init__(self, network: Network, board):
+        self.network: Network = network
+        self.board = board
+        self.accumulators = [None, None]
+        self.king_squares: list[int | None] = [None, None]
+        self.stale: list[bool] = [True, True]
+        self.refreshes: int = 0
+        for row, rank in enumerate(board.struct):
+            for col, piece in enumerate(rank):
+                if piece is not None and piece.type == PIECE_KING:
+                    self.king_squares[_team_id(piece)] = row * SQUARECOUNT + col
+
+    def add(self, piece, row: int, col: int):
+        """
+        Switches on the features of a piece placed on the square (row, col).
+        """
+        self._update(piece, row * SQUARECOUNT + col, 1)
+
+    def remove(self, piece, row: int, col: int):
+        """
+        Switches off the features of a piece lifted from the square (row, col).
+        """
+        self._update(piece, row * SQUARECOUNT + col, -1)
+
+    def _update(self, piece, sq: int, sign: int):
+        if piece.type == PIECE_KING:
+            team_id = _team_id(piece)
+            self.king_squares[team_id] = sq if sign > 0 else None
+            self.stale[team_id] = True
+            return
+        weights = self.network.feature_weights
+        for perspective in (BLACKPLAYER, WHITEPLAYER):
+            if self.stale[perspective]:
+                continue
+            row = weights[feature_index(perspective, self.king_squares[perspective], piece, sq)]
+            if sign > 0:
+                self.accumulators[perspective] += row
+            else:
+                self.accumulators[perspective] -= row
+
+    def refresh(self, perspective: int):
+        """
+        Recomputes the accumulator of a team from the pieces on the board.
+        """
+        self.accumulators[perspective] = self.compute_accumulator(perspective)
+        self.stale[perspective] = False
+        self.refreshes += 1
+
+    def compute_accumulator(self, perspective: int):
+        """
+        Returns the accumulator of a team computed from scratch, the bias plus the rows of every active feature.
+        """
+        king_sq = self.king_squares[perspective]
+        indexes = [
+            feature_index(perspective, king_sq, piece, row * SQUARECOUNT + col)
+            for row, rank in enumerate(self.board.struct)
+            for col, piece in enumerate(rank)
+            if piece is not None and piece.type != PIECE_KING
+        ]
+        accumulator = self.network.feature_bias.astype(np.int32)
+        if indexes:
+            accumulator += self.network.feature_weights[indexes].sum(axis=0, dtype=np.int32)
+        return accumulator
+
+    def score(self, team_id: int) -> int:
+        """
+        Returns the evaluation in centipawns from the point of view of the given team.
+        """
+        for perspective in (BLACKPLAYER, WHITEPLAYER):
+            if self.stale[perspective]:
+                self.refresh(perspective)
+        return self.network.forward(self.accumulators[team_id], self.accumulators[1 - team_id])
+
+    def verify(self, board) -> int:
+        """
+        Checks the incrementally updated accumulators against a full refresh.
+
+        Returns:
+            int: How many accumulators were checked, stale ones are skipped
+
+        Raises:
+            AssertionError: If an up to date accumulator differs from its full refresh
+        """
+        checked = 0
+        for perspective in (BLACKPLAYER, WHITEPLAYER):
+            if self.stale[perspective]:
+                continue
+            if not np.array_equal(self.accumulators[perspective], self.compute_accumulator(perspective)):
+                raise AssertionError(f"Incremental accumulator of team {perspective} does not match a full refresh")
+            checked += 1
+        return checked
@@ -1,4 +1,4 @@
-from .constants import (
+from .core.constants import (
     BOARDPOSX,
     BOARDPOSY,
     BOARDSIDELENGTH,
@@ -6,7 +6,13 @@ from .constants import (
     BLACK,
     GREY,
     WHITE,
+    PIECE_ROOK,
+    PIECE_BISHOP,
+    PIECE_KNIGHT,
+    PIECE_QUEEN,
+    PIECE_NAMES,
 )
+from .sprites import SPRITE_CACHE
 import pygame
 
 
@@ -15,7 +21,7 @@ class PromotionMenu:
     Represents a simplisitic promotion menu used to upgrade pawns
 
     Args:
-        color (pygame.Color): The color of the piece that will be upgraded, i.e. Team color
+        color (int): The color code of the piece that will be upgraded, i.e. Team color
 
     Attributes:
         image_options (list[str]): A list containing strings for which piece a pawn can upgrade into and the color
@@ -28,8 +34,8 @@ class PromotionMenu:
         rect (pygame.Rect): Position and size of the board
     """
 
-    def __init__(self, color: pygame.Color):
-        self.color: pygame.Color = color
+    def __init__(self, color: int):
+        self.color: int = color
         self.image_options: list[str] = self._build_img_options()
         self.w: int = len(self.image_options) * SQUARESIZE
         self.h: int = SQUARESIZE
@@ -58,10 +64,10 @@ class PromotionMenu:
         else:
             raise TypeError(f"Invalid Color : {self.color}")
 
-        piece_types = ["rook", "bishop", "knight", "queen"]
+        piece_types = [PIECE_ROOK, PIECE_BISHOP, PIECE_KNIGHT, PIECE_QUEEN]
         options = []
         for piece in piece_types:
-            options.append(f"{piece}_{color_str}")
+            options.append(f"{PIECE_NAMES[piece]}_{color_str}")
         return options
 
     def get_valid_promotion_option(self, mouse_pos: tuple[int, int]) -> int | None:
@@ -94,20 +100,20 @@ class PromotionMenu:
         """
         Creates the basic surface of the promotion menu.
 
-        Assumes that the self.surface attribute and the corrersponding image file paths exist
+        Assumes that the self.surface attribute exists, the piece images are shared through SPRITE_CACHE
         """
         # we go through the board and for each square, we "blit" onto the board the current square.
         options_count = len(self.image_options)
         for i in range(options_count):
             square = pygame.Surface((SQUARESIZE, SQUARESIZE))
             square.fill(GREY)
-            img = pygame.image.load(f"./Assets/{self.image_options[i]}.png")
-            img = pygame.transform.smoothscale(img, (SQUARESIZE, SQUARESIZE))
+            img = SPRITE_CACHE.get(self.get_piece_type(i), self.color, SQUARESIZE)
             square.blit(img, (0, 0))
             self.surface.blit(square, (i * SQUARESIZE, 0))
 
-    def get_piece_type(self, promotion_option: int) -> str:
+    def get_piece_type(self, promotion_option: int) -> int:
         """
-        Returns the type of the piece as a str
+        Returns the type of the piece as a piece kind, e.g. PIECE_QUEEN
         """
-        return self.image_options[promotion_option].split(sep="_")[0]
+        name = self.image_options[promotion_option].split(sep="_")[0]
+        return next(kind for kind, kind_name in PIECE_NAMES.items() if kind_name == name)
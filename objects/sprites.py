@@ -0,0 +1,202 @@
+"""
+Piece images shared by everything that draws pieces.
+
+Each image is decoded from the Assets directory and scaled once per process, then handed out to every board and
+promotion menu that asks for it. Surfaces from the cache are shared and must not be drawn on.
+
+Decoding and scaling can be skipped entirely with a bundle built by tools.build_assets: every sprite pre-scaled to
+one size and stored as raw RGBA pixels in a single file. The cache memory maps the bundle and makes surfaces straight
+from its bytes. A bundle built for another size or from other images is stale and ignored, the images are then
+decoded as usual.
+"""
+
+import mmap
+import struct
+import zlib
+
+import pygame
+from .core.constants import (
+    PIECE_PAWN,
+    PIECE_KNIGHT,
+    PIECE_BISHOP,
+    PIECE_ROOK,
+    PIECE_QUEEN,
+    PIECE_KING,
+    PIECE_NAMES,
+    BLACK,
+    WHITE,
+)
+
+PIECE_TYPES = [PIECE_PAWN, PIECE_KNIGHT, PIECE_BISHOP, PIECE_ROOK, PIECE_QUEEN, PIECE_KING]
+COLOR_NAMES = {WHITE: "white", BLACK: "black"}
+SPRITE_BUNDLE_PATH = "./Assets/sprites.bundle"
+BUNDLE_MAGIC = b"SPRB"
+BUNDLE_VERSION = 1
+# magic, version, sprite size, sprite count, fingerprint of the source images
+_BUNDLE_HEADER = struct.Struct("<4sIIII")
+# sprites are stored in this order, PIECE_TYPES by COLOR_NAMES
+BUNDLE_SPRITES = [(piece_type, color) for piece_type in PIECE_TYPES for color in COLOR_NAMES]
+
+
+def asset_path(piece_type: int, color: int) -> str:
+    """
+    Returns the path of the image of a piece in the Assets directory.
+    """
+    return f"./Assets/{PIECE_NAMES[piece_type]}_{COLOR_NAMES[color]}.png"
+
+
+def assets_fingerprint(size: int) -> int:
+    """
+    A checksum of the source images and the sprite size, a bundle with a different one is stale.
+    """
+    checksum = zlib.crc32(size.to_bytes(4, "little"))
+    for piece_type, color in BUNDLE_SPRITES:
+        with open(asset_path(piece_type, color), "rb") as file:
+            checksum = zlib.crc32(file.read(), checksum)
+    return checksum
+
+
+def build_bundle(size: int, path: str = SPRITE_BUNDLE_PATH) -> int:
+    """
+    Decodes and scales every sprite to size x size pixels and writes them to a bundle file.
+
+    Returns:
+        int: The number of bytes written
+    """
+    with open(path, "wb") as file:
+        written = file.write(
+            _BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, size, len(BUNDLE_SPRITES), assets_fingerprint(size))
+        )
+        for piece_type, color in BUNDLE_SPRITES:
+            surface = pygame.image.load(asset_path(piece_type, color))
+            surface = pygame.transform.smoothscale(surface, (size, size))
+            written += file.write(pygame.image.tobytes(surface, "RGBA"))
+    return written
+
+
+class SpriteCache:
+    """
+    Scaled piece images keyed by (type, color, size), loaded on first use.
+
+    Images are converted to the display's pixel format with convert_alpha, which makes blitting them faster, when a
+    display mode has been set. Images loaded before that, e.g. by a headless tool, are kept as loaded.
+
+    Attributes:
+        surfaces (dict[tuple[int, int, int], pygame.Surface]): The loaded images
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that loaded an image
+        bundled (int): Images taken from a bundle by load_bundle
+    """
+
+    def __init__(self):
+        self.surfaces: dict[tuple[int, int, int], pygame.Surface] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.bundled: int = 0
+        self._bundle: mmap.mmap | None = None
+
+    def load_bundle(self, size: int, path: str = SPRITE_BUNDLE_PATH) -> bool:
+        """
+        Fills the cache with the sprites of a bundle built by build_bundle, without decoding any image.
+
+        Args:
+            size (int): The sprite size the game needs
+            path (str): The bundle file
+
+        Returns:
+            bool: False if the bundle is missing, unreadable, for another size or built from other images. Sprites
+            are then decoded from the images as they are asked for.
+        """
+        try:
+            with open(path, "rb") as file:
+                bundle = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # missing or unreadable, ValueError: the file is empty
+            return False
+        sprite_bytes = size * size * 4
+        header = _BUNDLE_HEADER.unpack_from(bundle) if len(bundle) >= _BUNDLE_HEADER.size else None
+        if (
+            header != (BUNDLE_MAGIC, BUNDLE_VERSION, size, len(BUNDLE_SPRITES), assets_fingerprint(size))
+            or len(bundle) != _BUNDLE_HEADER.size + len(BUNDLE_SPRITES) * sprite_bytes
+        ):
+            bundle.close()
+            return False
+        convert = pygame.display.get_surface() is not None
+        pixels = memoryview(bundle)
+        offset = _BUNDLE_HEADER.size
+        for piece_type, color in BUNDLE_SPRITES:
+            surface = pygame.image.frombuffer(pixels[offset : offset + sprite_bytes], (size, size), "RGBA")
+            if convert:
+                # converting copies the pixels, unconverted surfaces keep reading the mapped file
+                surface = surface.convert_alpha()
+            self.surfaces[(piece_type, color, size)] = surface
+            offset += sprite_bytes
+        self.bundled += len(BUNDLE_SPRITES)
+        del surface
+        pixels.release()
+        if convert:
+            bundle.close()
+        else:
+            self._bundle = bundle
+        return True
+
+    def get(self, piece_type: int, color: int, size: int) -> pygame.Surface:
+        """
+        Returns the image of a piece scaled to size x size pixels.
+
+        Args:
+            piece_type (int): The piece type, e.g. PIECE_QUEEN
+            color (int): The team color, WHITE or BLACK
+            size (int): The width and height of the image in pixels
+
+        Returns:
+            pygame.Surface: The shared image
+
+        Raises:
+            ValueError: If the color is not a team color
+        """
+        key = (piece_type, color, size)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        if color not in COLOR_NAMES:
+            raise ValueError(f"Invalid Color : {color}")
+        surface = pygame.image.load(asset_path(piece_type, color))
+        surface = pygame.transform.smoothscale(surface, (size, size))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self.surfaces[key] = surface
+        return surface
+
+    def clear(self):
+        """
+        Drops every image and resets the counters.
+        """
+        self.surfaces = {}
+        self.hits = 0
+        self.misses = 0
+        self.bundled = 0
+        self._bundle = None
+
+    def get_stats(self) -> dict[str, float]:
+        """
+        Returns the hit and miss counts, the hit rate, how many images came from a bundle and the number and pixel
+        memory of the cached images.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bundled": self.bundled,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "sprites": len(self.surfaces),
+            "bytes": sum(
+                surface.get_bytesize() * surface.get_width() * surface.get_height()
+                for surface in self.surfaces.values()
+            ),
+        }
+
+
+# the process-wide cache
+SPRITE_CACHE = SpriteCache()
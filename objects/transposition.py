@@ -0,0 +1,219 @@
+"""
+A fixed size transposition table keyed by Zobrist key.
+
+Entries live in one preallocated buffer of unsigned 64-bit words rather than a dict of Python objects, so memory use is
+set by size_mb up front and never grows. Each entry is two words, the full key and a packed data word, and entries are
+grouped in buckets of BUCKET_SIZE (64 bytes) that share one index.
+
+The key word is stored xor-ed with the data word, so an entry torn by two processes writing it at the same time over
+shared memory no longer matches its key and reads as a miss instead of returning another positions data.
+"""
+
+from .core.constants import SQUARECOUNT, PIECE_QUEEN, PIECE_ROOK, PIECE_BISHOP, PIECE_KNIGHT
+
+BOUND_EXACT = 1
+BOUND_LOWER = 2  # score is at least the stored score (fail high)
+BOUND_UPPER = 3  # score is at most the stored score (fail low)
+REPLACE_DEPTH = "depth"
+REPLACE_AGE = "age"
+BUCKET_SIZE = 4
+ENTRY_BYTES = 16
+MAX_SCORE = (1 << 19) - 1
+
+# data word layout, low bits first: move (15) | depth + 1 (8) | bound (2) | score + 2**19 (20) | generation (8)
+_MOVE_BITS, _DEPTH_SHIFT, _BOUND_SHIFT, _SCORE_SHIFT, _GENERATION_SHIFT = 15, 15, 23, 25, 45
+_PROMOTION_CODES = {None: 0, PIECE_QUEEN: 1, PIECE_ROOK: 2, PIECE_BISHOP: 3, PIECE_KNIGHT: 4}
+_PROMOTION_TYPES = {code: piece_type for piece_type, code in _PROMOTION_CODES.items()}
+
+
+def encode_move(from_row: int, from_col: int, to_row: int, to_col: int, promotion: int | None = None) -> int:
+    """
+    Packs a move into 15 bits: from square (6), to square (6) and promotion type (3).
+    """
+    from_sq = from_row * SQUARECOUNT + from_col
+    to_sq = to_row * SQUARECOUNT + to_col
+    return from_sq | (to_sq << 6) | (_PROMOTION_CODES[promotion] << 12)
+
+
+def decode_move(move: int) -> tuple[int, int, int, int, int | None]:
+    """
+    Unpacks a move made by encode_move into (from_row, from_col, to_row, to_col, promotion).
+    """
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    return (
+        from_sq // SQUARECOUNT,
+        from_sq % SQUARECOUNT,
+        to_sq // SQUARECOUNT,
+        to_sq % SQUARECOUNT,
+        _PROMOTION_TYPES[move >> 12],
+    )
+
+
+class TranspositionTable:
+    """
+    Bounded-memory transposition table with bucketed entries and a configurable replacement policy.
+
+    When a bucket is full, the "depth" policy replaces the entry with the lowest depth, counting entries from older
+    searches as shallower, and the "age" policy replaces the entry from the oldest search, shallowest first.
+    An entry for the same position is always updated in place.
+
+    Args:
+        size_mb (float): Memory for the entries in megabytes, rounded down to a power of two number of buckets
+        policy (str): REPLACE_DEPTH or REPLACE_AGE
+        buffer (writable buffer | None): Memory to keep the entries in, e.g. shared memory. Allocated if None.
+
+    Attributes:
+        bucket_count (int): Number of buckets, a power of two
+        entry_count (int): Number of entries, bucket_count * BUCKET_SIZE
+        generation (int): Counter of the current search, advanced by new_search and stored in entries as their age
+        probes, hits, stores, collisions (int): Counters reported by get_stats
+    """
+
+    def __init__(self, size_mb: float = 16, policy: str = REPLACE_DEPTH, buffer=None):
+        if policy not in (REPLACE_DEPTH, REPLACE_AGE):
+            raise ValueError(f"Invalid replacement policy : {policy}")
+        self.bucket_count: int = self._bucket_count(size_mb)
+        self.entry_count: int = self.bucket_count * BUCKET_SIZE
+        self.policy: str = policy
+        if buffer is None:
+            buffer = bytearray(self.entry_count * ENTRY_BYTES)
+        self._bytes = memoryview(buffer).cast("B")[: self.entry_count * ENTRY_BYTES]
+        self.table = self._bytes.cast("Q")
+        self.generation: int = 0
+        self.used: int = 0
+        self.probes: int = 0
+        self.hits: int = 0
+        self.stores: int = 0
+        self.collisions: int = 0
+
+    @staticmethod
+    def _bucket_count(size_mb: float) -> int:
+        bucket_count = 1
+        while bucket_count * 2 * BUCKET_SIZE * ENTRY_BYTES <= size_mb * 1024 * 1024:
+            bucket_count *= 2
+        return bucket_count
+
+    @staticmethod
+    def required_bytes(size_mb: float) -> int:
+        """
+        Returns the buffer size a table of size_mb needs, for callers that allocate the buffer themselves.
+        """
+        return TranspositionTable._bucket_count(size_mb) * BUCKET_SIZE * ENTRY_BYTES
+
+    def new_search(self):
+        """
+        Advances the generation so entries from earlier searches age and are replaced first.
+        """
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self):
+        """
+        Empties the table and resets the counters.
+        """
+        self._bytes[:] = bytes(len(self._bytes))
+        self.generation = 0
+        self.used = 0
+        self.probes = self.hits = self.stores = self.collisions = 0
+
+    def probe(self, key: int) -> tuple[int, int, int, int] | None:
+        """
+        Looks a position up.
+
+        Args:
+            key (int): The positions Zobrist key
+
+        Returns:
+            tuple[int, int, int, int] | None: (move, depth, bound, score) or None if the position is not stored.
+            move is an encoded move, 0 if no best move was stored.
+        """
+        self.probes += 1
+        table = self.table
+        start = (key & (self.bucket_count - 1)) * BUCKET_SIZE * 2
+        for slot in range(start, start + BUCKET_SIZE * 2, 2):
+            data = table[slot + 1]
+            if table[slot] ^ data == key:
+                if data:
+                    self.hits += 1
+                    return (
+                        data & ((1 << _MOVE_BITS) - 1),
+                        ((data >> _DEPTH_SHIFT) & 0xFF) - 1,
+                        (data >> _BOUND_SHIFT) & 0b11,
+                        ((data >> _SCORE_SHIFT) & 0xFFFFF) - (1 << 19),
+                    )
+        return None
+
+    def store(self, key: int, move: int, depth: int, bound: int, score: int):
+        """
+        Stores the result of searching a position.
+
+        Args:
+            key (int): The positions Zobrist key
+            move (int): The best move found, encoded with encode_move, or 0 if none. An existing move for the same
+            position is kept when 0 is given.
+            depth (int): The depth searched, 0 to 254
+            bound (int): BOUND_EXACT, BOUND_LOWER or BOUND_UPPER
+            score (int): The score, clamped to +-MAX_SCORE
+        """
+        self.stores += 1
+        table = self.table
+        generation = self.generation
+        start = (key & (self.bucket_count - 1)) * BUCKET_SIZE * 2
+        empty = None
+        victim = None
+        victim_rank = None
+        for slot in range(start, start + BUCKET_SIZE * 2, 2):
+            data = table[slot + 1]
+            if not data:
+                if empty is None:
+                    empty = slot
+                continue
+            if table[slot] ^ data == key:
+                if not move:
+                    move = data & ((1 << _MOVE_BITS) - 1)
+                victim = slot
+                break
+            entry_depth = (data >> _DEPTH_SHIFT) & 0xFF
+            age = (generation - (data >> _GENERATION_SHIFT)) & 0xFF
+            if self.policy == REPLACE_DEPTH:
+                rank = (entry_depth - 2 * age, -age)
+            else:
+                rank = (-age, entry_depth)
+            if victim_rank is None or rank < victim_rank:
+                victim, victim_rank = slot, rank
+        else:
+            if empty is not None:
+                victim = empty
+                self.used += 1
+            else:
+                self.collisions += 1
+        score = max(-MAX_SCORE, min(MAX_SCORE, score))
+        data = (
+            move
+            | ((depth + 1) << _DEPTH_SHIFT)
+            | (bound << _BOUND_SHIFT)
+            | ((score + (1 << 19)) << _SCORE_SHIFT)
+            | (generation << _GENERATION_SHIFT)
+        )
+        table[victim] = key ^ data
+        table[victim + 1] = data
+
+    def close(self):
+        """
+        Releases the views of the buffer, e.g. so shared memory can be closed. The table must not be used afterwards.
+        """
+        self.table.release()
+        self._bytes.release()
+
+    def get_stats(self) -> dict[str, float]:
+        """
+        Returns the hit rate (hits per probe), collision rate (stores that evicted another position, per store)
+        and fill level (fraction of entries in use), along with the size of the table.
+        """
+        return {
+            "size_mb": self.entry_count * ENTRY_BYTES / (1024 * 1024),
+            "entries": self.entry_count,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+            "collision_rate": self.collisions / self.stores if self.stores else 0.0,
+            "fill": self.used / self.entry_count,
+        }
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from objects.core.bitboard import BitBoardCore
+from objects.core.board import BoardCore
+from objects.core.fen import START_FEN, parse_fen
+from objects.move_picker import SearchHeuristics, staged_moves
+from objects.transposition import encode_move
+
+BACKENDS = [BoardCore, BitBoardCore]
+# pawns of both teams one step from promoting, with and without a capture
+PROMOTION_FENS = ["r3k3/1P6/8/8/8/8/6p1/4K2R w - - 0 1", "r3k3/1P6/8/8/8/8/6p1/4K2R b - - 0 1"]
+
+
+def load(fen, board_class):
+    board, dark_team, light_team, team = parse_fen(fen, board_class)
+    return board, team, dark_team if team is light_team else light_team
+
+
+def positions(board_class, games=4, plies=40, seed=0):
+    """
+    Yields the positions of a few random games, then the promotion positions.
+    """
+    rng = random.Random(seed)
+    for _ in range(games):
+        board, team, enemy = load(START_FEN, board_class)
+        for _ in range(plies):
+            moves = board.build_move_list(team, enemy)
+            if not moves:
+                break
+            yield board, team, enemy
+            piece, row, col, promotion = rng.choice(moves)
+            board.make_move(piece, row, col, team, promotion)
+            team, enemy = enemy, team
+    for fen in PROMOTION_FENS:
+        yield load(fen, board_class)
+
+
+def as_codes(moves):
+    return [encode_move(piece.row, piece.col, row, col, promotion) for piece, row, col, promotion in moves]
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_staged_moves_yield_every_legal_move_once(board_class):
+    heuristics = SearchHeuristics()
+    for board, team, enemy in positions(board_class):
+        expected = sorted(as_codes(board.build_move_list(team, enemy)))
+        assert sorted(as_codes(staged_moves(board, team, enemy))) == expected
+        hash_move = expected[len(expected) // 2]
+        staged = as_codes(staged_moves(board, team, enemy, hash_move, heuristics))
+        assert staged[0] == hash_move
+        assert sorted(staged) == expected
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_captures_only_yields_captures_and_promotions(board_class):
+    for board, team, enemy in positions(board_class):
+        expected = sorted(
+            as_codes(
+                move
+                for move in board.build_move_list(team, enemy)
+                if move[3] is not None or board.struct[move[1]][move[2]] is not None
+            )
+        )
+        assert sorted(as_codes(staged_moves(board, team, enemy, captures_only=True))) == expected
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_quiet_moves_are_generated_only_when_reached(board_class):
+    # 1. e4 d5, exd5 is the only capture
+    board, team, enemy = load("rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w - - 0 2", board_class)
+    requested = []
+    generate_legal_moves = board.generate_legal_moves
+
+    def recording(*args, captures=None, **kwargs):
+        requested.append(captures)
+        return generate_legal_moves(*args, captures=captures, **kwargs)
+
+    board.generate_legal_moves = recording
+    moves = staged_moves(board, team, enemy)
+    piece, row, col, _ = next(moves)
+    assert (piece.row, piece.col, row, col) == (4, 4, 3, 3)
+    assert False not in requested
+    assert list(moves)
+    assert False in requested
+    requested.clear()
+    list(staged_moves(board, team, enemy, captures_only=True))
+    assert False not in requested
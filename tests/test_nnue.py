@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from objects.core.bitboard import BitBoardCore
+from objects.core.board import BoardCore
+from objects.core.fen import START_FEN, parse_fen
+from objects.nnue import Network, NNUEEvaluation
+
+# pawns of both teams one step from promoting, and kings that can move
+PROMOTION_FEN = "r3k3/1P6/8/8/8/8/6p1/4K2R w - - 0 1"
+
+
+@pytest.mark.parametrize("board_class", [BoardCore, BitBoardCore])
+@pytest.mark.parametrize("fen", [START_FEN, PROMOTION_FEN])
+def test_incremental_accumulators_match_full_refresh(board_class, fen):
+    rng = random.Random(0)
+    board, dark_team, light_team, team = parse_fen(fen, board_class)
+    enemy = dark_team if team is light_team else light_team
+    evaluation = NNUEEvaluation(Network.random(), board)
+    board.evaluation = evaluation
+    evaluation.score(team.team_id)
+    checked = 0
+    for _ in range(40):
+        moves = board.build_move_list(team, enemy)
+        if not moves:
+            break
+        for piece, row, col, promotion in rng.sample(moves, min(len(moves), 4)):
+            record = board.make_move(piece, row, col, team, promotion)
+            checked += evaluation.verify(board)
+            evaluation.score(enemy.team_id)  # refreshes the accumulator of a team whose king moved
+            assert evaluation.verify(board) == 2
+            board.unmake_move(record)
+            checked += evaluation.verify(board)
+        piece, row, col, promotion = rng.choice(moves)
+        board.make_move(piece, row, col, team, promotion)
+        team, enemy = enemy, team
+    evaluation.score(team.team_id)
+    assert evaluation.verify(board) == 2
+    assert checked > 0
@@ -0,0 +1,19 @@
+import pytest
+
+from tools.perft import BACKENDS, SUITE_PATH, _load, perft, read_suite
+
+# deep enough to reach captures, promotions and checks in every suite position while keeping the suite fast
+MAX_DEPTH = 2
+SUITE = read_suite(SUITE_PATH)
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+@pytest.mark.parametrize("fen, expected", SUITE, ids=[fen.split()[0] for fen, _ in SUITE])
+def test_incremental_zobrist_keys_match_recomputed_keys(fen, expected, backend):
+    # check_hash raises AssertionError at the first move whose key differs from one computed from scratch
+    board, team, enemy = _load(fen, backend)
+    for depth in sorted(expected):
+        if depth > MAX_DEPTH:
+            break
+        assert perft(board, team, enemy, depth, check_hash=True) == expected[depth]
+    assert board.zobrist_key == board.compute_zobrist_key()
@@ -0,0 +1,44 @@
+import io
+
+import pytest
+
+from objects.core.bitboard import BitBoardCore
+from objects.core.board import BoardCore
+from objects.core.game import RESULT_BLACK, RESULT_UNFINISHED
+from objects.core.pgn import format_pgn, read_games, replay_game
+
+
+def read_one(text: str):
+    games = list(read_games(io.StringIO(text)))
+    assert len(games) == 1
+    return games[0]
+
+
+@pytest.mark.parametrize("board_class", [BoardCore, BitBoardCore])
+def test_replay_continues_after_threefold_repetition(board_class):
+    game = read_one("1. Nf3 Nf6 2. Ng1 Ng8 3. Nf3 Nf6 4. Ng1 Ng8 5. e4 *\n")
+    replayed = replay_game(game, board_class)
+    assert replayed.san_moves == game.moves
+    assert replayed.san_moves[-1] == "e4"
+
+
+def test_replay_rejects_move_after_checkmate():
+    game = read_one("1. f3 e5 2. g4 Qh4# 3. a3 0-1\n")
+    with pytest.raises(ValueError, match="ply 5"):
+        replay_game(game)
+
+
+def test_round_trip_keeps_moves_and_result():
+    text = format_pgn({"White": "a", "Black": "b"}, ["f3", "e5", "g4", "Qh4#"], RESULT_BLACK)
+    game = read_one(text)
+    assert game.tags["White"] == "a"
+    assert game.result == RESULT_BLACK
+    replayed = replay_game(game)
+    assert replayed.san_moves == ["f3", "e5", "g4", "Qh4#"]
+    assert replayed.get_result_code() == RESULT_BLACK
+
+
+def test_reader_skips_comments_variations_and_annotations():
+    game = read_one('[Event "x"]\n\n1. e4 {best by test} e5 (1... c5 2. Nf3) 2. Nf3 $1 Nc6 ; rest of line\n*\n')
+    assert game.moves == ["e4", "e5", "Nf3", "Nc6"]
+    assert game.result == RESULT_UNFINISHED
@@ -0,0 +1,83 @@
+import os
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+pygame = pytest.importorskip("pygame")
+
+from objects.core.constants import SELECTPIECE
+
+FRAMES = 50
+
+
+@pytest.fixture
+def game(monkeypatch):
+    # assets are loaded relative to the repository root
+    monkeypatch.chdir(Path(__file__).resolve().parent.parent)
+    import main as game_main
+
+    clock, board, dark_team, light_team = game_main.setup()
+    game_state = game_main.GameState(board, dark_team, light_team)
+    while game_state.get_state() != SELECTPIECE:
+        game_state.update_state()
+    yield game_state
+    game_state.worker.shutdown()
+    pygame.quit()
+
+
+@pytest.fixture
+def allocations(monkeypatch):
+    """
+    Counts every pygame.Surface created once the fixture is in use.
+    """
+    created = []
+
+    class CountingSurface(pygame.Surface):
+        def __init__(self, *args, **kwargs):
+            created.append(args)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(pygame, "Surface", CountingSurface)
+    return created
+
+
+def frame(game_state):
+    game_state.handle_events()
+    game_state.update_state()
+    game_state.render()
+
+
+def click(game_state, row, col):
+    game_state.set_mouse_pressed(True)
+    game_state.set_mouse_pos(*game_state.board.get_abs_pos(row, col))
+    frame(game_state)
+
+
+def test_idle_frames_allocate_no_surface(game, allocations):
+    frame(game)
+    allocations.clear()
+    for _ in range(FRAMES):
+        frame(game)
+    assert allocations == []
+
+
+def test_unchanged_highlights_allocate_no_surface_or_rebuild(game, allocations):
+    click(game, 6, 4)  # e2, the king's pawn
+    rebuilds = game.board.overlay_rebuilds
+    allocations.clear()
+    for _ in range(FRAMES):
+        frame(game)
+    assert allocations == []
+    assert game.board.overlay_rebuilds == rebuilds
+
+
+def test_highlight_changes_reuse_cached_tiles(game, allocations):
+    click(game, 6, 4)
+    click(game, 3, 0)  # an empty square, the selection is dropped
+    allocations.clear()
+    for _ in range(FRAMES):
+        click(game, 6, 4)
+        click(game, 3, 0)
+    assert allocations == []
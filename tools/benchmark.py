@@ -0,0 +1,797 @@
+"""
+Benchmarks for the rules engine. Run from the repository root (assets are loaded relative to it):
+
+    python -m tools.benchmark backends --games 20
+    python -m tools.benchmark pieces
+    python -m tools.benchmark tt --depth 4 --sizes 0.25 1 4
+    python -m tools.benchmark engine --move-time 0.5
+    python -m tools.benchmark smp --depth 4 --workers 1 2 4 8
+    python -m tools.benchmark ordering --depth 4
+    python -m tools.benchmark nnue --positions 200
+    python -m tools.benchmark core --games 50
+    python -m tools.benchmark sprites --games 20
+    python -m tools.benchmark startup --repeat 5
+    python -m tools.benchmark render --frames 600
+    python -m tools.benchmark idle --seconds 5
+    python -m tools.benchmark pgn --file games.pgn
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from objects.core.constants import (
+    PROMOTION_TYPES,
+    PIECE_QUEEN,
+    PIECE_NAMES,
+    WINDOWWIDTH,
+    WINDOWHEIGHT,
+    SQUARESIZE,
+    SQUARECOUNT,
+    DARKCOLOR,
+    LIGHTCOLOR,
+    BLACKPLAYER,
+    WHITEPLAYER,
+    BLACK,
+    WHITE,
+)
+from objects.core.board import BoardCore
+from objects.core.bitboard import BitBoardCore
+from objects.core.team import Team
+from objects.core.fen import START_FEN, parse_fen, board_to_fen
+from objects.core.game import Game
+from objects.core.pgn import read_games, replay_game
+from objects.engine import Engine, MATE_BOUND
+from objects.move_picker import SearchHeuristics
+from objects.nnue import Network, NNUEEvaluation
+from objects.transposition import TranspositionTable, BOUND_EXACT, REPLACE_DEPTH, REPLACE_AGE
+
+
+def new_game(board_class=BoardCore):
+    """
+    Returns (board, dark_team, light_team) set up in the starting position.
+    """
+    board = board_class(SQUARESIZE, SQUARECOUNT)
+    board.init_struct()
+    dark_team = Team(BLACKPLAYER, BLACK)
+    light_team = Team(WHITEPLAYER, WHITE)
+    board.set_pieces(dark_team.active_pieces, light_team.active_pieces)
+    return board, dark_team, light_team
+
+
+def play_move(board, team, enemy, piece, row, col, promotion=PIECE_QUEEN):
+    """
+    Applies a move the same way GameState does, including captures and promotions.
+    """
+    captured_piece = board.move_piece(piece, row, col)
+    if piece.is_promotable():
+        board.upgrade_piece(team, piece, promotion)
+    if captured_piece is not None:
+        enemy.active_pieces.remove(captured_piece)
+        enemy.captured_pieces.append(captured_piece)
+
+
+def _sorted_moves(move_dict):
+    return sorted((piece.get_grid_pos(), sorted(moves)) for piece, moves in move_dict.items())
+
+
+def bench_backends(games: int, max_plies: int, seed: int):
+    """
+    Plays random games on a BoardCore and a BitBoardCore side by side, checks that build_move_dict agrees on every
+    position and reports the time each backend spent at turn start (get_checking_pieces and build_move_dict).
+    """
+    rng = random.Random(seed)
+    timings = {BoardCore: 0.0, BitBoardCore: 0.0}
+    positions = 0
+    for _ in range(games):
+        boards = [new_game(BoardCore), new_game(BitBoardCore)]
+        for ply in range(max_plies):
+            move_dicts = []
+            for board, dark_team, light_team in boards:
+                team, enemy = (light_team, dark_team) if ply % 2 == 0 else (dark_team, light_team)
+                start = time.perf_counter()
+                # the work GameState does on entering STARTTURN
+                board.get_checking_pieces(team, enemy)
+                move_dicts.append(board.build_move_dict(team, enemy))
+                timings[type(board)] += time.perf_counter() - start
+            positions += 1
+            if _sorted_moves(move_dicts[0]) != _sorted_moves(move_dicts[1]):
+                raise AssertionError(f"Backends disagree after {ply} plies")
+            moves = [
+                (piece.get_grid_pos(), move)
+                for piece, piece_moves in move_dicts[0].items()
+                for move in piece_moves
+            ]
+            if not moves:
+                break
+            (from_row, from_col), (to_row, to_col) = rng.choice(moves)
+            for board, dark_team, light_team in boards:
+                team, enemy = (light_team, dark_team) if ply % 2 == 0 else (dark_team, light_team)
+                piece = board.get_square_contents(from_row, from_col)
+                play_move(board, team, enemy, piece, to_row, to_col)
+
+    print(f"{positions} positions, move lists identical")
+    for board_class, elapsed in timings.items():
+        print(
+            f"{board_class.__name__:>14}: {elapsed:8.3f}s total, {elapsed / positions * 1e3:8.3f}ms per turn start"
+        )
+    print(f"speedup: {timings[BoardCore] / timings[BitBoardCore]:.1f}x")
+
+
+def random_positions(count: int, seed: int, max_plies: int = 120):
+    """
+    Yields (board, team, enemy) for positions reached by playing random legal moves from the start position.
+    The same board object is reused, consume each position before asking for the next.
+    """
+    rng = random.Random(seed)
+    produced = 0
+    while produced < count:
+        board, dark_team, light_team = new_game()
+        for ply in range(max_plies):
+            team, enemy = (light_team, dark_team) if ply % 2 == 0 else (dark_team, light_team)
+            moves = [
+                (piece, move)
+                for piece, piece_moves in board.build_move_dict(team, enemy).items()
+                for move in piece_moves
+            ]
+            if not moves:
+                break
+            yield board, team, enemy
+            produced += 1
+            if produced == count:
+                return
+            piece, (row, col) = rng.choice(moves)
+            play_move(board, team, enemy, piece, row, col)
+
+
+def bench_pieces(positions: int, repeat: int, seed: int):
+    """
+    Times Piece.generate_valid_moves for every piece type over a set of random positions, and measures the memory of
+    a piece.
+    """
+    tracemalloc.start()
+    teams = [Team(WHITEPLAYER, WHITE) for _ in range(1000)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    piece_count = sum(len(team.active_pieces) for team in teams)
+    print(f"memory: {allocated / piece_count:.0f} bytes per piece, team lists included")
+    del teams
+    timings = {}
+    calls = {}
+    for board, team, enemy in random_positions(positions, seed):
+        for piece in team.get_active_pieces() + enemy.get_active_pieces():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                piece.generate_valid_moves(board)
+            elapsed = time.perf_counter() - start
+            timings[piece.type] = timings.get(piece.type, 0.0) + elapsed
+            calls[piece.type] = calls.get(piece.type, 0) + repeat
+    for piece_type in sorted(timings):
+        print(
+            f"{PIECE_NAMES[piece_type]:>7}: {timings[piece_type] / calls[piece_type] * 1e6:7.2f}us per call ({calls[piece_type]} calls)"
+        )
+
+
+def bench_tt(fen: str, depth: int, sizes: list[float], policy: str):
+    """
+    Walks the legal move tree of a position with tables of several sizes, probing and storing every node and skipping
+    subtrees already stored at sufficient depth, and reports each tables hit rate, collision rate and fill level.
+    """
+
+    def walk(board, team, enemy, remaining, table):
+        entry = table.probe(board.zobrist_key)
+        if entry is not None and entry[1] >= remaining:
+            return
+        if remaining > 0:
+            for piece, row, col, promotion in board.build_move_list(team, enemy):
+                record = board.make_move(piece, row, col, team, promotion)
+                walk(board, enemy, team, remaining - 1, table)
+                board.unmake_move(record)
+        table.store(board.zobrist_key, 0, remaining, BOUND_EXACT, 0)
+
+    for size_mb in sizes:
+        board, dark_team, light_team, team = parse_fen(fen)
+        enemy = dark_team if team is light_team else light_team
+        table = TranspositionTable(size_mb, policy)
+        start = time.perf_counter()
+        walk(board, team, enemy, depth, table)
+        elapsed = time.perf_counter() - start
+        stats = table.get_stats()
+        print(
+            f"{stats['size_mb']:8.3f}MB {stats['entries']:>9} entries: hit rate {stats['hit_rate']:6.1%}, "
+            f"collision rate {stats['collision_rate']:6.1%}, fill {stats['fill']:6.1%}, {elapsed:.2f}s"
+        )
+
+
+def bench_engine(positions: int, move_time: float, seed: int):
+    """
+    Searches random positions with the given time budget and reports how closely the engine keeps to it, along with
+    the depth reached and the search speed. Searches that stop early on a forced mate are counted separately.
+    """
+    fens = [board_to_fen(board, team) for board, team, _ in random_positions(positions, seed)]
+    engine = Engine(move_time)
+    ratios = []
+    mates = 0
+    depths = 0
+    nodes = 0
+    elapsed = 0.0
+    for fen in fens:
+        result = engine.search_fen(fen)
+        depths += result.depth
+        nodes += result.nodes
+        elapsed += result.elapsed
+        if abs(result.score) >= MATE_BOUND:
+            mates += 1
+        else:
+            ratios.append(result.elapsed / move_time)
+    within = sum(1 for ratio in ratios if abs(ratio - 1) <= 0.1)
+    print(f"{len(fens)} searches at {move_time}s, {mates} stopped early on a forced mate")
+    if ratios:
+        print(
+            f"time used / budget: min {min(ratios):.3f}, max {max(ratios):.3f}, "
+            f"{within}/{len(ratios)} within 10%"
+        )
+    print(f"average depth {depths / len(fens):.1f}, {nodes / elapsed:,.0f} nodes/s")
+
+
+def bench_smp(positions: int, depth: int, worker_counts: list[int], seed: int):
+    """
+    Measures the time to complete a fixed depth with several worker counts, starting every search from an empty
+    table, and reports the speedup over the first worker count. Starting the helper processes is not timed.
+    """
+    fens = [START_FEN] + [
+        board_to_fen(board, team) for board, team, _ in random_positions(positions - 1, seed)
+    ]
+    baseline = None
+    for workers in worker_counts:
+        engine = Engine(move_time=float("inf"), max_depth=1, workers=workers)
+        engine.search_fen(START_FEN)
+        engine.max_depth = depth
+        elapsed = 0.0
+        nodes = 0
+        for fen in fens:
+            engine.tt.clear()
+            result = engine.search_fen(fen)
+            elapsed += result.elapsed
+            nodes += result.nodes
+        engine.close()
+        if baseline is None:
+            baseline = elapsed
+        print(
+            f"{workers:>3} workers: depth {depth} on {len(fens)} positions in {elapsed:.2f}s, "
+            f"speedup {baseline / elapsed:.2f}x, {nodes / elapsed:,.0f} nodes/s"
+        )
+
+
+def bench_ordering(positions: int, depth: int, seed: int):
+    """
+    Counts the nodes searched to reach a fixed depth with the staged move ordering and with unordered
+    build_move_list moves, starting every search from an empty table.
+    """
+    fens = [START_FEN] + [
+        board_to_fen(board, team) for board, team, _ in random_positions(positions - 1, seed)
+    ]
+    totals = {}
+    for ordering in (False, True):
+        engine = Engine(move_time=float("inf"), max_depth=depth, ordering=ordering)
+        nodes = 0
+        elapsed = 0.0
+        for fen in fens:
+            engine.tt.clear()
+            engine.heuristics = SearchHeuristics()
+            result = engine.search_fen(fen)
+            nodes += result.nodes
+            elapsed += result.elapsed
+        totals[ordering] = nodes
+        name = "staged" if ordering else "unordered"
+        print(f"{name:>9}: depth {depth} on {len(fens)} positions, {nodes:,} nodes in {elapsed:.2f}s")
+    print(f"staged ordering searches {totals[True] / totals[False]:.1%} of the unordered nodes")
+
+
+def bench_nnue(positions: int, weights: str | None, seed: int):
+    """
+    Reports NNUE evaluations per second with incremental accumulator updates and with a full refresh per evaluation,
+    and checks after every move and every unmake that the incrementally updated accumulators equal a full refresh.
+    Uses a random network unless a weights file is given; the network is saved to and memory mapped from a temporary
+    file either way, so the load time is measured too.
+    """
+    network = Network.load(weights) if weights else Network.random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "network.nnue")
+        network.save(path)
+        start = time.perf_counter()
+        network = Network.load(path)
+        print(f"loaded {os.path.getsize(path) / (1024 * 1024):.1f}MB network in {time.perf_counter() - start:.4f}s")
+        rng = random.Random(seed)
+        make_time = forward_time = refresh_time = 0.0
+        evaluations = verified = 0
+        for board, team, enemy in random_positions(positions, seed):
+            evaluation = NNUEEvaluation(network, board)
+            saved, board.evaluation = board.evaluation, evaluation
+            evaluation.score(team.team_id)
+            moves = board.build_move_list(team, enemy)
+            for piece, row, col, promotion in rng.sample(moves, min(len(moves), 8)):
+                start = time.perf_counter()
+                record = board.make_move(piece, row, col, team, promotion)
+                make_time += time.perf_counter() - start
+                start = time.perf_counter()
+                incremental = evaluation.score(enemy.team_id)
+                forward_time += time.perf_counter() - start
+                verified += evaluation.verify(board)
+                start = time.perf_counter()
+                evaluation.refresh(BLACKPLAYER)
+                evaluation.refresh(WHITEPLAYER)
+                refresh_time += time.perf_counter() - start
+                if incremental != evaluation.score(enemy.team_id):
+                    raise AssertionError("Incremental and refreshed evaluations differ")
+                board.unmake_move(record)
+                verified += evaluation.verify(board)
+                evaluations += 1
+            board.evaluation = saved
+        del network
+    print(f"{evaluations} positions, accumulators matched a full refresh {verified} times")
+    print(
+        f"incremental updates: {evaluations / (make_time + forward_time):,.0f} evals/s, "
+        f"full refresh: {evaluations / (make_time + refresh_time + forward_time):,.0f} evals/s "
+        f"(make_move included in both)"
+    )
+    print(
+        f"per evaluation: make_move with updates {make_time / evaluations * 1e6:.1f}us, "
+        f"refreshing both accumulators {refresh_time / evaluations * 1e6:.1f}us, "
+        f"dense layers {forward_time / evaluations * 1e6:.1f}us"
+    )
+
+
+def _import_time(module: str) -> tuple[float, bool]:
+    """
+    Imports module in a fresh interpreter, returns the seconds it took and whether pygame was imported with it.
+    """
+    code = (
+        "import sys, time; start = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - start, 'pygame' in sys.modules)"
+    )
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout
+    seconds, pygame_loaded = output.split()
+    return float(seconds), pygame_loaded == "True"
+
+
+def _memory_per_game(build, games: int) -> float:
+    """
+    Returns the Python heap bytes allocated per game by calling build games times, keeping every game alive.
+    """
+    tracemalloc.start()
+    kept = [build() for _ in range(games)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return allocated / games
+
+
+def bench_core(games: int, repeat: int):
+    """
+    Compares the headless core with the pygame game built on top of it: import time in a fresh interpreter, and the
+    memory of a game in the start position. Pixel data lives outside the Python heap, so surfaces are counted
+    separately by their size.
+    """
+    for module in ("objects.core.game", "objects.game_state"):
+        results = [_import_time(module) for _ in range(repeat)]
+        seconds = statistics.median(result[0] for result in results)
+        print(f"import {module}: {seconds * 1000:.1f}ms (median of {repeat}), imports pygame: {results[0][1]}")
+
+    def core_game():
+        board, dark_team, light_team, _ = parse_fen(START_FEN)
+        return Game(board, dark_team, light_team)
+
+    start = time.perf_counter()
+    core_bytes = _memory_per_game(core_game, games)
+    elapsed = time.perf_counter() - start
+    print(f"core Game: {core_bytes / 1024:.1f}KB per game, no surfaces, {elapsed / games * 1000:.1f}ms to set up")
+
+    import pygame
+    from objects.game_board import GameBoard
+    from objects.sprites import SPRITE_CACHE
+
+    window = pygame.Surface((WINDOWWIDTH, WINDOWHEIGHT))
+
+    def rendered_game():
+        board = GameBoard(SQUARESIZE, SQUARECOUNT, DARKCOLOR, LIGHTCOLOR, window)
+        dark_team = Team(BLACKPLAYER, BLACK)
+        light_team = Team(WHITEPLAYER, WHITE)
+        board.set_pieces(dark_team.active_pieces, light_team.active_pieces)
+        return Game(board, dark_team, light_team)
+
+    start = time.perf_counter()
+    board_bytes = _memory_per_game(rendered_game, games)
+    elapsed = time.perf_counter() - start
+    board = rendered_game().board
+    surfaces = [board.surface, board.highlighted_surface, *SPRITE_CACHE.surfaces.values()]
+    pixel_bytes = sum(surface.get_bytesize() * surface.get_width() * surface.get_height() for surface in surfaces)
+    print(
+        f"GameBoard game: {board_bytes / 1024:.1f}KB per game plus {pixel_bytes / 1024:.0f}KB of surfaces, "
+        f"{elapsed / games * 1000:.1f}ms to set up"
+    )
+    # before the split every piece loaded and kept its own scaled image
+    piece_bytes = 32 * SQUARESIZE * SQUARESIZE * 4
+    print(f"per-piece images the pieces used to hold: {piece_bytes / 1024:.0f}KB per game")
+
+
+def bench_sprites(games: int, frames: int):
+    """
+    Times setting up the pygame side of a game (board, pieces drawn once, both promotion menus) with a cold and a
+    warm SPRITE_CACHE, against decoding every image per piece and per menu as the game used to, and compares blitting
+    converted and unconverted images.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from objects.game_board import GameBoard
+    from objects.promotion_menu import PromotionMenu
+    from objects.sprites import SPRITE_CACHE, SpriteCache, PIECE_TYPES, COLOR_NAMES
+
+    pygame.display.init()
+    window = pygame.display.set_mode((WINDOWWIDTH, WINDOWHEIGHT))
+
+    def set_up():
+        board = GameBoard(SQUARESIZE, SQUARECOUNT, DARKCOLOR, LIGHTCOLOR, window)
+        dark_team = Team(BLACKPLAYER, BLACK)
+        light_team = Team(WHITEPLAYER, WHITE)
+        board.set_pieces(dark_team.active_pieces, light_team.active_pieces)
+        board.draw_pieces()
+        PromotionMenu(BLACK)
+        PromotionMenu(WHITE)
+        return board
+
+    def decode_all():
+        # 32 pieces and 4 + 4 menu options, each decoded and scaled on its own
+        for piece in Team(BLACKPLAYER, BLACK).active_pieces + Team(WHITEPLAYER, WHITE).active_pieces:
+            SpriteCache().get(piece.type, piece.color, SQUARESIZE)
+        for color in (BLACK, WHITE):
+            for piece_type in PROMOTION_TYPES:
+                SpriteCache().get(piece_type, color, SQUARESIZE)
+
+    SPRITE_CACHE.clear()
+    start = time.perf_counter()
+    board = set_up()
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(games):
+        set_up()
+    warm = (time.perf_counter() - start) / games
+    start = time.perf_counter()
+    for _ in range(games):
+        decode_all()
+    uncached = (time.perf_counter() - start) / games
+    print(f"game setup: cold cache {cold * 1000:.1f}ms, warm cache {warm * 1000:.1f}ms, "
+          f"decoding per piece {uncached * 1000:.1f}ms of image loading alone")
+    stats = SPRITE_CACHE.get_stats()
+    print(
+        f"cache: {stats['sprites']} sprites, {stats['bytes'] / 1024:.0f}KB shared, {stats['hits']} hits, "
+        f"{stats['misses']} misses; decoding per piece kept {40 * SQUARESIZE * SQUARESIZE * 4 / 1024:.0f}KB per game"
+    )
+
+    for label, convert in (("converted", True), ("unconverted", False)):
+        SPRITE_CACHE.clear()
+        if not convert:
+            for piece_type in PIECE_TYPES:
+                for color in COLOR_NAMES:
+                    surface = pygame.image.load(f"./Assets/{piece_type}_{COLOR_NAMES[color]}.png")
+                    SPRITE_CACHE.surfaces[(piece_type, color, SQUARESIZE)] = pygame.transform.smoothscale(
+                        surface, (SQUARESIZE, SQUARESIZE)
+                    )
+        board.draw_pieces()
+        start = time.perf_counter()
+        for _ in range(frames):
+            board.draw_pieces()
+        elapsed = time.perf_counter() - start
+        print(f"draw_pieces with {label} sprites: {elapsed / frames * 1000:.3f}ms per frame")
+    pygame.display.quit()
+
+
+def _time_to_first_frame(bundle: str | None) -> float:
+    """
+    Starts the game as main.py does in a fresh interpreter and returns the seconds until its first frame is on the
+    display, interpreter startup included.
+    """
+    code = (
+        "import os; os.environ.setdefault('SDL_VIDEODRIVER', 'dummy'); "
+        "import pygame, main; "
+        f"main.SPRITE_BUNDLE = {bundle!r}; "
+        "clock, board, dark_team, light_team = main.setup(); "
+        "game_state = main.GameState(board, dark_team, light_team); "
+        "game_state.render(); pygame.display.update(); print('frame', flush=True); "
+        "game_state.worker.shutdown()"
+    )
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    start = time.perf_counter()
+    with subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True, env=env) as process:
+        line = process.stdout.readline()
+        elapsed = time.perf_counter() - start
+    if line.strip() != "frame":
+        raise RuntimeError("The game did not draw its first frame")
+    return elapsed
+
+
+def bench_startup(repeat: int):
+    """
+    Time to the first frame of main.py with the PNG images decoded at startup and with a sprite bundle.
+    """
+    from objects.sprites import build_bundle
+
+    with tempfile.TemporaryDirectory() as directory:
+        bundle = os.path.join(directory, "sprites.bundle")
+        build_bundle(SQUARESIZE, bundle)
+        for label, path in (("decoding PNG images", None), ("memory mapped bundle", bundle)):
+            times = [_time_to_first_frame(path) for _ in range(repeat)]
+            print(f"{label}: {statistics.median(times) * 1000:.0f}ms to first frame (median of {repeat})")
+
+
+def bench_render(frames: int, seconds: float):
+    """
+    Frame time and idle CPU use of the game loop drawing only the squares that changed, against redrawing and
+    updating the whole window every frame as the game used to. Measured at the start position, with and without a
+    selected piece's moves highlighted. Then counts the surfaces allocated by idle frames and by highlight changes,
+    which reuse the cached highlight tiles and overlay; tests/test_render.py fails if either allocates.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from objects.core.constants import SELECTPIECE
+    import main as game_main
+
+    clock, board, dark_team, light_team = game_main.setup()
+    game_state = game_main.GameState(board, dark_team, light_team)
+    while game_state.get_state() != SELECTPIECE:
+        game_state.update_state()
+
+    def frame(full: bool):
+        game_state.handle_events()
+        game_state.update_state()
+        if full:
+            board.invalidate()
+            game_state.render()
+            pygame.display.update()
+        else:
+            dirty_rects = game_state.render()
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+
+    for label in ("start position", "piece selected"):
+        if label == "piece selected":
+            # e2, the king's pawn
+            game_state.set_mouse_pressed(True)
+            game_state.set_mouse_pos(*board.get_abs_pos(6, 4))
+            frame(False)
+        for mode, full in (("full redraw", True), ("dirty squares", False)):
+            frame(full)
+            start = time.perf_counter()
+            for _ in range(frames):
+                frame(full)
+            elapsed = (time.perf_counter() - start) / frames
+            start, cpu = time.perf_counter(), time.process_time()
+            while time.perf_counter() - start < seconds:
+                frame(full)
+                clock.tick(game_main.FPS)
+            usage = (time.process_time() - cpu) / (time.perf_counter() - start)
+            print(f"{label}, {mode}: {elapsed * 1000:.3f}ms per frame, {usage:.1%} CPU idle at {game_main.FPS} FPS")
+
+    # count every pygame.Surface created while idling and while selecting and deselecting the pawn
+    allocations = 0
+    surface_type = pygame.Surface
+
+    class CountingSurface(surface_type):
+        def __init__(self, *args, **kwargs):
+            nonlocal allocations
+            allocations += 1
+            super().__init__(*args, **kwargs)
+
+    def click(row: int, col: int):
+        game_state.set_mouse_pressed(True)
+        game_state.set_mouse_pos(*board.get_abs_pos(row, col))
+        frame(False)
+
+    rebuilds = board.overlay_rebuilds
+    pygame.Surface = CountingSurface
+    try:
+        for _ in range(frames):
+            frame(False)
+        idle_allocations = allocations
+        with contextlib.redirect_stdout(io.StringIO()):  # the game reports every dropped selection
+            for _ in range(frames):
+                click(3, 0)  # an empty square, the selection is dropped
+                click(6, 4)
+    finally:
+        pygame.Surface = surface_type
+    print(
+        f"surfaces allocated: {idle_allocations / frames:.2f} per idle frame, "
+        f"{(allocations - idle_allocations) / (2 * frames):.2f} per highlight change; "
+        f"{board.overlay_rebuilds - rebuilds} overlay rebuilds for {2 * frames} changes"
+    )
+    game_state.worker.shutdown()
+    pygame.quit()
+
+
+def bench_idle(seconds: float):
+    """
+    CPU use of the game loop of main.py while a human player is to move, polling at FPS against the event-driven
+    loop that sleeps until the next event.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from objects.core.constants import SELECTPIECE
+    import main as game_main
+
+    clock, board, dark_team, light_team = game_main.setup()
+    game_state = game_main.GameState(board, dark_team, light_team)
+    while game_state.get_state() != SELECTPIECE:
+        game_state.update_state()
+    event_driven = game_main.EVENT_DRIVEN
+    try:
+        for mode, driven in (("polling at FPS", False), ("event-driven", True)):
+            game_main.EVENT_DRIVEN = driven
+            passes = 0
+            start, cpu = time.perf_counter(), time.process_time()
+            while time.perf_counter() - start < seconds:
+                game_main.run_frame(game_state, clock)
+                passes += 1
+            elapsed = time.perf_counter() - start
+            usage = (time.process_time() - cpu) / elapsed
+            print(f"{mode}: {usage:.2%} CPU, {passes / elapsed:.1f} loop passes per second")
+    finally:
+        game_main.EVENT_DRIVEN = event_driven
+    game_state.worker.shutdown()
+    pygame.quit()
+
+
+def _write_selfplay_pgn(path: str, games: int, seed: int):
+    """
+    Writes games random against random self-play games to a PGN file.
+    """
+    from tools.selfplay import play_game, record_to_pgn
+
+    with open(path, "w", encoding="utf-8") as file:
+        for index in range(games):
+            file.write(record_to_pgn(play_game("random", "random", seed + index)))
+
+
+def bench_pgn(path: str | None, games: int, backend: str, seed: int):
+    """
+    Reading speed of a PGN file: parsing alone, then parsing and replaying every game through the rules, which
+    validates it. The peak Python heap while parsing shows that memory does not grow with the file. Without a file,
+    games self-play games are written to a temporary one first.
+    """
+    board_class = {"list": BoardCore, "bitboard": BitBoardCore}[backend]
+    with contextlib.ExitStack() as stack:
+        if path is None:
+            path = stack.enter_context(tempfile.TemporaryDirectory()) + "/selfplay.pgn"
+            start = time.perf_counter()
+            _write_selfplay_pgn(path, games, seed)
+            print(f"wrote {games} self-play games in {time.perf_counter() - start:.1f}s")
+        megabytes = os.path.getsize(path) / 1024**2
+
+        start = time.perf_counter()
+        with open(path, encoding="utf-8") as file:
+            parsed = plies = 0
+            for game in read_games(file):
+                parsed += 1
+                plies += len(game.moves)
+        elapsed = time.perf_counter() - start
+        # traced separately, tracing slows parsing down several times
+        tracemalloc.start()
+        with open(path, encoding="utf-8") as file:
+            for game in read_games(file):
+                pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"parse: {parsed} games, {plies} plies, {megabytes:.1f}MB in {elapsed:.2f}s: "
+            f"{parsed / elapsed:,.0f} games/s, {megabytes / elapsed:.1f}MB/s, peak heap {peak / 1024:.0f}KB"
+        )
+
+        start = time.perf_counter()
+        valid = invalid = 0
+        with open(path, encoding="utf-8") as file:
+            for game in read_games(file):
+                try:
+                    replay_game(game, board_class)
+                    valid += 1
+                except ValueError as error:
+                    invalid += 1
+                    if invalid <= 5:
+                        print(f"game {valid + invalid} ({game.tags.get('White')} - {game.tags.get('Black')}): {error}")
+        elapsed = time.perf_counter() - start
+        print(
+            f"parse and replay ({backend}): {valid} valid, {invalid} invalid in {elapsed:.2f}s: "
+            f"{(valid + invalid) / elapsed:,.0f} games/s, {plies / elapsed:,.0f} plies/s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rules engine benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    backends = subparsers.add_parser("backends", help="compare BoardCore and BitBoardCore")
+    backends.add_argument("--games", type=int, default=10)
+    backends.add_argument("--plies", type=int, default=120)
+    backends.add_argument("--seed", type=int, default=0)
+    pieces = subparsers.add_parser("pieces", help="time generate_valid_moves per piece type")
+    pieces.add_argument("--positions", type=int, default=200)
+    pieces.add_argument("--repeat", type=int, default=20)
+    pieces.add_argument("--seed", type=int, default=0)
+    tt = subparsers.add_parser("tt", help="transposition table statistics at several sizes")
+    tt.add_argument("--fen", default=START_FEN)
+    tt.add_argument("--depth", type=int, default=4)
+    tt.add_argument("--sizes", type=float, nargs="+", default=[0.0625, 0.25, 1, 4])
+    tt.add_argument("--policy", choices=[REPLACE_DEPTH, REPLACE_AGE], default=REPLACE_DEPTH)
+    engine = subparsers.add_parser("engine", help="time budget accuracy of the computer player")
+    engine.add_argument("--positions", type=int, default=20)
+    engine.add_argument("--move-time", type=float, default=0.5)
+    engine.add_argument("--seed", type=int, default=0)
+    smp = subparsers.add_parser("smp", help="time to depth of the parallel search by worker count")
+    smp.add_argument("--positions", type=int, default=8)
+    smp.add_argument("--depth", type=int, default=4)
+    smp.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    smp.add_argument("--seed", type=int, default=0)
+    ordering = subparsers.add_parser("ordering", help="nodes to depth with and without move ordering")
+    ordering.add_argument("--positions", type=int, default=10)
+    ordering.add_argument("--depth", type=int, default=4)
+    ordering.add_argument("--seed", type=int, default=0)
+    nnue = subparsers.add_parser("nnue", help="NNUE evaluation speed and incremental update check")
+    nnue.add_argument("--positions", type=int, default=200)
+    nnue.add_argument("--weights", help="a network file, a random network if omitted")
+    nnue.add_argument("--seed", type=int, default=0)
+    core = subparsers.add_parser("core", help="import time and memory of the headless core against the pygame game")
+    core.add_argument("--games", type=int, default=50)
+    core.add_argument("--repeat", type=int, default=5)
+    sprites = subparsers.add_parser("sprites", help="game setup and drawing with the shared sprite cache")
+    sprites.add_argument("--games", type=int, default=20)
+    sprites.add_argument("--frames", type=int, default=500)
+    startup = subparsers.add_parser("startup", help="time to the first frame with and without the sprite bundle")
+    startup.add_argument("--repeat", type=int, default=5)
+    render = subparsers.add_parser("render", help="frame time and idle CPU of dirty square rendering")
+    render.add_argument("--frames", type=int, default=600)
+    render.add_argument("--seconds", type=float, default=3.0)
+    idle = subparsers.add_parser("idle", help="CPU use of the game loop while waiting for a human move")
+    idle.add_argument("--seconds", type=float, default=5.0)
+    pgn = subparsers.add_parser("pgn", help="PGN parsing and validation throughput")
+    pgn.add_argument("--file", help="a PGN file, self-play games are generated if omitted")
+    pgn.add_argument("--games", type=int, default=1000, help="how many games to generate")
+    pgn.add_argument("--backend", choices=["list", "bitboard"], default="list")
+    pgn.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.command == "backends":
+        bench_backends(args.games, args.plies, args.seed)
+    elif args.command == "pieces":
+        bench_pieces(args.positions, args.repeat, args.seed)
+    elif args.command == "tt":
+        bench_tt(args.fen, args.depth, args.sizes, args.policy)
+    elif args.command == "engine":
+        bench_engine(args.positions, args.move_time, args.seed)
+    elif args.command == "smp":
+        bench_smp(args.positions, args.depth, args.workers, args.seed)
+    elif args.command == "ordering":
+        bench_ordering(args.positions, args.depth, args.seed)
+    elif args.command == "nnue":
+        bench_nnue(args.positions, args.weights, args.seed)
+    elif args.command == "core":
+        bench_core(args.games, args.repeat)
+    elif args.command == "sprites":
+        bench_sprites(args.games, args.frames)
+    elif args.command == "startup":
+        bench_startup(args.repeat)
+    elif args.command == "render":
+        bench_render(args.frames, args.seconds)
+    elif args.command == "idle":
+        bench_idle(args.seconds)
+    elif args.command == "pgn":
+        bench_pgn(args.file, args.games, args.backend, args.seed)
+
+
+if __name__ == "__main__":
+    main()
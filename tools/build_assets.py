@@ -0,0 +1,34 @@
+"""
+Pre-renders every piece sprite at the games square size into one raw-pixel bundle, which the game memory maps at
+startup instead of decoding and scaling the PNG images. Run from the repository root after changing an image or
+SQUARESIZE (a stale bundle is ignored, so forgetting only costs startup time):
+
+    python -m tools.build_assets
+    python -m tools.build_assets --size 64 --output /tmp/sprites.bundle
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from objects.core.constants import SQUARESIZE
+from objects.sprites import SPRITE_BUNDLE_PATH, BUNDLE_SPRITES, build_bundle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the sprite bundle")
+    parser.add_argument("--size", type=int, default=SQUARESIZE, help="sprite size in pixels, defaults to SQUARESIZE")
+    parser.add_argument("--output", default=SPRITE_BUNDLE_PATH)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    written = build_bundle(args.size, args.output)
+    print(
+        f"wrote {len(BUNDLE_SPRITES)} sprites of {args.size}x{args.size} to {args.output} "
+        f"({written / 1024:.0f}KB) in {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
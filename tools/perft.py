@@ -0,0 +1,180 @@
+"""
+Perft: counts the leaf nodes of the legal move tree to a fixed depth, to check move generation against known counts
+and to measure its speed. Run from the repository root (assets are loaded relative to it):
+
+    python -m tools.perft --depth 4
+    python -m tools.perft --fen "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1" --depth 5 --divide --workers 8
+    python -m tools.perft --suite --max-depth 3 --backend bitboard
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from objects.core.constants import SQUARECOUNT, PIECE_KNIGHT, PIECE_NAMES
+from objects.core.board import BoardCore
+from objects.core.bitboard import BitBoardCore
+from objects.core.fen import START_FEN, parse_fen
+from objects.core.piece import Piece
+from objects.core.team import Team
+
+BACKENDS = {"list": BoardCore, "bitboard": BitBoardCore}
+SUITE_PATH = os.path.join(os.path.dirname(__file__), "perft_suite.epd")
+
+
+def move_name(piece: Piece, row: int, col: int, promotion: int | None) -> str:
+    """
+    Names a move in coordinate notation, e.g. e2e4 or a7a8q.
+    """
+    name = f"{chr(ord('a') + piece.col)}{SQUARECOUNT - piece.row}{chr(ord('a') + col)}{SQUARECOUNT - row}"
+    if promotion is not None:
+        name += "n" if promotion == PIECE_KNIGHT else PIECE_NAMES[promotion][0]
+    return name
+
+
+def perft(board: BoardCore, team: Team, enemy: Team, depth: int, check_hash: bool = False) -> int:
+    """
+    Counts the leaf nodes of the legal move tree of the given depth, team to move.
+
+    With check_hash, the incrementally updated Zobrist key is compared with one computed from scratch after every
+    move made and taken back.
+    """
+    moves = board.build_move_list(team, enemy)
+    if depth <= 1 and not check_hash:
+        return len(moves) if depth == 1 else 1
+    if depth == 0:
+        return 1
+    nodes = 0
+    for piece, row, col, promotion in moves:
+        record = board.make_move(piece, row, col, team, promotion)
+        if check_hash:
+            _check_hash(board)
+        nodes += perft(board, enemy, team, depth - 1, check_hash)
+        board.unmake_move(record)
+        if check_hash:
+            _check_hash(board)
+    return nodes
+
+
+def _check_hash(board: BoardCore):
+    expected = board.compute_zobrist_key()
+    if board.zobrist_key != expected:
+        raise AssertionError(f"Incremental Zobrist key {board.zobrist_key:#x} != recomputed {expected:#x}")
+
+
+def _load(fen: str, backend: str) -> tuple[BoardCore, Team, Team]:
+    board, dark_team, light_team, team = parse_fen(fen, BACKENDS[backend])
+    enemy = dark_team if team is light_team else light_team
+    return board, team, enemy
+
+
+def _divide_worker(fen: str, backend: str, name: str, depth: int, check_hash: bool) -> tuple[str, int]:
+    board, team, enemy = _load(fen, backend)
+    for piece, row, col, promotion in board.build_move_list(team, enemy):
+        if move_name(piece, row, col, promotion) == name:
+            board.make_move(piece, row, col, team, promotion)
+            return name, perft(board, enemy, team, depth - 1, check_hash)
+    raise ValueError(f"{name} is not a legal move in {fen}")
+
+
+def divide(
+    fen: str, depth: int, backend: str = "list", workers: int = 1, check_hash: bool = False
+) -> dict[str, int]:
+    """
+    Returns the perft count below each root move. With more than one worker the root moves are
+    counted in parallel, each worker rebuilding the position from the FEN string.
+    """
+    board, team, enemy = _load(fen, backend)
+    names = [move_name(*move) for move in board.build_move_list(team, enemy)]
+    if depth <= 1:
+        return {name: 1 for name in names}
+    if workers <= 1:
+        return dict(_divide_worker(fen, backend, name, depth, check_hash) for name in names)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_divide_worker, fen, backend, name, depth, check_hash) for name in names]
+        return dict(future.result() for future in futures)
+
+
+def run(fen: str, depth: int, backend: str, workers: int, show_divide: bool, check_hash: bool = False) -> int:
+    """
+    Runs perft on one position, printing the count, the time taken and the nodes per second.
+    """
+    start = time.perf_counter()
+    if show_divide or workers > 1:
+        counts = divide(fen, depth, backend, workers, check_hash)
+        nodes = sum(counts.values())
+    else:
+        board, team, enemy = _load(fen, backend)
+        counts = None
+        nodes = perft(board, team, enemy, depth, check_hash)
+    elapsed = time.perf_counter() - start
+    if show_divide:
+        for name in sorted(counts):
+            print(f"{name}: {counts[name]}")
+    print(f"depth {depth}: {nodes} nodes in {elapsed:.3f}s ({nodes / elapsed:,.0f} nodes/s)")
+    return nodes
+
+
+def read_suite(path: str) -> list[tuple[str, dict[int, int]]]:
+    """
+    Reads an EPD style suite of "<FEN> ;D1 <nodes> ;D2 <nodes> ..." lines, skipping blanks and # comments.
+    """
+    suite = []
+    with open(path) as suite_file:
+        for line in suite_file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fen, *fields = [field.strip() for field in line.split(";")]
+            expected = {}
+            for field in fields:
+                depth, nodes = field.split()
+                expected[int(depth[1:])] = int(nodes)
+            suite.append((fen, expected))
+    return suite
+
+
+def run_suite(path: str, max_depth: int, backend: str, workers: int, check_hash: bool = False) -> bool:
+    """
+    Runs every position of a suite up to max_depth, returns True if every count matched.
+    """
+    passed = True
+    total_nodes = 0
+    start = time.perf_counter()
+    for fen, expected in read_suite(path):
+        print(fen)
+        for depth in sorted(expected):
+            if depth > max_depth:
+                break
+            nodes = run(fen, depth, backend, workers, False, check_hash)
+            total_nodes += nodes
+            if nodes != expected[depth]:
+                print(f"  FAIL: expected {expected[depth]}")
+                passed = False
+    elapsed = time.perf_counter() - start
+    print(f"{'passed' if passed else 'FAILED'}: {total_nodes} nodes in {elapsed:.3f}s ({total_nodes / elapsed:,.0f} nodes/s)")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count leaf nodes of the legal move tree")
+    parser.add_argument("--fen", default=START_FEN, help="position to search, defaults to the start position")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--divide", action="store_true", help="print the count below each root move")
+    parser.add_argument("--workers", type=int, default=1, help="processes to split the root moves across")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="list")
+    parser.add_argument("--suite", nargs="?", const=SUITE_PATH, help="run a reference suite instead of one position")
+    parser.add_argument("--max-depth", type=int, default=3, help="deepest suite entries to run")
+    parser.add_argument(
+        "--check-hash", action="store_true", help="verify the incremental Zobrist key against a full recompute"
+    )
+    args = parser.parse_args()
+    if args.suite:
+        sys.exit(0 if run_suite(args.suite, args.max_depth, args.backend, args.workers, args.check_hash) else 1)
+    run(args.fen, args.depth, args.backend, args.workers, args.divide, args.check_hash)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Self-play: plays batches of games between move choosers without a window, spread over a process pool, and writes each
+game to a JSON lines file as soon as it finishes. Run from the repository root:
+
+    python -m tools.selfplay --games 1000 --white random --black greedy --out games.jsonl
+    python -m tools.selfplay --games 10000 --out games.pgn
+    python -m tools.selfplay --games 100 --white engine:2 --black engine:3 --random-plies 4 --positions --seed 7
+
+Move choosers:
+    random      a uniformly random legal move
+    greedy      the move with the best static evaluation one ply ahead, ties broken at random
+    engine:N    the computer player's search to a fixed depth of N plies
+    engine:depth=N,time=S,tt=MB,ordering=0,nnue=PATH
+                the search configured by options, any of: its depth, a time budget in seconds per move, the
+                transposition table size, move ordering on (1) or off (0) and an NNUE network file
+
+Every game is played through the core Game, so the rules are those of the board: build_move_dict finds the legal
+moves, move_piece and upgrade_piece play them. Game i of a run is seeded with seed + i, and the seed is stored with
+the game, so any game can be replayed alone with --games 1 --seed <its seed>. Engines choose without randomness,
+--random-plies opens every game with random moves so games between engines differ.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from objects.core.constants import PIECE_PAWN, PROMOTION_TYPES, WHITEPLAYER
+from objects.core.board import BoardCore
+from objects.core.fen import START_FEN, parse_fen, board_to_fen
+from objects.core.game import Game, RESULT_WHITE, RESULT_BLACK, RESULT_DRAW
+from objects.core.pgn import format_pgn
+from objects.core.piece import Piece
+from objects.engine import Engine, MAX_DEPTH
+from objects.nnue import Network
+from tools.perft import BACKENDS, move_name
+
+# games that reach this many plies are drawn, the rules have no fifty-move rule
+MAX_PLIES = 300
+
+
+def expand_moves(
+    board: BoardCore, move_dict: dict[Piece, list[tuple[int, int]]]
+) -> list[tuple[Piece, int, int, int | None]]:
+    """
+    Flattens a move dictionary into (piece, row, col, promotion) moves like BoardCore.build_move_list, a pawn move
+    onto the last rank appearing once per promotion type. The moves are sorted by squares, so a seeded choice does not
+    depend on the order the backend generated them in.
+    """
+    moves = []
+    for piece, piece_moves in move_dict.items():
+        for row, col in piece_moves:
+            if piece.type == PIECE_PAWN and (row == 0 or row == board.square_count - 1):
+                for promotion in PROMOTION_TYPES:
+                    moves.append((piece, row, col, promotion))
+            else:
+                moves.append((piece, row, col, None))
+    moves.sort(key=lambda move: (move[0].row, move[0].col, move[1], move[2], move[3] or 0))
+    return moves
+
+
+class RandomChooser:
+    """
+    Plays a uniformly random legal move.
+    """
+
+    def choose(self, game: Game, rng: random.Random) -> tuple[Piece, int, int, int | None]:
+        return rng.choice(expand_moves(game.board, game.move_dict))
+
+
+class GreedyChooser:
+    """
+    Plays the move that leaves the best static evaluation for the team to move, looking one ply ahead. Moves are
+    tried with make_move and taken back, ties are broken at random.
+    """
+
+    def choose(self, game: Game, rng: random.Random) -> tuple[Piece, int, int, int | None]:
+        board, team = game.board, game.current_player
+        best_moves = []
+        best_score = None
+        for piece, row, col, promotion in expand_moves(board, game.move_dict):
+            record = board.make_move(piece, row, col, team, promotion)
+            score = board.evaluate(team.team_id)
+            board.unmake_move(record)
+            if best_score is None or score > best_score:
+                best_moves, best_score = [], score
+            if score == best_score:
+                best_moves.append((piece, row, col, promotion))
+        return rng.choice(best_moves)
+
+
+class EngineChooser:
+    """
+    Plays the move found by the engine. Searches to a fixed depth without a time limit choose only by the position
+    and the earlier searches of the game, so they are repeatable.
+
+    Args:
+        depth (int): The deepest iteration of the search in plies
+        move_time (float): The time budget per move in seconds
+        tt_size_mb (float): Memory for the transposition table in megabytes
+        ordering (bool): Search with move ordering
+        nnue (str | None): A network file to evaluate with
+    """
+
+    def __init__(
+        self,
+        depth: int = MAX_DEPTH,
+        move_time: float = math.inf,
+        tt_size_mb: float = 4,
+        ordering: bool = True,
+        nnue: str | None = None,
+    ):
+        network = Network.load(nnue) if nnue else None
+        self.engine: Engine = Engine(
+            move_time, max_depth=depth, tt_size_mb=tt_size_mb, ordering=ordering, network=network
+        )
+
+    def choose(self, game: Game, rng: random.Random) -> tuple[Piece, int, int, int | None]:
+        result = self.engine.search(game.board, game.current_player, game.other_player)
+        from_row, from_col, to_row, to_col, promotion = result.move
+        return game.board.get_square_contents(from_row, from_col), to_row, to_col, promotion
+
+
+# engine:... option names, the EngineChooser arguments they set and how their values are read
+ENGINE_OPTIONS = {
+    "depth": ("depth", int),
+    "time": ("move_time", float),
+    "tt": ("tt_size_mb", float),
+    "ordering": ("ordering", lambda value: value not in ("0", "off", "false")),
+    "nnue": ("nnue", str),
+}
+
+
+def make_chooser(spec: str):
+    """
+    Builds a move chooser from its command line name: random, greedy, engine:N or engine:<options>, see the module
+    docstring.
+
+    Raises:
+        ValueError: If the name is not a known chooser, or an engine has neither a depth nor a time budget
+    """
+    if spec == "random":
+        return RandomChooser()
+    if spec == "greedy":
+        return GreedyChooser()
+    name, _, options = spec.partition(":")
+    if name != "engine" or not options:
+        raise ValueError(f"Unknown move chooser {spec!r}, expected random, greedy or engine:N")
+    if options.isdigit():
+        options = f"depth={options}"
+    arguments = {}
+    for option in options.split(","):
+        key, _, value = option.partition("=")
+        if key not in ENGINE_OPTIONS or not value:
+            raise ValueError(
+                f"Unknown engine option {option!r} in {spec!r}, expected one of {', '.join(ENGINE_OPTIONS)}"
+            )
+        argument, parse = ENGINE_OPTIONS[key]
+        arguments[argument] = parse(value)
+    if "depth" not in arguments and "move_time" not in arguments:
+        raise ValueError(f"{spec!r} needs a depth or a time budget, or it would search forever")
+    return EngineChooser(**arguments)
+
+
+def get_result(game: Game, plies: int, max_plies: int) -> tuple[str, str] | None:
+    """
+    Returns (result, termination) once the game is over, None while it goes on. Must be called after start_turn.
+    """
+    if game.is_game_over():
+        if game.is_threefold_repetition():
+            return RESULT_DRAW, "threefold repetition"
+        if game.current_player.king.get_check_status():
+            winner = RESULT_WHITE if game.other_player.team_id == WHITEPLAYER else RESULT_BLACK
+            return winner, "checkmate"
+        return RESULT_DRAW, "stalemate"
+    if plies >= max_plies:
+        return RESULT_DRAW, "move limit"
+    return None
+
+
+def play_game(
+    white: str,
+    black: str,
+    seed: int,
+    fen: str = START_FEN,
+    max_plies: int = MAX_PLIES,
+    backend: str = "list",
+    positions: bool = False,
+    random_plies: int = 0,
+) -> dict:
+    """
+    Plays one game between two move choosers.
+
+    Args:
+        white (str): The chooser playing White, see make_chooser
+        black (str): The chooser playing Black
+        seed (int): Seeds the random choices of both choosers
+        fen (str): The position the game starts from
+        max_plies (int): The game is drawn once this many plies have been played
+        backend (str): The board backend, a key of tools.perft.BACKENDS
+        positions (bool): Store the FEN of every position reached, before each move
+        random_plies (int): How many plies are played at random before the choosers take over
+
+    Returns:
+        dict: The game: both choosers, the seed, the starting FEN, the moves in coordinate notation (e.g. e2e4) and in
+        SAN, the result, how the game ended and, with positions, the positions
+    """
+    rng = random.Random(seed)
+    board, dark_team, light_team, current_player = parse_fen(fen, BACKENDS[backend])
+    game = Game(board, dark_team, light_team)
+    if current_player is not game.current_player:
+        game.switch_players()
+    choosers = {light_team.team_id: make_chooser(white), dark_team.team_id: make_chooser(black)}
+    random_chooser = RandomChooser()
+    moves = []
+    fens = []
+    while True:
+        game.start_turn()
+        outcome = get_result(game, len(moves), max_plies)
+        if outcome is not None:
+            break
+        if positions:
+            fens.append(board_to_fen(board, game.current_player))
+        chooser = random_chooser if len(moves) < random_plies else choosers[game.current_player.team_id]
+        piece, row, col, promotion = chooser.choose(game, rng)
+        moves.append(move_name(piece, row, col, promotion))
+        game.end_turn(game.play_move(piece, row, col, promotion))
+        game.clear_turn()
+    record = {
+        "white": white,
+        "black": black,
+        "seed": seed,
+        "fen": fen,
+        "result": outcome[0],
+        "termination": outcome[1],
+        "plies": len(moves),
+        "moves": moves,
+        "san": game.san_moves,
+    }
+    if positions:
+        record["positions"] = fens
+    return record
+
+
+def record_to_pgn(record: dict) -> str:
+    """
+    Writes a game played by play_game in PGN, the choosers as player names.
+    """
+    tags = {
+        "Event": "Self-play",
+        "Site": "?",
+        "Date": "????.??.??",
+        "Round": "-",
+        "White": record["white"],
+        "Black": record["black"],
+        "Seed": str(record["seed"]),
+        "Termination": record["termination"],
+    }
+    return format_pgn(tags, record["san"], record["result"], record["fen"])
+
+
+def run(
+    games: int,
+    white: str,
+    black: str,
+    out: str,
+    seed: int,
+    workers: int,
+    max_plies: int = MAX_PLIES,
+    backend: str = "list",
+    positions: bool = False,
+    random_plies: int = 0,
+):
+    """
+    Plays games on a process pool and appends each to the output file as it finishes, in the order they finish.
+    The games are written as JSON lines, or in PGN if the file name ends with .pgn.
+    """
+    pgn = out.endswith(".pgn")
+    results = {RESULT_WHITE: 0, RESULT_BLACK: 0, RESULT_DRAW: 0}
+    plies = 0
+    start = time.perf_counter()
+    with open(out, "a", encoding="utf-8") as file, ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(
+                play_game, white, black, seed + index, START_FEN, max_plies, backend, positions, random_plies
+            )
+            for index in range(games)
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            file.write(record_to_pgn(record) if pgn else json.dumps(record, separators=(",", ":")) + "\n")
+            file.flush()
+            results[record["result"]] += 1
+            plies += record["plies"]
+            if done % max(1, games // 10) == 0 or done == games:
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{done}/{games} games, {done / elapsed:.2f} games/s, {plies / elapsed:,.0f} positions/s",
+                    file=sys.stderr,
+                )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{games} games of {white} (White) against {black} (Black) in {elapsed:.2f}s with {workers} workers: "
+        f"+{results[RESULT_WHITE]} ={results[RESULT_DRAW]} -{results[RESULT_BLACK]}"
+    )
+    print(
+        f"{games / elapsed:.2f} games/s, {plies / elapsed:,.0f} positions/s, {plies / max(games, 1):.0f} plies per game"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless self-play on a process pool")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--white", default="random", help="random, greedy or engine:N")
+    parser.add_argument("--black", default="random", help="random, greedy or engine:N")
+    parser.add_argument(
+        "--out", default="selfplay.jsonl", help="JSON lines file the games are appended to, PGN if it ends with .pgn"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="game i is seeded with seed + i")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="list")
+    parser.add_argument("--positions", action="store_true", help="store the FEN of every position of each game")
+    parser.add_argument("--random-plies", type=int, default=0, help="plies played at random to open each game")
+    args = parser.parse_args()
+    try:
+        # fail on a bad chooser name before starting any process
+        make_chooser(args.white)
+        make_chooser(args.black)
+    except ValueError as error:
+        parser.error(str(error))
+    run(
+        args.games,
+        args.white,
+        args.black,
+        args.out,
+        args.seed,
+        args.workers,
+        args.max_plies,
+        args.backend,
+        args.positions,
+        args.random_plies,
+    )
+
+
+if __name__ == "__main__":
+    main()
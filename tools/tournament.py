@@ -0,0 +1,303 @@
+"""
+Engine against engine matches with a sequential probability ratio test (SPRT), to tell whether a change to the search
+gains or loses strength without playing a fixed, large number of games. Run from the repository root:
+
+    python -m tools.tournament --a engine:time=0.05 --b engine:time=0.05,ordering=0 --elo0 0 --elo1 10
+    python -m tools.tournament --a engine:depth=3 --b engine:depth=2 --openings openings.epd --workers 4
+
+Each opening is played twice, once with each configuration as White, so neither profits from a favourable opening.
+Games run concurrently on a process pool and are played by tools.selfplay through the core Game and BoardCore rules.
+After every finished game the SPRT log-likelihood ratio is updated: the match stops as soon as it crosses a bound,
+accepting H1 (A is elo1 stronger than B) or H0 (A is at most elo0 stronger), or when --games have been played.
+
+The test uses the trinomial model (wins, draws, losses) with the logistic Elo scale. The Elo difference is reported
+with its 95% confidence interval, both from A's point of view.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from objects.core.fen import START_FEN, parse_fen, board_to_fen
+from objects.core.game import Game
+from tools.perft import BACKENDS
+from tools.selfplay import (
+    RESULT_WHITE,
+    RESULT_BLACK,
+    MAX_PLIES,
+    RandomChooser,
+    make_chooser,
+    play_game,
+)
+
+# 95% of a normal distribution lies within this many standard deviations of its mean
+Z_95 = 1.959964
+H0 = "H0"
+H1 = "H1"
+
+
+def score_from_elo(elo: float) -> float:
+    """
+    The expected score, from 0 to 1, of a player elo points stronger than its opponent.
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_from_score(score: float) -> float:
+    """
+    The Elo difference that gives the expected score, infinite for a score of 0 or 1.
+    """
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+
+def score_stats(wins: int, draws: int, losses: int) -> tuple[float, float]:
+    """
+    Returns the mean score per game and its per game variance.
+    """
+    games = wins + draws + losses
+    mean = (wins + draws / 2) / games
+    variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean**2) / games
+    return mean, variance
+
+
+def elo_interval(wins: int, draws: int, losses: int) -> tuple[float, float, float]:
+    """
+    Returns the Elo difference of the results and the lower and upper ends of its 95% confidence interval.
+    """
+    mean, variance = score_stats(wins, draws, losses)
+    margin = Z_95 * math.sqrt(variance / (wins + draws + losses))
+    return elo_from_score(mean), elo_from_score(mean - margin), elo_from_score(mean + margin)
+
+
+def sprt_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    """
+    The log-likelihood ratio of H1 (the Elo difference is elo1) against H0 (it is elo0), in the normal
+    approximation of the generalised SPRT. Zero until the results have some variance.
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0
+    mean, variance = score_stats(wins, draws, losses)
+    if variance == 0:
+        return 0.0
+    score0, score1 = score_from_elo(elo0), score_from_elo(elo1)
+    return games * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+
+
+def sprt_bounds(alpha: float, beta: float) -> tuple[float, float]:
+    """
+    The LLR bounds for false positive rate alpha and false negative rate beta: H0 is accepted below the first, H1
+    above the second.
+    """
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def load_openings(path: str) -> list[str]:
+    """
+    Reads opening positions, one FEN per line. Anything after a ';' (EPD operations) is ignored, as are blank lines
+    and lines starting with '#'.
+
+    Raises:
+        ValueError: If a position is not a valid FEN
+    """
+    openings = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            fen = line.split(";")[0].strip()
+            if fen and not fen.startswith("#"):
+                parse_fen(fen)
+                openings.append(fen)
+    return openings
+
+
+def random_openings(count: int, plies: int, seed: int) -> list[str]:
+    """
+    Builds distinct openings by playing plies random legal moves from the start position. Lines that end the game
+    early are skipped.
+    """
+    rng = random.Random(seed)
+    chooser = RandomChooser()
+    openings = []
+    seen = set()
+    attempts = 0
+    while len(openings) < count and attempts < 100 * count:
+        attempts += 1
+        board, dark_team, light_team, _ = parse_fen(START_FEN)
+        game = Game(board, dark_team, light_team)
+        for _ in range(plies):
+            game.start_turn()
+            if game.is_game_over():
+                break
+            piece, row, col, promotion = chooser.choose(game, rng)
+            game.end_turn(game.play_move(piece, row, col, promotion))
+            game.clear_turn()
+        else:
+            fen = board_to_fen(board, game.current_player)
+            if fen not in seen:
+                seen.add(fen)
+                openings.append(fen)
+    return openings
+
+
+def play_pairing(index: int, a: str, b: str, opening: str, max_plies: int, backend: str) -> tuple[int, float, dict]:
+    """
+    Plays game index of the match: opening index // 2, with A as White in even games and as Black in odd ones.
+
+    Returns:
+        tuple[int, float, dict]: The index, A's score (1, 0.5 or 0) and the game record of tools.selfplay.play_game
+    """
+    a_is_white = index % 2 == 0
+    white, black = (a, b) if a_is_white else (b, a)
+    record = play_game(white, black, index, opening, max_plies, backend)
+    if record["result"] == RESULT_WHITE:
+        score = 1.0 if a_is_white else 0.0
+    elif record["result"] == RESULT_BLACK:
+        score = 0.0 if a_is_white else 1.0
+    else:
+        score = 0.5
+    return index, score, record
+
+
+def format_elo(elo: float) -> str:
+    return f"{elo:+.1f}" if math.isfinite(elo) else ("+inf" if elo > 0 else "-inf")
+
+
+def run(
+    a: str,
+    b: str,
+    openings: list[str],
+    max_games: int,
+    workers: int,
+    elo0: float,
+    elo1: float,
+    alpha: float,
+    beta: float,
+    max_plies: int = MAX_PLIES,
+    backend: str = "list",
+    out: str | None = None,
+) -> str | None:
+    """
+    Plays the match until the SPRT accepts a hypothesis or max_games have been played.
+
+    Games are handed to the pool a few at a time, so once the test is decided no more are started. Games still
+    running at that point are not counted.
+
+    Returns:
+        str | None: H0, H1, or None if the match ended undecided
+    """
+    lower, upper = sprt_bounds(alpha, beta)
+    tally = {1.0: 0, 0.5: 0, 0.0: 0}
+    decision = None
+    llr = 0.0
+    next_index = 0
+    start = time.perf_counter()
+    print(f"A: {a}\nB: {b}")
+    print(f"{len(openings)} openings, SPRT elo0={elo0} elo1={elo1}, LLR bounds [{lower:.2f}, {upper:.2f}]")
+    log = open(out, "a", encoding="utf-8") if out else None
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            running = set()
+            while decision is None and (running or next_index < max_games):
+                while next_index < max_games and len(running) < 2 * workers:
+                    opening = openings[(next_index // 2) % len(openings)]
+                    running.add(pool.submit(play_pairing, next_index, a, b, opening, max_plies, backend))
+                    next_index += 1
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, score, record = future.result()
+                    tally[score] += 1
+                    if log is not None:
+                        log.write(json.dumps(record, separators=(",", ":")) + "\n")
+                        log.flush()
+                wins, draws, losses = tally[1.0], tally[0.5], tally[0.0]
+                llr = sprt_llr(wins, draws, losses, elo0, elo1)
+                if llr >= upper:
+                    decision = H1
+                elif llr <= lower:
+                    decision = H0
+                games = wins + draws + losses
+                if games % 10 == 0 or decision is not None:
+                    elo, low, high = elo_interval(wins, draws, losses)
+                    print(
+                        f"{games} games: A +{wins} ={draws} -{losses}, Elo {format_elo(elo)} "
+                        f"[{format_elo(low)}, {format_elo(high)}], LLR {llr:.2f}"
+                    )
+            for future in running:
+                future.cancel()
+    finally:
+        if log is not None:
+            log.close()
+    wins, draws, losses = tally[1.0], tally[0.5], tally[0.0]
+    games = wins + draws + losses
+    elapsed = time.perf_counter() - start
+    elo, low, high = elo_interval(wins, draws, losses) if games else (0.0, -math.inf, math.inf)
+    print(
+        f"{games} games in {elapsed:.1f}s: A +{wins} ={draws} -{losses}, "
+        f"Elo {format_elo(elo)} ({format_elo(low)} to {format_elo(high)}, 95%), LLR {llr:.2f}"
+    )
+    if decision == H1:
+        print(f"H1 accepted: A is stronger than B by about {elo1} Elo or more")
+    elif decision == H0:
+        print(f"H0 accepted: A is not stronger than B by more than {elo0} Elo")
+    else:
+        print("Undecided, play more games to reach a bound")
+    return decision
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine against engine matches with SPRT early stopping")
+    parser.add_argument("--a", required=True, help="the configuration tested, a tools.selfplay chooser")
+    parser.add_argument("--b", required=True, help="the configuration it is compared with")
+    parser.add_argument("--openings", help="a file of opening FENs, random openings if omitted")
+    parser.add_argument("--random-openings", type=int, default=50, help="how many random openings to play")
+    parser.add_argument("--opening-plies", type=int, default=6, help="random plies of each random opening")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", type=int, default=1000, help="the match ends undecided after this many games")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="list")
+    parser.add_argument("--out", help="a JSON lines file the games are appended to")
+    args = parser.parse_args()
+    if args.elo1 <= args.elo0:
+        parser.error("--elo1 must be greater than --elo0")
+    try:
+        make_chooser(args.a)
+        make_chooser(args.b)
+        if args.openings:
+            openings = load_openings(args.openings)
+        else:
+            openings = random_openings(args.random_openings, args.opening_plies, args.seed)
+    except ValueError as error:
+        parser.error(str(error))
+    if not openings:
+        parser.error("no opening positions")
+    run(
+        args.a,
+        args.b,
+        openings,
+        args.games,
+        args.workers,
+        args.elo0,
+        args.elo1,
+        args.alpha,
+        args.beta,
+        args.max_plies,
+        args.backend,
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()